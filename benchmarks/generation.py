@@ -0,0 +1,234 @@
+"""End-to-end generation benchmarks for the bundled templates.
+
+Every measurement runs in a fresh interpreter so cache state and peak RSS are not
+shared between them:
+
+- ``cold``: first generation with an empty cache directory (no template index,
+  Jinja bytecode or cached render)
+- ``warm``: the same generation repeated against the populated cache directory
+- ``serial``: ``--projects`` uniquely named projects rendered one after another
+- ``batch``: the same projects rendered with ``run_batch`` across ``--workers``
+
+Usage::
+
+    python benchmarks/generation.py --output results.json
+    python benchmarks/generation.py --baseline results.json --threshold 0.25
+
+With ``--baseline``, the run exits non-zero if any timing or peak RSS exceeds the
+baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES = ("pyproject", "fastapi")
+
+# Metrics compared against a baseline; larger is worse for all of them.
+COMPARED = ("cold_s", "warm_s", "serial_s", "batch_s", "peak_rss_mb")
+
+
+def _peak_rss_mb() -> float:
+    # Include batch worker processes, which have exited by the time this runs.
+    peak = max(
+        resource.getrusage(who).ru_maxrss
+        for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)
+    )
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _count_files(path: Path) -> int:
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def _child(spec: dict[str, Any]) -> dict[str, Any]:
+    """Run one measurement inside the current (fresh) interpreter."""
+    start = time.perf_counter()
+    from pytemplate.batch import BatchEntry, run_batch
+    from pytemplate.cache import RenderCache
+    from pytemplate.config import TEMPLATES_DIR
+    from pytemplate.engine import get_engine
+    from pytemplate.registry import get_registry
+
+    template = spec["template"]
+    output_dir = Path(spec["output_dir"])
+    base = {"author": "bench", "email": "bench@example.com", "github_username": "bench"}
+
+    if spec["op"] == "single":
+        registry = get_registry()
+        info = registry.get(template)
+        engine = get_engine()
+        registry.attach(engine)
+        context = engine.build_context(
+            info.path, {**base, "project_name": "bench-project"}, no_input=True
+        )
+        RenderCache.default().generate(
+            engine,
+            info.path,
+            context,
+            output_dir=output_dir,
+            overwrite_if_exists=True,
+            template_digest=info.digest,
+        )
+    else:
+        entries = [BatchEntry(f"bench-{i}", template=template) for i in range(spec["projects"])]
+        workers = spec["workers"] if spec["op"] == "batch" else 1
+        results = run_batch(entries, base, TEMPLATES_DIR, output_dir, force=True, workers=workers)
+        failed = [r.error for r in results if not r.ok]
+        if failed:
+            raise RuntimeError(f"{len(failed)} projects failed: {failed[0]}")
+
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "files": _count_files(output_dir),
+    }
+
+
+def _measure(spec: dict[str, Any], cache_dir: Path) -> dict[str, Any]:
+    """Run one measurement in a fresh interpreter and return its report."""
+    # Make the checkout importable whether or not the package is installed.
+    pythonpath = os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTEMPLATE_CACHE_DIR": str(cache_dir), "PYTHONPATH": pythonpath}
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps(spec)],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark {spec} failed:\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def bench_template(template: str, projects: int, workers: int, repeat: int) -> dict[str, Any]:
+    """Benchmark one template.
+
+    Args:
+        template: Name of the bundled template
+        projects: Number of projects generated by the serial and batch runs
+        workers: Worker processes used by the batch run
+        repeat: Times each measurement is repeated; the median is reported
+
+    Returns:
+        Median timings in seconds, the highest peak RSS in MiB and the files written
+        per project.
+
+    """
+    samples: dict[str, list[dict[str, Any]]] = {"cold": [], "warm": [], "serial": [], "batch": []}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="pytemplate-bench-") as tmp:
+            tmp_path = Path(tmp)
+            cache_dir = tmp_path / "cache"
+            for op in ("cold", "warm"):
+                spec = {"op": "single", "template": template, "output_dir": str(tmp_path / op)}
+                samples[op].append(_measure(spec, cache_dir))
+            for op in ("serial", "batch"):
+                spec = {
+                    "op": op,
+                    "template": template,
+                    "projects": projects,
+                    "workers": workers,
+                    "output_dir": str(tmp_path / op),
+                }
+                samples[op].append(_measure(spec, cache_dir))
+
+    report: dict[str, Any] = {
+        f"{name}_s": statistics.median(s["seconds"] for s in runs) for name, runs in samples.items()
+    }
+    report["peak_rss_mb"] = max(s["peak_rss_mb"] for runs in samples.values() for s in runs)
+    report["files"] = samples["cold"][0]["files"]
+    report["files_written"] = samples["serial"][0]["files"]
+    return report
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Compare a run against a baseline.
+
+    Args:
+        current: Results of this run, as written by :func:`main`
+        baseline: Previously saved results
+        threshold: Allowed relative slowdown, e.g. ``0.25`` for 25%
+
+    Returns:
+        A description of every metric that regressed beyond ``threshold``.
+
+    """
+    regressions = []
+    for template, metrics in current["templates"].items():
+        base = baseline.get("templates", {}).get(template)
+        if base is None:
+            continue
+        for metric in COMPARED:
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            if change > threshold:
+                regressions.append(f"{template}.{metric}: {old:.4g} -> {new:.4g} (+{change:.0%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and optionally compare them with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--template", action="append", choices=TEMPLATES, dest="templates")
+    parser.add_argument("--projects", type=int, default=20, help="projects per serial/batch run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per measurement")
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown (default: 0.25)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(json.loads(args.child))))
+        return 0
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "projects": args.projects,
+        "workers": args.workers,
+        "repeat": args.repeat,
+        "templates": {
+            name: bench_template(name, args.projects, args.workers, args.repeat)
+            for name in args.templates or TEMPLATES
+        },
+    }
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
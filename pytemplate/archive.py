@@ -0,0 +1,208 @@
+"""Streaming of rendered projects into tar and zip archives."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from typing import IO, Any
+
+from cookiecutter.exceptions import CookiecutterException
+from jinja2.exceptions import TemplateError
+
+from pytemplate.engine import RenderedFile, RenderEngine, RenderError
+from pytemplate.timing import Timings
+
+STDOUT = "-"
+
+
+class ArchiveFormat(StrEnum):
+    """Archive formats a project can be streamed into."""
+
+    TAR_GZ = "tar.gz"
+    TAR_BZ2 = "tar.bz2"
+    TAR_XZ = "tar.xz"
+    TAR = "tar"
+    ZIP = "zip"
+
+    @classmethod
+    def from_path(cls, path: str) -> ArchiveFormat:
+        """Infer the format from an archive file name.
+
+        ``-`` (stdout) is written as ``tar.gz``.
+
+        Raises:
+            ValueError: If the suffix is not a supported archive format.
+
+        """
+        if path == STDOUT:
+            return cls.TAR_GZ
+        name = Path(path).name.lower()
+        if name.endswith(".tgz"):
+            return cls.TAR_GZ
+        # Longest suffixes first, so "x.tar.gz" is not read as "tar".
+        for fmt in sorted(cls, key=lambda f: len(f.value), reverse=True):
+            if name.endswith(f".{fmt.value}"):
+                return fmt
+        raise ValueError(
+            f"Cannot infer archive format from '{path}'; "
+            f"use one of: {', '.join('.' + f.value for f in cls)}"
+        )
+
+
+def _mode(item: RenderedFile) -> int:
+    return item.source.stat().st_mode & 0o777
+
+
+@contextmanager
+def _tar_writer(fileobj: IO[bytes], fmt: ArchiveFormat) -> Iterator[Callable[[RenderedFile], None]]:
+    compression = fmt.value.partition(".")[2]
+    now = int(time.time())
+    # Stream mode ("w|") never seeks, so stdout and pipes work as well as files.
+    with tarfile.open(fileobj=fileobj, mode=f"w|{compression}") as tar:
+
+        def add(item: RenderedFile) -> None:
+            info = tarfile.TarInfo(item.path.as_posix())
+            info.mode = _mode(item)
+            info.mtime = now
+            if item.content is None:
+                info.size = item.source.stat().st_size
+                with open(item.source, "rb") as fh:
+                    tar.addfile(info, fh)
+            else:
+                info.size = len(item.content)
+                tar.addfile(info, _BytesReader(item.content))
+
+        yield add
+
+
+@contextmanager
+def _zip_writer(fileobj: IO[bytes]) -> Iterator[Callable[[RenderedFile], None]]:
+    now = time.localtime()[:6]
+    # ZipFile writes data descriptors instead of seeking back when the output is a pipe.
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+        def add(item: RenderedFile) -> None:
+            name = item.path.as_posix()
+            if item.content is None:
+                archive.write(item.source, name)
+                return
+            info = zipfile.ZipInfo(name, date_time=now)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o100000 | _mode(item)) << 16
+            archive.writestr(info, item.content)
+
+        yield add
+
+
+class _BytesReader:
+    """Minimal file object over rendered bytes, without copying them."""
+
+    def __init__(self, data: bytes) -> None:
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size < 0 else self._pos + size
+        chunk = self._view[self._pos : end].tobytes()
+        self._pos += len(chunk)
+        return chunk
+
+
+def write_archive(
+    files: Iterable[RenderedFile],
+    fileobj: IO[bytes],
+    fmt: ArchiveFormat,
+    timings: Timings | None = None,
+) -> int:
+    """Stream rendered files into an archive.
+
+    Files are added as they are produced, so at most one rendered file is held in
+    memory and verbatim files are copied from the template in chunks.
+
+    Args:
+        files: Files produced by :meth:`RenderEngine.iter_files`
+        fileobj: Binary stream the archive is written to; it need not be seekable
+        fmt: Archive format
+        timings: Collects the ``write`` phase and per-file write times
+
+    Returns:
+        The number of files archived.
+
+    """
+    writer = _zip_writer(fileobj) if fmt is ArchiveFormat.ZIP else _tar_writer(fileobj, fmt)
+    count = 0
+    with writer as add:
+        for item in files:
+            start = time.perf_counter()
+            add(item)
+            count += 1
+            if timings is not None:
+                elapsed = time.perf_counter() - start
+                timings.add("write", elapsed)
+                timings.add_file(Path(*item.path.parts[1:]).as_posix(), elapsed)
+    return count
+
+
+def generate_archive(
+    engine: RenderEngine,
+    template_path: Path,
+    context: dict[str, Any],
+    destination: str,
+    fmt: ArchiveFormat | None = None,
+    timings: Timings | None = None,
+) -> int:
+    """Render a project straight into an archive, without an output directory.
+
+    A file destination is written next to its final path and renamed into place
+    once complete, so a failed render never leaves a truncated archive behind.
+
+    Args:
+        engine: Engine used to render the template
+        template_path: Path to the project template
+        context: Context returned by :meth:`RenderEngine.build_context`
+        destination: Archive path, or ``-`` for stdout
+        fmt: Archive format; inferred from ``destination`` when omitted
+        timings: Collects the ``render`` and ``write`` phases
+
+    Returns:
+        The number of files archived.
+
+    Raises:
+        RenderError: If the template uses hooks, or rendering or writing fails.
+
+    """
+    if (template_path / "hooks").is_dir():
+        raise RenderError(
+            template_path,
+            "Templates with generation hooks cannot be written to an archive",
+        )
+    try:
+        fmt = fmt or ArchiveFormat.from_path(destination)
+    except ValueError as e:
+        raise RenderError(template_path, str(e)) from e
+
+    files = engine.iter_files(template_path, context, timings=timings)
+    try:
+        if destination == STDOUT:
+            count = write_archive(files, sys.stdout.buffer, fmt, timings)
+            sys.stdout.buffer.flush()
+            return count
+
+        target = Path(destination)
+        partial = target.with_name(f".{target.name}.{os.getpid()}.part")
+        try:
+            with open(partial, "wb") as fh:
+                count = write_archive(files, fh, fmt, timings)
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+        return count
+    except (CookiecutterException, TemplateError, OSError) as e:
+        raise RenderError(template_path, f"Unable to write {destination}", str(e)) from e
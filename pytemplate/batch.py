@@ -0,0 +1,216 @@
+"""Batch project generation from a manifest file."""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from pytemplate.engine import RenderError, get_engine
+from pytemplate.materialize import LinkMode
+from pytemplate.registry import get_registry
+
+DEFAULT_TEMPLATE = "pyproject"
+
+
+@dataclass(frozen=True)
+class BatchEntry:
+    """A single project to generate.
+
+    Attributes:
+        project_name: Name of the project
+        template: Name of the template to render
+        context: Context overrides applied on top of the base context
+
+    """
+
+    project_name: str
+    template: str = DEFAULT_TEMPLATE
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of generating one batch entry."""
+
+    project_name: str
+    template: str
+    ok: bool
+    duration: float
+    project_dir: Path | None = None
+    error: str | None = None
+
+
+def _entry_from_row(row: dict[str, Any], index: int) -> BatchEntry:
+    """Build a batch entry from a manifest row.
+
+    Raises:
+        ValueError: If the row has no project name or a malformed context.
+
+    """
+    row = dict(row)
+    name = row.pop("name", None) or row.pop("project_name", None)
+    if not name:
+        raise ValueError(f"Manifest entry {index} has no project name")
+    template = row.pop("template", None) or DEFAULT_TEMPLATE
+    context = row.pop("context", None) or {}
+    if not isinstance(context, dict):
+        raise ValueError(f"Manifest entry {index} has a non-table context")
+    # Remaining flat keys (CSV columns, top-level TOML/JSON keys) are overrides too.
+    context = {**{k: v for k, v in row.items() if v not in (None, "")}, **context}
+    return BatchEntry(project_name=str(name), template=str(template), context=context)
+
+
+def load_manifest(path: Path) -> list[BatchEntry]:
+    """Load batch entries from a TOML, JSON or CSV manifest.
+
+    TOML manifests use ``[[projects]]`` tables and JSON manifests a list of objects
+    (optionally under a ``projects`` key). Each entry has a ``name``, an optional
+    ``template`` and an optional ``context`` table. CSV manifests use ``name`` and
+    ``template`` columns; every other non-empty column is a context override.
+
+    Args:
+        path: Path to the manifest file
+
+    Returns:
+        The entries in manifest order.
+
+    Raises:
+        ValueError: If the manifest format is unsupported or an entry is invalid.
+
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".toml":
+        with open(path, "rb") as fh:
+            rows = tomllib.load(fh).get("projects", [])
+    elif suffix == ".json":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        rows = data.get("projects", []) if isinstance(data, dict) else data
+    elif suffix == ".csv":
+        with open(path, encoding="utf-8", newline="") as fh:
+            rows = list(csv.DictReader(fh))
+    else:
+        raise ValueError(f"Unsupported manifest format: {path.suffix or path.name}")
+
+    return [_entry_from_row(row, i) for i, row in enumerate(rows, start=1)]
+
+
+def generate_entry(
+    entry: BatchEntry,
+    base_context: dict[str, Any],
+    templates_dir: Path,
+    output_dir: Path,
+    force: bool = False,
+    mode: LinkMode = LinkMode.AUTO,
+) -> BatchResult:
+    """Generate one batch entry, capturing any failure in the result.
+
+    Args:
+        entry: The project to generate
+        base_context: Context shared by every entry
+        templates_dir: Directory holding the ``*-template`` directories
+        output_dir: Directory the project is created in
+        force: Whether to overwrite an existing project directory
+        mode: How files copied verbatim from the template are materialized
+
+    Returns:
+        The outcome of the generation.
+
+    """
+    start = time.perf_counter()
+    registry = get_registry(templates_dir)
+    info = registry.get(entry.template)
+
+    def result(**kwargs: Any) -> BatchResult:
+        return BatchResult(
+            entry.project_name, entry.template, duration=time.perf_counter() - start, **kwargs
+        )
+
+    if info is None:
+        return result(ok=False, error=f"Template '{entry.template}' not found")
+
+    template_path = info.path
+    engine = get_engine()
+    registry.attach(engine)
+    context = {**base_context, **entry.context, "project_name": entry.project_name}
+    try:
+        full_context = engine.build_context(template_path, context, no_input=True)
+        project_dir = engine.generate(
+            template_path, full_context, output_dir=output_dir, overwrite_if_exists=force, mode=mode
+        )
+    except RenderError as e:
+        return result(ok=False, error=e.details or e.message)
+    return result(ok=True, project_dir=project_dir)
+
+
+def run_batch(
+    entries: list[BatchEntry],
+    base_context: dict[str, Any],
+    templates_dir: Path,
+    output_dir: Path,
+    force: bool = False,
+    workers: int = 1,
+    mode: LinkMode = LinkMode.AUTO,
+) -> list[BatchResult]:
+    """Generate every entry, in parallel across ``workers`` processes.
+
+    Each worker process keeps its own rendering engine, so templates are compiled
+    once per worker rather than once per project. A failure, including an
+    unexpected exception or a crashed worker, is recorded in that entry's result
+    and does not stop the other entries.
+
+    Returns:
+        One result per entry, in manifest order.
+
+    """
+    job = partial(
+        generate_entry,
+        base_context=base_context,
+        templates_dir=templates_dir,
+        output_dir=output_dir,
+        force=force,
+        mode=mode,
+    )
+    if workers <= 1 or len(entries) <= 1:
+        return [_run_isolated(job, entry) for entry in entries]
+
+    results: dict[int, BatchResult] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(entries))) as executor:
+        submitted = time.perf_counter()
+        futures: dict[Future[BatchResult], int] = {
+            executor.submit(job, entry): index for index, entry in enumerate(entries)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                results[index] = _failed(entries[index], e, time.perf_counter() - submitted)
+    return [results[index] for index in range(len(entries))]
+
+
+def _failed(entry: BatchEntry, error: Exception, duration: float) -> BatchResult:
+    return BatchResult(
+        entry.project_name,
+        entry.template,
+        ok=False,
+        duration=duration,
+        error=f"{type(error).__name__}: {error}",
+    )
+
+
+def _run_isolated(job: Callable[[BatchEntry], BatchResult], entry: BatchEntry) -> BatchResult:
+    """Run ``job`` in this process, turning any exception into a failed result."""
+    start = time.perf_counter()
+    try:
+        return job(entry)
+    except Exception as e:
+        return _failed(entry, e, time.perf_counter() - start)
@@ -0,0 +1,261 @@
+"""Content-addressed on-disk cache of rendered projects."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from cookiecutter.exceptions import CookiecutterException, OutputDirExistsException
+from jinja2.exceptions import TemplateError
+
+from pytemplate.config import cache_home
+from pytemplate.engine import RenderEngine, RenderError
+from pytemplate.materialize import LinkMode, materialize_file
+from pytemplate.timing import Timings
+
+CACHE_FORMAT = "2"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+_META_FILE = "entry.json"
+_TREE_DIR = "tree"
+
+
+def tree_digest(template_path: Path) -> str:
+    """Hash the contents, names and permissions of every file in a template.
+
+    Args:
+        template_path: Path to the project template
+
+    Returns:
+        A hex digest that changes whenever any template file changes.
+
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(template_path):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(root) / name
+            digest.update(path.relative_to(template_path).as_posix().encode())
+            digest.update(b"\0%o\0" % (path.stat().st_mode & 0o777))
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def cache_key(template_digest: str, context: dict[str, Any]) -> str:
+    """Combine a template digest and a resolved context into a cache key."""
+    payload = json.dumps(
+        {"format": CACHE_FORMAT, "template": template_digest, "context": context},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _entry_size(entry: Path) -> int:
+    return sum(
+        (Path(root) / name).stat().st_size for root, _, files in os.walk(entry) for name in files
+    )
+
+
+class RenderCache:
+    """Cache rendered projects by template digest and context.
+
+    A hit materializes the project from the cached tree instead of rendering.
+    Entries are evicted when older than ``max_age`` seconds or, least recently used
+    first, when the cache grows beyond ``max_bytes``.
+
+    Args:
+        root: Directory holding the cache entries
+        max_bytes: Total size the cache is trimmed back to
+        max_age: Seconds after which an entry is discarded
+
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        """Configure the cache; nothing is read or created until first use."""
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @classmethod
+    def default(cls) -> RenderCache:
+        """Create the user cache, honouring the ``PYTEMPLATE_CACHE_*`` variables."""
+        return cls(
+            cache_home() / "renders",
+            max_bytes=int(os.environ.get("PYTEMPLATE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            max_age=float(os.environ.get("PYTEMPLATE_CACHE_MAX_AGE", DEFAULT_MAX_AGE)),
+        )
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def lookup(self, key: str) -> Path | None:
+        """Return the cached tree for ``key`` and mark it as recently used."""
+        entry = self._entry(key)
+        meta = entry / _META_FILE
+        if not meta.is_file():
+            return None
+        os.utime(meta)
+        return entry / _TREE_DIR
+
+    def store(
+        self,
+        engine: RenderEngine,
+        template_path: Path,
+        context: dict[str, Any],
+        key: str,
+        timings: Timings | None = None,
+    ) -> Path:
+        """Render a template into the cache and return the cached tree.
+
+        The entry is rendered into a staging directory and renamed into place, so
+        concurrent writers never expose a partially written entry.
+        """
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+        try:
+            files = engine.iter_files(template_path, context, timings=timings)
+            engine.write(files, staging / _TREE_DIR, timings=timings)
+            (staging / _META_FILE).write_text(
+                json.dumps({"template": str(template_path), "created": time.time()})
+            )
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process stored the same entry first; use theirs.
+                if not (entry / _META_FILE).is_file():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+        return entry / _TREE_DIR
+
+    def materialize(
+        self,
+        tree: Path,
+        output_dir: Path,
+        overwrite_if_exists: bool = False,
+        mode: LinkMode = LinkMode.AUTO,
+    ) -> Path:
+        """Place a cached tree into ``output_dir``.
+
+        Args:
+            tree: Cached tree returned by :meth:`lookup` or :meth:`store`
+            output_dir: Directory the project directory is created in
+            overwrite_if_exists: Whether to overwrite an existing project directory
+            mode: How files are materialized; ``hardlink`` shares inodes with the cache
+
+        Returns:
+            The materialized project directory.
+
+        Raises:
+            OutputDirExistsException: If the project directory exists and may not be
+                overwritten.
+
+        """
+        (project,) = tree.iterdir()
+        project_dir = output_dir / project.name
+        if project_dir.exists() and not overwrite_if_exists:
+            raise OutputDirExistsException(f'Error: "{project_dir}" directory already exists')
+
+        for root, _, files in os.walk(project):
+            target_root = project_dir / Path(root).relative_to(project)
+            target_root.mkdir(parents=True, exist_ok=True)
+            for name in files:
+                materialize_file(Path(root) / name, target_root / name, mode)
+        return project_dir
+
+    def generate(
+        self,
+        engine: RenderEngine,
+        template_path: Path,
+        context: dict[str, Any],
+        output_dir: Path | str = ".",
+        overwrite_if_exists: bool = False,
+        template_digest: str | None = None,
+        mode: LinkMode = LinkMode.AUTO,
+        timings: Timings | None = None,
+    ) -> tuple[Path, bool]:
+        """Generate a project, serving it from the cache when possible.
+
+        Templates with generation hooks are rendered directly, since hooks may have
+        side effects a cached tree cannot reproduce. Pass ``template_digest`` when it
+        is already known to skip hashing the tree; it must match the template as it
+        is now (e.g. from :meth:`TemplateRegistry.refresh`), or stale renders are
+        served and stored under the wrong key.
+        ``timings`` collects the ``cache lookup`` and ``materialize`` phases, plus
+        ``render`` and ``write`` on a miss.
+
+        Returns:
+            The project directory and whether it was a cache hit.
+
+        Raises:
+            RenderError: If rendering or materialization fails.
+
+        """
+        output_dir = Path(output_dir).resolve()
+        if (template_path / "hooks").is_dir():
+            project_dir = engine.generate(
+                template_path,
+                context,
+                output_dir,
+                overwrite_if_exists=overwrite_if_exists,
+                mode=mode,
+                timings=timings,
+            )
+            return project_dir, False
+
+        try:
+            timings = timings if timings is not None else Timings()
+            with timings.phase("cache lookup"):
+                key = cache_key(template_digest or tree_digest(template_path), context)
+                tree = self.lookup(key)
+            hit = tree is not None
+            if tree is None:
+                tree = self.store(engine, template_path, context, key, timings)
+            with timings.phase("materialize"):
+                project_dir = self.materialize(tree, output_dir, overwrite_if_exists, mode)
+        except (CookiecutterException, TemplateError, OSError) as e:
+            raise RenderError(template_path, "Unable to render from cache", str(e)) from e
+        return project_dir, hit
+
+    def evict(self, now: float | None = None) -> int:
+        """Remove expired entries, then the least recently used until under budget.
+
+        Returns:
+            The number of entries removed.
+
+        """
+        now = time.time() if now is None else now
+        entries = []
+        for meta in self.root.glob(f"*/*/{_META_FILE}"):
+            entry = meta.parent
+            entries.append((meta.stat().st_mtime, _entry_size(entry), entry))
+        entries.sort()
+
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for used, size, entry in entries:
+            if now - used <= self.max_age and total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,20 @@
+"""Filesystem locations used by pytemplate."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+
+
+def cache_home() -> Path:
+    """Return the root directory of pytemplate's caches.
+
+    Defaults to ``$XDG_CACHE_HOME/pytemplate`` and can be moved with
+    ``PYTEMPLATE_CACHE_DIR``.
+    """
+    if "PYTEMPLATE_CACHE_DIR" in os.environ:
+        return Path(os.environ["PYTEMPLATE_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pytemplate"
@@ -0,0 +1,512 @@
+"""In-process rendering engine for project templates."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from binaryornot.check import is_binary
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.exceptions import (
+    CookiecutterException,
+    NonTemplatedInputDirException,
+    OutputDirExistsException,
+    UndefinedVariableInTemplate,
+)
+from cookiecutter.generate import generate_context, is_copy_only_path
+from cookiecutter.hooks import run_hook_from_repo_dir
+from cookiecutter.prompt import prompt_for_config
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    Template,
+    TemplateNotFound,
+)
+from jinja2.exceptions import TemplateError, UndefinedError
+
+from pytemplate.config import cache_home
+from pytemplate.materialize import LinkMode, materialize_file, write_file
+from pytemplate.timing import Timings
+
+
+class RenderError(Exception):
+    """Raised when a project cannot be rendered from its template.
+
+    Args:
+        template_path: Template that failed to render
+        message: Short description of the failure
+        details: Underlying error, if any
+
+    """
+
+    def __init__(self, template_path: Path, message: str, details: str | None = None):
+        """Record the failing template along with the message and details."""
+        self.template_path = template_path
+        self.message = message
+        self.details = details
+        super().__init__(message)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Keep all fields when the error crosses a process boundary."""
+        return type(self), (self.template_path, self.message, self.details)
+
+
+class UnsafePathError(RenderError):
+    """Raised when a rendered output path would land outside the project directory."""
+
+
+@dataclass(frozen=True)
+class RenderedFile:
+    """A single output file produced from a template.
+
+    Attributes:
+        path: Output path relative to the output directory, including the project directory.
+        source: Template file the output was produced from.
+        content: Rendered bytes, or None when the source is copied verbatim.
+
+    """
+
+    path: Path
+    source: Path
+    content: bytes | None
+
+    def read(self) -> bytes:
+        """Return the output bytes, reading verbatim files from the template."""
+        return self.source.read_bytes() if self.content is None else self.content
+
+
+RECORD_FILE = ".pytemplate.json"
+
+
+def file_digest(data: bytes) -> str:
+    """Return the content hash used to compare rendered and on-disk files."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class _PathLoader(BaseLoader):
+    """Load templates by absolute path so one environment can serve every template."""
+
+    def get_source(self, environment: Environment, template: str):  # noqa: D102
+        path = Path(template)
+        try:
+            mtime = path.stat().st_mtime
+            source = path.read_text(encoding="utf-8")
+        except (FileNotFoundError, IsADirectoryError) as e:
+            raise TemplateNotFound(template) from e
+        return source, str(path), lambda: path.exists() and path.stat().st_mtime == mtime
+
+
+def _find_project_dir(template_path: Path) -> Path:
+    """Return the templated project directory inside a template."""
+    for child in sorted(template_path.iterdir()):
+        if child.is_dir() and "cookiecutter" in child.name and "{{" in child.name:
+            return child
+    raise NonTemplatedInputDirException(str(template_path))
+
+
+def _detect_newline(path: Path) -> str:
+    """Return the newline sequence used by the first line of a text file."""
+    with open(path, encoding="utf-8") as fh:
+        fh.readline()
+    newlines = fh.newlines
+    if isinstance(newlines, tuple):
+        return newlines[0]
+    return newlines or "\n"
+
+
+class RenderEngine:
+    """Render cookiecutter templates without spawning a subprocess.
+
+    Jinja environments are created once per set of template extensions and reused
+    for every project, so compiled templates and rendered path expressions are
+    shared across invocations.
+
+    Args:
+        bytecode_cache: Where compiled templates are persisted between processes;
+            ``None`` keeps them in memory only
+
+    """
+
+    def __init__(self, bytecode_cache: BytecodeCache | None = None) -> None:
+        """Start with no environments, compiled paths or registered templates."""
+        self.bytecode_cache = bytecode_cache
+        self._environments: dict[tuple[str, ...], StrictEnvironment] = {}
+        self._path_templates: dict[tuple[int, str], Template] = {}
+        self._files: dict[Path, list[str]] = {}
+        self._hashes: dict[Path, dict[str, str]] = {}
+
+    def environment(self, context: dict[str, Any]) -> StrictEnvironment:
+        """Return the shared Jinja environment for a template context."""
+        extensions = tuple(context["cookiecutter"].get("_extensions", ()))
+        env = self._environments.get(extensions)
+        if env is None:
+            env = StrictEnvironment(
+                context=context,
+                keep_trailing_newline=True,
+                loader=_PathLoader(),
+                auto_reload=True,
+                bytecode_cache=self.bytecode_cache,
+            )
+            self._environments[extensions] = env
+        return env
+
+    def register(
+        self, template_path: Path, files: list[str], hashes: dict[str, str] | None = None
+    ) -> None:
+        """Record a template's file list so rendering does not walk the template.
+
+        Args:
+            template_path: Path to the project template
+            files: Every file of the template, relative to ``template_path``
+            hashes: Content hashes of those files, reused for verbatim copies
+
+        """
+        self._files[template_path] = files
+        self._hashes[template_path] = hashes or {}
+
+    def _sources(self, template_path: Path) -> tuple[Path, list[str]]:
+        """Return the templated project directory and its files, relative to it."""
+        files = self._files.get(template_path)
+        if files is None:
+            project_template = _find_project_dir(template_path)
+            relpaths = []
+            for root, dirs, names in os.walk(project_template):
+                dirs.sort()
+                rel_root = os.path.relpath(root, project_template)
+                relpaths.extend(os.path.normpath(os.path.join(rel_root, n)) for n in sorted(names))
+            return project_template, relpaths
+
+        project_name = next(
+            (f.split("/", 1)[0] for f in files if "cookiecutter" in f and "{{" in f.split("/")[0]),
+            None,
+        )
+        if project_name is None:
+            raise NonTemplatedInputDirException(str(template_path))
+        prefix = f"{project_name}/"
+        relpaths = [str(Path(f[len(prefix) :])) for f in files if f.startswith(prefix)]
+        return template_path / project_name, relpaths
+
+    def compile(self, template_path: Path, context: dict[str, Any]) -> int:
+        """Compile every renderable file of a template ahead of rendering.
+
+        Compiled templates are kept by the shared environment and, when the engine
+        has a bytecode cache, persisted for later processes. Files that fail to
+        compile are left for rendering to report.
+
+        Returns:
+            The number of files compiled.
+
+        """
+        env = self.environment(context)
+        project_template, relpaths = self._sources(template_path)
+        count = 0
+        for relpath in relpaths:
+            source = project_template / relpath
+            if _is_verbatim(relpath, source, context):
+                continue
+            try:
+                env.get_template(str(source))
+            except (TemplateError, UnicodeDecodeError):
+                continue
+            count += 1
+        return count
+
+    def build_context(
+        self, template_path: Path, extra_context: dict[str, Any], no_input: bool = False
+    ) -> dict[str, Any]:
+        """Resolve the cookiecutter context for a template.
+
+        Args:
+            template_path: Path to the project template
+            extra_context: Values overriding the template defaults
+            no_input: Whether to skip interactive prompts
+
+        Returns:
+            The resolved context, keyed by ``cookiecutter`` as in templates.
+
+        Raises:
+            RenderError: If the template configuration cannot be loaded.
+
+        """
+        try:
+            context = generate_context(
+                context_file=template_path / "cookiecutter.json",
+                extra_context=extra_context,
+            )
+            context["cookiecutter"] = prompt_for_config(context, no_input)
+        except (CookiecutterException, TemplateError, OSError) as e:
+            raise RenderError(template_path, "Unable to build template context", str(e)) from e
+        context["cookiecutter"]["_template"] = str(template_path)
+        context["cookiecutter"]["_repo_dir"] = str(template_path)
+        return context
+
+    def _render_path(self, env: Environment, path: str, context: dict[str, Any]) -> str:
+        key = (id(env), path)
+        template = self._path_templates.get(key)
+        if template is None:
+            template = self._path_templates[key] = env.from_string(path)
+        return template.render(**context)
+
+    def _render_file(
+        self,
+        env: Environment,
+        source: Path,
+        relpath: str,
+        context: dict[str, Any],
+        newline: str | None,
+    ) -> bytes:
+        try:
+            text = env.get_template(str(source)).render(**context)
+        except UndefinedError as err:
+            raise UndefinedVariableInTemplate(
+                f"Unable to create file '{relpath}'", err, context
+            ) from err
+        newline = newline or _detect_newline(source)
+        if newline != "\n":
+            text = text.replace("\n", newline)
+        return text.encode("utf-8")
+
+    def iter_files(
+        self,
+        template_path: Path,
+        context: dict[str, Any],
+        record: bool = True,
+        timings: Timings | None = None,
+    ) -> Iterator[RenderedFile]:
+        """Yield every output file of a template without touching the output directory.
+
+        Args:
+            template_path: Path to the project template
+            context: Context returned by :meth:`build_context`
+            record: Whether to finish with the project's :data:`RECORD_FILE`, which
+                stores the answers and output hashes used by ``pytemplate update``
+            timings: Collects the ``render`` phase and per-file render times
+
+        Yields:
+            Rendered files in a stable, sorted order.
+
+        Raises:
+            UndefinedVariableInTemplate: If a path or file uses an undefined variable.
+            UnsafePathError: If a rendered path is absolute or leaves the project.
+
+        """
+        env = self.environment(context)
+        project_template, relpaths = self._sources(template_path)
+        forced_newline = context["cookiecutter"].get("_new_lines")
+        known_hashes = self._hashes.get(template_path, {})
+        hashes = {}
+
+        def render_path(relpath: str) -> str:
+            try:
+                return self._render_path(env, relpath, context)
+            except UndefinedError as err:
+                raise UndefinedVariableInTemplate(
+                    f"Unable to render path '{relpath}'", err, context
+                ) from err
+
+        project_name = render_path(project_template.name)
+        for relpath in relpaths:
+            source = project_template / relpath
+            target = render_path(relpath)
+            if not os.path.basename(target):
+                continue
+            out = _output_path(template_path, project_name, target)
+
+            if _is_verbatim(relpath, source, context):
+                item = RenderedFile(out, source, None)
+                if record:
+                    known = known_hashes.get(source.relative_to(template_path).as_posix())
+                    hashes[Path(target).as_posix()] = known or file_digest(item.read())
+                yield item
+                continue
+
+            start = time.perf_counter()
+            content = self._render_file(env, source, relpath, context, forced_newline)
+            if timings is not None:
+                elapsed = time.perf_counter() - start
+                timings.add("render", elapsed)
+                timings.add_file(Path(target).as_posix(), elapsed)
+            hashes[Path(target).as_posix()] = file_digest(content)
+            yield RenderedFile(out, source, content)
+
+        if record:
+            payload = {
+                "template": template_path.name.removesuffix("-template"),
+                "context": {
+                    k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")
+                },
+                "files": dict(sorted(hashes.items())),
+            }
+            content = (json.dumps(payload, indent=2) + "\n").encode("utf-8")
+            yield RenderedFile(
+                Path(project_name) / RECORD_FILE, template_path / "cookiecutter.json", content
+            )
+
+    def write(
+        self,
+        files: Iterable[RenderedFile],
+        output_dir: Path,
+        mode: LinkMode = LinkMode.AUTO,
+        timings: Timings | None = None,
+    ) -> list[Path]:
+        """Write rendered files below ``output_dir``.
+
+        Args:
+            files: Files produced by :meth:`iter_files`
+            output_dir: Directory the project directory is created in
+            mode: How files copied verbatim from the template are materialized
+            timings: Collects the ``write`` phase and per-file write times
+
+        Returns:
+            The paths written, in the order they were produced.
+
+        Raises:
+            UnsafePathError: If a file would be written outside its project
+                directory, e.g. through a symlink already in ``output_dir``.
+
+        """
+        written = []
+        roots: dict[str, Path] = {}
+        for item in files:
+            start = time.perf_counter()
+            target = output_dir / item.path
+            name = item.path.parts[0]
+            root = roots.get(name) or roots.setdefault(name, (output_dir / name).resolve())
+            if not target.parent.resolve().is_relative_to(root):
+                raise UnsafePathError(
+                    item.source, f"Refusing to write '{item.path}' outside the project"
+                )
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if item.content is None:
+                materialize_file(item.source, target, mode)
+            else:
+                write_file(target, item.content, item.source)
+            written.append(target)
+            if timings is not None:
+                elapsed = time.perf_counter() - start
+                timings.add("write", elapsed)
+                timings.add_file(Path(*item.path.parts[1:]).as_posix(), elapsed)
+        return written
+
+    def generate(
+        self,
+        template_path: Path,
+        context: dict[str, Any],
+        output_dir: Path | str = ".",
+        overwrite_if_exists: bool = False,
+        accept_hooks: bool = True,
+        mode: LinkMode = LinkMode.AUTO,
+        timings: Timings | None = None,
+    ) -> Path:
+        """Render a template into ``output_dir`` and return the project directory.
+
+        Args:
+            template_path: Path to the project template
+            context: Context returned by :meth:`build_context`
+            output_dir: Directory the project directory is created in
+            overwrite_if_exists: Whether to overwrite an existing project directory
+            accept_hooks: Whether to run the template's pre/post generation hooks
+            mode: How files copied verbatim from the template are materialized
+            timings: Collects the ``hooks``, ``render`` and ``write`` phases
+
+        Raises:
+            UnsafePathError: If a rendered path would leave the project directory.
+            RenderError: If rendering, writing or a hook fails.
+
+        """
+        output_dir = Path(output_dir).resolve()
+        project_dir = output_dir
+        created = False
+        try:
+            env = self.environment(context)
+            project_template, _ = self._sources(template_path)
+            project_name = self._render_path(env, project_template.name, context)
+            project_dir = output_dir / _output_path(template_path, project_name)
+            if project_dir.exists() and not overwrite_if_exists:
+                raise OutputDirExistsException(f'Error: "{project_dir}" directory already exists')
+            created = not project_dir.exists()
+            project_dir.mkdir(parents=True, exist_ok=True)
+
+            timings = timings if timings is not None else Timings()
+            if accept_hooks:
+                with timings.phase("hooks"):
+                    run_hook_from_repo_dir(
+                        template_path, "pre_gen_project", project_dir, context, created
+                    )
+            files = self.iter_files(template_path, context, timings=timings)
+            self.write(files, output_dir, mode, timings=timings)
+            if accept_hooks:
+                with timings.phase("hooks"):
+                    run_hook_from_repo_dir(
+                        template_path, "post_gen_project", project_dir, context, created
+                    )
+        except (CookiecutterException, TemplateError, OSError, UnsafePathError) as e:
+            if created and project_dir.exists():
+                shutil.rmtree(project_dir)
+            if isinstance(e, UnsafePathError):
+                raise
+            raise RenderError(template_path, f"Unable to render {project_dir}", str(e)) from e
+        return project_dir
+
+
+def _output_path(template_path: Path, project_name: str, target: str = ".") -> Path:
+    """Join a rendered project name and file path, refusing any that leave the project.
+
+    Both come from template variables, so a context value such as ``../x`` must not
+    be able to place files outside the output directory (or archive members above
+    its root).
+
+    Raises:
+        UnsafePathError: If the project name is not a single directory name, or the
+            file path is absolute or contains ``..``.
+
+    """
+    name = Path(project_name)
+    if len(name.parts) != 1 or name.is_absolute() or project_name in (".", ".."):
+        raise UnsafePathError(
+            template_path, f"Rendered project name '{project_name}' is not a directory name"
+        )
+    path = Path(target)
+    if path.is_absolute() or ".." in path.parts:
+        raise UnsafePathError(
+            template_path, f"Rendered path '{target}' leaves the project directory"
+        )
+    return name / path
+
+
+def _parents(relpath: str) -> list[str]:
+    """Return every ancestor directory of a relative path, innermost last."""
+    parts = Path(relpath).parts[:-1]
+    return [os.path.join(*parts[: i + 1]) for i in range(len(parts))]
+
+
+def _is_verbatim(relpath: str, source: Path, context: dict[str, Any]) -> bool:
+    """Return whether a template file is copied without rendering.
+
+    ``_copy_without_render`` patterns are matched by cookiecutter's own
+    ``is_copy_only_path``, against the same paths ``cookiecutter`` checks: each
+    parent directory and the file itself, relative to the project template
+    directory.
+    """
+    for path in (*_parents(relpath), relpath):
+        if is_copy_only_path(path, context):
+            return True
+    return is_binary(str(source))
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> RenderEngine:
+    """Get the process-wide rendering engine, backed by the on-disk bytecode cache."""
+    bytecode_dir = cache_home() / "bytecode"
+    bytecode_dir.mkdir(parents=True, exist_ok=True)
+    return RenderEngine(FileSystemBytecodeCache(str(bytecode_dir)))
@@ -1,15 +1,29 @@
-"""Command-line interface for creating Python projects from templates."""
+"""Command-line interface for creating Python projects from templates.
+
+Only ``typer`` is imported at module level. Rich, cookiecutter and the rendering
+modules are imported inside the commands that use them, so ``--help`` and shell
+completion stay fast.
+"""
 
 from __future__ import annotations
 
 import os
-import subprocess
+import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
+
+from pytemplate.config import TEMPLATES_DIR
+from pytemplate.materialize import LinkMode
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from pytemplate.engine import RenderError
+    from pytemplate.registry import TemplateInfo
+    from pytemplate.timing import Timings
 
 app = typer.Typer(
     name="pytemplate-uv",
@@ -17,31 +31,42 @@ app = typer.Typer(
     add_completion=True,
     rich_help_panel=True,
 )
-console = Console()
 
 
-def _validate_template(template: str) -> Path:
-    """Validate and return the path to the specified template.
+@lru_cache(maxsize=1)
+def get_console() -> Console:
+    """Get the shared rich console, creating it on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _validate_template(template: str) -> TemplateInfo:
+    """Validate and return the indexed metadata of the specified template.
 
     Args:
         template (str): Name of the project template.
 
     Returns:
-        Path: Path to the template directory.
+        TemplateInfo: Indexed metadata, including the path to the template directory.
 
     Raises:
         typer.BadParameter: If template is not found.
 
     """
-    templates_dir = Path(__file__).parent.parent / "templates"
-    template_path = templates_dir / f"{template}-template"
+    from pytemplate.registry import get_registry
+
+    console = get_console()
+    registry = get_registry()
+    info = registry.get(template)
+
+    console.print(f"[yellow]Checking template: {template}[/]")
 
-    console.print(f"[yellow]Checking template path: {template_path}[/]")
+    if info is None:
+        from rich.panel import Panel
+        from rich.text import Text
 
-    if not template_path.exists():
-        available_templates = [
-            d.name.replace("-template", "") for d in templates_dir.glob("*-template") if d.is_dir()
-        ]
+        available_templates = registry.names()
 
         error_text = Text("Template not found!", style="bold red")
         suggestion_text = Text(
@@ -51,8 +76,8 @@ def _validate_template(template: str) -> Path:
         console.print(Panel(Text.assemble(error_text, suggestion_text), border_style="red"))
         raise typer.BadParameter(f"Template '{template}' not found")
 
-    console.print(f"[green]Using template path: {template_path}[/]")
-    return template_path
+    console.print(f"[green]Using template path: {info.path}[/]")
+    return info
 
 
 def _get_context() -> dict[str, str]:
@@ -69,32 +94,21 @@ def _get_context() -> dict[str, str]:
     }
 
 
-def _build_cookiecutter_command(
-    template_path: Path, context: dict, no_input: bool = False, force: bool = False
-) -> list[str]:
-    """Build the cookiecutter command with appropriate options.
-    Args:
-        template_path: Path to the project template
-        context: Context variables for the template
-        no_input: Whether to skip interactive prompts
-        force: Whether to overwrite existing project directory
-    Returns:
-        A list of command arguments.
-
-    """  # noqa: D205, D411
-    cookiecutter_cmd = [
-        "cookiecutter",
-        str(template_path),
-        *[f"{k}={v}" for k, v in context.items()],
-    ]
+def _report_failure(error: RenderError) -> None:
+    """Print the details of a failed project generation.
 
-    if no_input:
-        cookiecutter_cmd.append("--no-input")
+    Args:
+        error: The rendering error to report
 
-    if force:
-        cookiecutter_cmd.append("--overwrite-if-exists")
+    """
+    console = get_console()
+    console.print("[red]Project creation failed:[/]")
+    console.print(f"Template: {error.template_path}")
+    console.print(error.message)
 
-    return cookiecutter_cmd
+    if error.details:
+        console.print("[red]Error Output:[/]")
+        console.print(error.details)
 
 
 @app.command()
@@ -107,35 +121,321 @@ def create_project(
         False, "--no-input", "-y", help="Skip prompts and use default values"
     ),
     force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing project directory"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always render the template instead of reusing a cached render"
+    ),
+    link_mode: Annotated[
+        LinkMode,
+        typer.Option("--link-mode", help="How files that need no rendering are materialized"),
+    ] = LinkMode.AUTO,
+    timings: bool = typer.Option(False, "--timings", help="Print time spent in each phase"),
+    timings_json: str = typer.Option(
+        None, "--timings-json", help="Write phase and per-file timings as JSON ('-' for stdout)"
+    ),
+    profile: Annotated[
+        Path | None,
+        typer.Option("--profile", dir_okay=False, help="Write cProfile stats to this file"),
+    ] = None,
+    output_archive: str = typer.Option(
+        None,
+        "--output-archive",
+        help="Write the project to a .tar.gz/.tar.xz/.tar.bz2/.tar/.zip archive instead "
+        "of a directory ('-' streams a .tar.gz to stdout)",
+    ),
 ):
     """Create a new project from a specified template."""
-    template_path = _validate_template(template)
+    from pytemplate.timing import Timings
+
+    if output_archive == "-":
+        if timings_json == "-":
+            raise typer.BadParameter("--timings-json cannot also be written to stdout")
+        # Keep stdout clean for the archive.
+        get_console().file = sys.stderr
+
+    recorded = Timings()
+    profiler = None
+    if profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        _create_project(
+            project_name, template, no_input, force, no_cache, link_mode, recorded, output_archive
+        )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+            get_console().print(f"[dim]Profile written to {profile}[/]")
+        if timings:
+            _print_timings(recorded)
+        if timings_json:
+            _write_timings_json(recorded, timings_json)
+
+
+def _create_project(
+    project_name: str | None,
+    template: str,
+    no_input: bool,
+    force: bool,
+    no_cache: bool,
+    link_mode: LinkMode,
+    timings: Timings,
+    output_archive: str | None = None,
+) -> None:
+    """Generate a project, recording each phase in ``timings``."""
+    from pytemplate.cache import RenderCache
+    from pytemplate.engine import RenderError, get_engine
+    from pytemplate.registry import get_registry
+
+    console = get_console()
+    with timings.phase("validation"):
+        info = _validate_template(template)
+        registry = get_registry()
+        # The digest keys the render cache, so it must reflect every file as of now.
+        info = registry.refresh(info.name)
+        engine = get_engine()
+        registry.attach(engine)
+    template_path = info.path
     context = _get_context()
     if project_name:
         context["project_name"] = project_name
 
-    cookiecutter_cmd = _build_cookiecutter_command(template_path, context, no_input, force)
+    if output_archive and output_archive != "-" and Path(output_archive).exists() and not force:
+        raise typer.BadParameter(f"{output_archive} already exists (use --force to overwrite)")
+
+    try:
+        with timings.phase("context"):
+            full_context = engine.build_context(template_path, context, no_input)
+        if output_archive:
+            from pytemplate.archive import generate_archive
+
+            count = generate_archive(
+                engine, template_path, full_context, output_archive, timings=timings
+            )
+            console.print(f"[green]Project archived successfully![/] [dim]({count} files)[/]")
+            if output_archive != "-":
+                console.print(f"[green]{output_archive}[/]")
+            return
+        if no_cache:
+            project_dir = engine.generate(
+                template_path,
+                full_context,
+                overwrite_if_exists=force,
+                mode=link_mode,
+                timings=timings,
+            )
+            cached = False
+        else:
+            project_dir, cached = RenderCache.default().generate(
+                engine,
+                template_path,
+                full_context,
+                overwrite_if_exists=force,
+                template_digest=info.digest,
+                mode=link_mode,
+                timings=timings,
+            )
+    except RenderError as e:
+        _report_failure(e)
+        raise typer.Exit(code=1) from e
+
+    suffix = " [dim](cached)[/]" if cached else ""
+    console.print(f"[green]Project created successfully![/]{suffix}")
+    console.print(f"[green]{project_dir}[/]")
+
+
+def _print_timings(timings: Timings, files: int = 10) -> None:
+    """Print a table of phase timings and the slowest files."""
+    from rich.table import Table
+
+    total = timings.total
+    table = Table(title="Timings")
+    table.add_column("Phase", style="cyan")
+    table.add_column("ms", justify="right")
+    table.add_column("%", justify="right", style="dim")
+    for phase, seconds in timings.phases.items():
+        table.add_row(phase, f"{seconds * 1000:.1f}", f"{seconds / total:.0%}" if total else "")
+    table.add_row("total", f"{total * 1000:.1f}", "", style="bold")
+    get_console().print(table)
+
+    slowest = timings.slowest_files(files)
+    if slowest:
+        table = Table(title="Slowest files")
+        table.add_column("File", style="cyan")
+        table.add_column("ms", justify="right")
+        for path, seconds in slowest:
+            table.add_row(path, f"{seconds * 1000:.2f}")
+        get_console().print(table)
+
+
+def _write_timings_json(timings: Timings, destination: str) -> None:
+    """Write timings as JSON to ``destination``, or stdout for ``-``."""
+    import json
+
+    payload = json.dumps(timings.to_dict(), indent=2)
+    if destination == "-":
+        typer.echo(payload)
+    else:
+        Path(destination).write_text(payload + "\n", encoding="utf-8")
+
+
+@app.command()
+def update(
+    project_dir: Annotated[
+        Path, typer.Argument(exists=True, file_okay=False, help="Generated project to update")
+    ] = Path("."),
+    template: str = typer.Option(
+        None, "--template", "-t", help="Template to render (defaults to the recorded one)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Only report what would change"),
+):
+    """Re-render a generated project, rewriting only files whose output changed."""
+    from rich.table import Table
+
+    from pytemplate.engine import RenderError, get_engine
+    from pytemplate.registry import get_registry
+    from pytemplate.update import read_record, update_project
+
+    console = get_console()
+    try:
+        record = read_record(project_dir)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="PROJECT_DIR") from e
+
+    info = _validate_template(template or record.get("template", "pyproject"))
+    engine = get_engine()
+    get_registry().attach(engine)
+    try:
+        result = update_project(engine, info.path, project_dir, record, dry_run=dry_run)
+    except RenderError as e:
+        _report_failure(e)
+        raise typer.Exit(code=1) from e
+
+    table = Table(title="Dry Run" if dry_run else "Update Summary")
+    table.add_column("File", style="cyan")
+    table.add_column("Change")
+    for path in result.added:
+        table.add_row(path, "[green]added[/]")
+    for path in result.updated:
+        table.add_row(path, "[yellow]updated[/]")
+    for path in result.removed:
+        table.add_row(path, "[magenta]removed[/]")
+    for path, reason in result.conflicts:
+        table.add_row(path, f"[red]conflict[/]: {reason}")
+    if table.row_count:
+        console.print(table)
+
+    console.print(f"{result.written} files changed, {result.unchanged} unchanged")
+    if result.conflicts:
+        console.print(f"[red]{len(result.conflicts)} conflicts left untouched[/]")
+        raise typer.Exit(code=1)
+
+
+@app.command("list")
+def list_templates():
+    """List the available project templates."""
+    from rich.table import Table
+
+    from pytemplate.registry import get_registry
+
+    table = Table(title="Available Templates")
+    table.add_column("Name", style="cyan")
+    table.add_column("Description")
+    table.add_column("Files", justify="right")
+    table.add_column("Path", style="dim")
+    for info in get_registry():
+        table.add_row(info.name, info.description, str(len(info.files)), str(info.path))
+    get_console().print(table)
+
 
+@app.command()
+def batch(
+    manifest: Annotated[
+        Path,
+        typer.Argument(exists=True, dir_okay=False, help="Manifest file (.toml, .json or .csv)"),
+    ],
+    workers: int = typer.Option(
+        os.cpu_count() or 1, "--workers", "-w", min=1, help="Number of worker processes"
+    ),
+    output_dir: Annotated[
+        Path, typer.Option("--output-dir", "-o", help="Directory to create the projects in")
+    ] = Path("."),
+    force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing project directory"),
+    link_mode: Annotated[
+        LinkMode,
+        typer.Option("--link-mode", help="How files that need no rendering are materialized"),
+    ] = LinkMode.AUTO,
+):
+    """Create many projects in parallel from a manifest file."""
+    from rich.table import Table
+
+    from pytemplate.batch import load_manifest, run_batch
+
+    console = get_console()
     try:
-        result = subprocess.run(cookiecutter_cmd, text=True, check=True)
-        console.print("[green]Project created successfully![/]")
+        entries = load_manifest(manifest)
+    except (ValueError, OSError) as e:
+        raise typer.BadParameter(str(e), param_hint="MANIFEST") from e
+
+    console.print(f"[yellow]Generating {len(entries)} projects with {workers} workers[/]")
+    results = run_batch(
+        entries, _get_context(), TEMPLATES_DIR, output_dir, force, workers, mode=link_mode
+    )
+
+    table = Table(title="Batch Summary")
+    table.add_column("Project", style="cyan")
+    table.add_column("Template")
+    table.add_column("Status")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Details")
+    for result in results:
+        status = "[green]ok[/]" if result.ok else "[red]failed[/]"
+        details = str(result.project_dir) if result.ok else result.error or ""
+        table.add_row(
+            result.project_name, result.template, status, f"{result.duration:.3f}", details
+        )
+    console.print(table)
 
-        if result.stdout:
-            console.print(f"[green]{result.stdout.strip()}[/]")
+    failed = sum(not result.ok for result in results)
+    if failed:
+        console.print(f"[red]{failed} of {len(results)} projects failed[/]")
+        raise typer.Exit(code=1)
+    console.print(f"[green]All {len(results)} projects created successfully![/]")
 
-    except subprocess.CalledProcessError as e:
-        console.print("[red]Project creation failed:[/]")
-        console.print(f"Command: {' '.join(e.cmd)}")
 
-        if e.stdout:
-            console.print("[yellow]Standard Output:[/]")
-            console.print(e.stdout)
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on"),
+    workers: int = typer.Option(
+        os.cpu_count() or 1, "--workers", "-w", min=1, help="Number of warm worker processes"
+    ),
+    max_queue: int = typer.Option(
+        64, "--max-queue", min=0, help="Requests allowed to wait for a worker before a 503"
+    ),
+    output_dir: Annotated[
+        Path,
+        typer.Option("--output-dir", "-o", help="Root directory for path (non-archive) results"),
+    ] = Path("."),
+):
+    """Run a local HTTP scaffolding service backed by a warm worker pool."""
+    import asyncio
 
-        if e.stderr:
-            console.print("[red]Error Output:[/]")
-            console.print(e.stderr)
+    from pytemplate.server import ScaffoldServer
 
-        raise typer.Exit(code=1)  # noqa: B904
+    console = get_console()
+    server = ScaffoldServer(TEMPLATES_DIR, output_dir, _get_context(), workers, max_queue)
+    console.print(f"[yellow]Starting {workers} workers...[/]")
+    server.start_pool()
+    console.print(f"[green]Serving on http://{host}:{port}[/] [dim](Ctrl+C to stop)[/]")
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""Materialization of template files that need no rendering."""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+from enum import StrEnum
+from pathlib import Path
+
+# ioctl request number for FICLONE on Linux (_IOW(0x94, 9, int)).
+_FICLONE = 0x40049409
+
+# Errors meaning "this filesystem/kernel cannot do that", as opposed to real failures.
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EMLINK,
+}
+
+
+class LinkMode(StrEnum):
+    """How verbatim files are placed in a generated project.
+
+    ``auto`` tries a reflink (copy-on-write clone), then an in-kernel copy. ``reflink``
+    and ``hardlink`` try that method first and fall back to an in-kernel copy;
+    hardlinks share the inode with the source, so editing the generated file also
+    edits the template or cache entry it came from. ``copy`` always copies.
+    """
+
+    AUTO = "auto"
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    COPY = "copy"
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        return False
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            return False
+    return True
+
+
+def _hardlink(source: Path, target: Path) -> bool:
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED:
+            raise
+        return False
+    return True
+
+
+def _kernel_copy(source: Path, target: Path) -> str:
+    """Copy a file without moving its bytes through user space where possible."""
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        for name in ("copy_file_range", "sendfile"):
+            func = getattr(os, name, None)
+            if func is None:
+                continue
+            offset = 0
+            try:
+                while offset < size:
+                    if name == "copy_file_range":
+                        sent = func(src.fileno(), dst.fileno(), size - offset, offset, offset)
+                    else:
+                        sent = func(dst.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED or offset:
+                    raise
+                continue
+            if offset >= size:
+                return name
+        src.seek(0)
+        dst.seek(0)
+        dst.truncate()
+        shutil.copyfileobj(src, dst)
+    return "copy"
+
+
+def materialize_file(source: Path, target: Path, mode: LinkMode = LinkMode.AUTO) -> str:
+    """Place ``source`` at ``target`` using the cheapest method ``mode`` allows.
+
+    An existing ``target`` is replaced. Permission bits are copied from ``source``
+    unless the file was hardlinked (and so already shares them).
+
+    Args:
+        source: File to materialize
+        target: Destination path; its parent directory must exist
+        mode: Materialization strategy
+
+    Returns:
+        The method used: ``reflink``, ``hardlink``, ``copy_file_range``,
+        ``sendfile`` or ``copy``.
+
+    """
+    if target.exists() or target.is_symlink():
+        target.unlink()
+
+    mode = LinkMode(mode)
+    if mode is LinkMode.HARDLINK and _hardlink(source, target):
+        return "hardlink"
+    if mode is LinkMode.COPY:
+        shutil.copyfile(source, target)
+        method = "copy"
+    elif mode in (LinkMode.AUTO, LinkMode.REFLINK) and _reflink(source, target):
+        method = "reflink"
+    else:
+        method = _kernel_copy(source, target)
+    shutil.copymode(source, target)
+    return method
+
+
+def write_file(target: Path, content: bytes, mode_source: Path) -> None:
+    """Write rendered ``content`` to ``target`` with the permissions of ``mode_source``.
+
+    A ``target`` that is hardlinked elsewhere is unlinked first, so writing never
+    modifies the file it shares an inode with.
+    """
+    if target.is_symlink() or (target.exists() and target.stat().st_nlink > 1):
+        target.unlink()
+    target.write_bytes(content)
+    shutil.copymode(mode_source, target)
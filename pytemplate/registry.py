@@ -0,0 +1,290 @@
+"""Persistent index of the bundled project templates."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from cookiecutter.exceptions import CookiecutterException
+
+from pytemplate.config import TEMPLATES_DIR, cache_home
+
+if TYPE_CHECKING:
+    from pytemplate.engine import RenderEngine
+
+INDEX_FORMAT = 2
+
+# Seconds an indexed template is trusted without walking it again, as long as its
+# directory and cookiecutter.json look unchanged.
+DEFAULT_INDEX_TTL = 60.0
+
+_SUFFIX = "-template"
+
+
+@dataclass
+class TemplateInfo:
+    """Indexed metadata for one template.
+
+    Attributes:
+        name: Template name, as passed to ``--template``
+        path: Path to the template directory
+        defaults: Raw contents of the template's ``cookiecutter.json``
+        files: Template files relative to ``path``, in sorted order
+        stats: ``(mtime_ns, size, mode)`` of every file when it was last hashed
+        hashes: SHA-256 of every file's contents
+        digest: Hash of the whole template tree
+        compiled: Whether the template's Jinja bytecode has been cached
+        stamp: ``mtime_ns`` of the template directory, and ``mtime_ns`` and size of
+            its ``cookiecutter.json``, when it was last walked
+        checked_at: Wall-clock time of that walk
+
+    """
+
+    name: str
+    path: Path
+    defaults: dict[str, Any] = field(default_factory=dict)
+    files: list[str] = field(default_factory=list)
+    stats: dict[str, list[int]] = field(default_factory=dict)
+    hashes: dict[str, str] = field(default_factory=dict)
+    digest: str = ""
+    compiled: bool = False
+    stamp: list[int] = field(default_factory=list)
+    checked_at: float = 0.0
+
+    @property
+    def description(self) -> str:
+        """Return the template's default project description."""
+        return str(self.defaults.get("description", ""))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {**asdict(self), "path": str(self.path)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TemplateInfo:
+        """Build an instance from :meth:`to_dict` output."""
+        return cls(**{**data, "path": Path(data["path"])})
+
+
+def _stamp(template_path: Path) -> list[int]:
+    """Cheaply fingerprint a template: two ``stat`` calls, no directory walk."""
+    try:
+        config = (template_path / "cookiecutter.json").stat()
+    except FileNotFoundError:
+        config_stamp = [0, 0]
+    else:
+        config_stamp = [config.st_mtime_ns, config.st_size]
+    return [template_path.stat().st_mtime_ns, *config_stamp]
+
+
+def _scan(template_path: Path) -> dict[str, list[int]]:
+    """Stat every file in a template without reading it."""
+    stats = {}
+    for root, dirs, files in os.walk(template_path):
+        dirs.sort()
+        for name in files:
+            path = Path(root) / name
+            st = path.stat()
+            stats[path.relative_to(template_path).as_posix()] = [
+                st.st_mtime_ns,
+                st.st_size,
+                st.st_mode & 0o777,
+            ]
+    return dict(sorted(stats.items()))
+
+
+def _index_template(name: str, path: Path, previous: TemplateInfo | None) -> TemplateInfo:
+    """Index a template, rehashing only files whose mtime or size changed."""
+    stats = _scan(path)
+    if previous is not None and previous.stats == stats:
+        return previous
+
+    hashes = {}
+    for relpath, stat in stats.items():
+        if previous is not None and previous.stats.get(relpath) == stat:
+            hashes[relpath] = previous.hashes[relpath]
+        else:
+            hashes[relpath] = hashlib.sha256((path / relpath).read_bytes()).hexdigest()
+
+    digest = hashlib.sha256()
+    for relpath, sha in hashes.items():
+        digest.update(relpath.encode())
+        digest.update(b"\0%o\0" % stats[relpath][2])
+        digest.update(bytes.fromhex(sha))
+
+    config = path / "cookiecutter.json"
+    defaults = json.loads(config.read_text(encoding="utf-8")) if config.is_file() else {}
+    return TemplateInfo(
+        name=name,
+        path=path,
+        defaults=defaults,
+        files=list(stats),
+        stats=stats,
+        hashes=hashes,
+        digest=digest.hexdigest(),
+    )
+
+
+class TemplateRegistry:
+    """Index of the templates in a directory, persisted between runs.
+
+    The index is read once per process. An indexed template is reused without
+    walking it while its directory and ``cookiecutter.json`` are unchanged and it was
+    last walked less than ``ttl`` seconds ago; edits deeper in the tree are picked up
+    once the TTL expires, or at once by :meth:`refresh`. A walk rehashes only files
+    whose mtime or size changed, and a template's Jinja sources are compiled into the
+    engine's bytecode cache the first time it is attached after a change.
+
+    Args:
+        templates_dir: Directory holding the ``*-template`` directories
+        index_path: File the index is persisted to
+        ttl: Seconds a template is trusted without a walk; ``0`` walks every load
+
+    """
+
+    def __init__(
+        self, templates_dir: Path, index_path: Path, ttl: float = DEFAULT_INDEX_TTL
+    ) -> None:
+        """Create the registry; see the class docstring for the arguments."""
+        self.templates_dir = templates_dir
+        self.index_path = index_path
+        self.ttl = ttl
+        self._templates: dict[str, TemplateInfo] = {}
+        self._attached: set[int] = set()
+
+    def _read_index(self) -> dict[str, TemplateInfo]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != INDEX_FORMAT:
+            return {}
+        return {name: TemplateInfo.from_dict(info) for name, info in data["templates"].items()}
+
+    def save(self) -> None:
+        """Persist the index atomically."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "format": INDEX_FORMAT,
+            "templates": {name: info.to_dict() for name, info in self._templates.items()},
+        }
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def load(self) -> set[str]:
+        """Load the index from disk, refreshing templates that changed.
+
+        Returns:
+            The names of templates that were added or re-indexed.
+
+        """
+        previous = self._read_index()
+        templates = {}
+        changed = set()
+        walked = False
+        now = time.time()
+        if self.templates_dir.is_dir():
+            for entry in sorted(os.scandir(self.templates_dir), key=lambda e: e.name):
+                if not (entry.name.endswith(_SUFFIX) and entry.is_dir()):
+                    continue
+                name = entry.name[: -len(_SUFFIX)]
+                path = Path(entry.path)
+                old = previous.get(name)
+                stamp = _stamp(path)
+                if old is not None and old.stamp == stamp and 0 <= now - old.checked_at < self.ttl:
+                    templates[name] = old
+                    continue
+                info = _index_template(name, path, old)
+                if info is not old:
+                    changed.add(name)
+                info.stamp, info.checked_at = stamp, now
+                templates[name] = info
+                walked = True
+
+        self._templates = templates
+        if walked or templates.keys() != previous.keys():
+            self.save()
+        return changed
+
+    def refresh(self, name: str) -> TemplateInfo | None:
+        """Re-stat every file of one template and re-index it if any changed.
+
+        :meth:`load` may trust a template without looking below its directory, so
+        call this before using :attr:`TemplateInfo.digest` as a cache key. Only
+        files whose mtime or size changed are rehashed. A re-indexed template is
+        registered again with engines on their next :meth:`attach`.
+
+        Returns:
+            The up-to-date template, or None if there is no template ``name``.
+
+        """
+        old = self._templates.get(name)
+        if old is None:
+            return None
+        info = _index_template(name, old.path, old)
+        if info is not old:
+            info.stamp, info.checked_at = _stamp(old.path), time.time()
+            self._templates[name] = info
+            self._attached.clear()
+            self.save()
+        return info
+
+    def get(self, name: str) -> TemplateInfo | None:
+        """Return the indexed template called ``name``, if any."""
+        return self._templates.get(name)
+
+    def names(self) -> list[str]:
+        """Return the names of all indexed templates."""
+        return list(self._templates)
+
+    def __iter__(self) -> Iterator[TemplateInfo]:
+        """Iterate over the indexed templates, in name order."""
+        return iter(self._templates.values())
+
+    def attach(self, engine: RenderEngine) -> None:
+        """Register every template with ``engine`` and precompile stale ones.
+
+        A template whose Jinja environment cannot be created (e.g. a missing
+        extension) is left uncompiled, so only renders of that template fail.
+
+        Args:
+            engine: Engine that will render the templates
+
+        """
+        if id(engine) in self._attached:
+            return
+        self._attached.add(id(engine))
+
+        compiled = False
+        for info in self:
+            engine.register(info.path, info.files, info.hashes)
+            if not info.compiled:
+                try:
+                    engine.compile(info.path, {"cookiecutter": info.defaults})
+                except CookiecutterException:
+                    continue
+                info.compiled = compiled = True
+        if compiled:
+            self.save()
+
+
+@lru_cache
+def get_registry(templates_dir: Path = TEMPLATES_DIR) -> TemplateRegistry:
+    """Get the loaded registry for a templates directory.
+
+    The index TTL can be changed with ``PYTEMPLATE_INDEX_TTL`` (seconds).
+    """
+    templates_dir = templates_dir.resolve()
+    key = hashlib.sha256(str(templates_dir).encode()).hexdigest()[:16]
+    ttl = float(os.environ.get("PYTEMPLATE_INDEX_TTL", DEFAULT_INDEX_TTL))
+    registry = TemplateRegistry(templates_dir, cache_home() / "index" / f"{key}.json", ttl)
+    registry.load()
+    return registry
@@ -0,0 +1,494 @@
+"""Long-running scaffolding service with a warm worker pool.
+
+``pytemplate serve`` keeps a pool of worker processes that have already imported
+the rendering stack and compiled every template, so a generation request costs
+only the render itself. The HTTP layer is a small asyncio server speaking enough
+HTTP/1.1 for local tooling:
+
+- ``POST /generate`` with a JSON body ``{"template", "project_name", "context",
+  "output", "format", "force"}``. ``output`` is ``"archive"`` (default; the
+  response body is the project as ``format``, ``tar.gz`` or ``zip``) or ``"path"``
+  (the project is written below the server's output directory, or the relative
+  ``output_dir`` given in the body, and its path is returned as JSON).
+- ``GET /templates`` lists the available templates.
+- ``GET /stats`` reports queue depth, in-flight requests and latency percentiles.
+- ``GET /healthz`` returns ``ok``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from cookiecutter.exceptions import CookiecutterException
+from jinja2.exceptions import TemplateError
+
+from pytemplate.archive import ArchiveFormat, write_archive
+from pytemplate.batch import BatchEntry
+from pytemplate.engine import RenderError, UnsafePathError, get_engine
+from pytemplate.registry import get_registry
+
+# Largest request body accepted, in bytes.
+MAX_BODY = 1024 * 1024
+
+# Latency samples kept for the percentiles reported by /stats.
+LATENCY_WINDOW = 1024
+
+_CONTENT_TYPES = {
+    ArchiveFormat.TAR_GZ: "application/gzip",
+    ArchiveFormat.TAR_BZ2: "application/x-bzip2",
+    ArchiveFormat.TAR_XZ: "application/x-xz",
+    ArchiveFormat.TAR: "application/x-tar",
+    ArchiveFormat.ZIP: "application/zip",
+}
+
+
+class HTTPError(Exception):
+    """A request that is answered with an error status and JSON body.
+
+    Args:
+        status: Response status
+        message: Error message, sent as ``error``
+        details: Optional further detail, sent as ``details``
+
+    """
+
+    def __init__(self, status: HTTPStatus, message: str, details: str | None = None) -> None:
+        """Create the error; see the class docstring for the arguments."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+def _warm(templates_dir: Path) -> None:
+    """Worker initializer: load the registry and compile every template once."""
+    get_registry(templates_dir).attach(get_engine())
+
+
+def _archive_job(
+    entry: BatchEntry, base_context: dict[str, Any], templates_dir: Path, fmt: ArchiveFormat
+) -> tuple[bytes, int]:
+    """Render one project into an in-memory archive inside a worker process."""
+    registry = get_registry(templates_dir)
+    info = registry.get(entry.template)
+    engine = get_engine()
+    registry.attach(engine)
+    context = {**base_context, **entry.context, "project_name": entry.project_name}
+    full_context = engine.build_context(info.path, context, no_input=True)
+    buffer = io.BytesIO()
+    try:
+        count = write_archive(engine.iter_files(info.path, full_context), buffer, fmt)
+    except (CookiecutterException, TemplateError, OSError) as e:
+        raise RenderError(info.path, "Unable to render the archive", str(e)) from e
+    return buffer.getvalue(), count
+
+
+def _path_job(
+    entry: BatchEntry,
+    base_context: dict[str, Any],
+    templates_dir: Path,
+    output_dir: Path,
+    force: bool,
+) -> str:
+    """Render one project below ``output_dir`` inside a worker process."""
+    registry = get_registry(templates_dir)
+    info = registry.get(entry.template)
+    engine = get_engine()
+    registry.attach(engine)
+    context = {**base_context, **entry.context, "project_name": entry.project_name}
+    full_context = engine.build_context(info.path, context, no_input=True)
+    project_dir = engine.generate(
+        info.path, full_context, output_dir=output_dir, overwrite_if_exists=force
+    )
+    return str(project_dir)
+
+
+@dataclass
+class ServerStats:
+    """Counters and recent latencies of a running server.
+
+    Attributes:
+        workers: Size of the worker pool
+        queued: Requests waiting for a free worker
+        in_flight: Requests being rendered
+        completed: Requests rendered successfully
+        failed: Requests whose render failed
+        rejected: Requests turned away because the queue was full
+        latencies: Recent end-to-end generation latencies, in seconds
+        waits: Recent times spent queued before a worker was free, in seconds
+
+    """
+
+    workers: int
+    queued: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    waits: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    @staticmethod
+    def _summary(samples: deque[float]) -> dict[str, float]:
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+        return {
+            "mean": statistics.fmean(ordered) * 1000,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": ordered[-1] * 1000,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot; latencies are in milliseconds."""
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency_ms": self._summary(self.latencies),
+            "queue_wait_ms": self._summary(self.waits),
+        }
+
+
+class ScaffoldServer:
+    """Asyncio HTTP front end over a bounded pool of warm worker processes.
+
+    Args:
+        templates_dir: Directory holding the ``*-template`` directories
+        output_dir: Root that ``path`` responses are written below
+        base_context: Context shared by every request (author, email, ...)
+        workers: Number of worker processes
+        max_queue: Requests allowed to wait for a worker before new ones get a 503
+
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path,
+        output_dir: Path,
+        base_context: dict[str, Any],
+        workers: int = 1,
+        max_queue: int = 64,
+    ) -> None:
+        """Create the server; see the class docstring for the arguments."""
+        self.templates_dir = templates_dir
+        self.output_dir = output_dir.resolve()
+        self.base_context = base_context
+        self.max_queue = max_queue
+        self.stats = ServerStats(workers=workers)
+        self.registry = get_registry(templates_dir)
+        self.port = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(workers)
+
+    def start_pool(self) -> None:
+        """Start the worker processes and wait until each has warmed up."""
+        workers = self.stats.workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_warm, initargs=(self.templates_dir,)
+        )
+        # Submitting one task per worker spawns them all (and so compiles the
+        # templates) before the first request arrives.
+        for future in [self._executor.submit(time.sleep, 0.01) for _ in range(workers)]:
+            future.result()
+
+    def close(self) -> None:
+        """Shut the worker pool down."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def serve(self, host: str, port: int, ready: asyncio.Event | None = None) -> None:
+        """Accept connections until cancelled.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; ``0`` picks a free one (see :attr:`port`)
+            ready: Set once the server is listening
+
+        """
+        if self._executor is None:
+            self.start_pool()
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        """Run ``func`` on the pool, queueing (boundedly) for a free worker.
+
+        Raises:
+            HTTPError: 503 if every worker is busy and the queue is full, 400 if the
+                context would place files outside the project, 422 if the render
+                fails, 500 if the worker fails in any other way.
+
+        """
+        stats = self.stats
+        if self._slots.locked() and stats.queued >= self.max_queue:
+            stats.rejected += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Generation queue is full")
+
+        start = time.perf_counter()
+        stats.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            stats.queued -= 1
+        stats.waits.append(time.perf_counter() - start)
+        stats.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, func, *args)
+        except UnsafePathError as e:
+            stats.failed += 1
+            raise HTTPError(HTTPStatus.BAD_REQUEST, e.message, e.details) from e
+        except RenderError as e:
+            stats.failed += 1
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, e.message, e.details) from e
+        except Exception as e:
+            stats.failed += 1
+            raise HTTPError(
+                HTTPStatus.INTERNAL_SERVER_ERROR, "Generation failed", f"{type(e).__name__}: {e}"
+            ) from e
+        finally:
+            stats.in_flight -= 1
+            self._slots.release()
+        stats.completed += 1
+        stats.latencies.append(time.perf_counter() - start)
+        return result
+
+    def _entry(self, payload: dict[str, Any]) -> BatchEntry:
+        template = payload.get("template") or "pyproject"
+        if self.registry.get(template) is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Template '{template}' not found")
+        context = payload.get("context") or {}
+        if not isinstance(context, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'context' must be an object")
+        name = payload.get("project_name") or context.get("project_name")
+        if not name:
+            name = self.registry.get(template).defaults.get("project_name", "project")
+        name = str(name)
+        # The name becomes a directory (or archive member) name; keep it one level deep.
+        if "/" in name or "\\" in name or ".." in name:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, "'project_name' must not contain '/', '\\' or '..'"
+            )
+        if not name.isprintable():
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, "'project_name' must not contain control characters"
+            )
+        return BatchEntry(project_name=name, template=template, context=context)
+
+    async def _generate(self, payload: dict[str, Any]) -> tuple[HTTPStatus, dict[str, str], bytes]:
+        entry = self._entry(payload)
+        output = payload.get("output", "archive")
+
+        if output == "archive":
+            try:
+                fmt = ArchiveFormat(payload.get("format", ArchiveFormat.TAR_GZ.value))
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from e
+            body, count = await self._run(
+                _archive_job, entry, self.base_context, self.templates_dir, fmt
+            )
+            headers = {
+                "Content-Type": _CONTENT_TYPES[fmt],
+                "Content-Disposition": _attachment(f"{entry.project_name}.{fmt.value}"),
+                "X-Files": str(count),
+            }
+            return HTTPStatus.OK, headers, body
+
+        if output == "path":
+            output_dir = (self.output_dir / payload.get("output_dir", ".")).resolve()
+            project_dir = (output_dir / entry.project_name).resolve()
+            if not (
+                output_dir.is_relative_to(self.output_dir)
+                and project_dir.is_relative_to(self.output_dir)
+            ):
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST,
+                    "The project must be inside the server's output directory",
+                )
+            start = time.perf_counter()
+            project_dir = await self._run(
+                _path_job,
+                entry,
+                self.base_context,
+                self.templates_dir,
+                output_dir,
+                bool(payload.get("force", False)),
+            )
+            body = {"project_dir": project_dir, "duration": time.perf_counter() - start}
+            return HTTPStatus.OK, {}, json.dumps(body).encode()
+
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "'output' must be 'archive' or 'path'")
+
+    async def dispatch(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[HTTPStatus, dict[str, str], bytes]:
+        """Route one request.
+
+        Returns:
+            The response status, extra headers and body.
+
+        Raises:
+            HTTPError: If the request cannot be served.
+
+        """
+        path = path.split("?", 1)[0]
+        if path == "/generate":
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from e
+            if not isinstance(payload, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+            return await self._generate(payload)
+        if method != "GET":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+        if path == "/stats":
+            return HTTPStatus.OK, {}, json.dumps(self.stats.to_dict()).encode()
+        if path == "/templates":
+            templates = [
+                {"name": info.name, "description": info.description} for info in self.registry
+            ]
+            return HTTPStatus.OK, {}, json.dumps(templates).encode()
+        if path == "/healthz":
+            return HTTPStatus.OK, {"Content-Type": "text/plain"}, b"ok"
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    async def _response(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[HTTPStatus, dict[str, str], bytes]:
+        """Dispatch one request, turning every failure into an error response."""
+        try:
+            return await self.dispatch(method, target, body)
+        except HTTPError as e:
+            return _error(e.status, e.message, e.details)
+        except Exception as e:
+            return _error(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                "Internal server error",
+                f"{type(e).__name__}: {e}",
+            )
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, *_error(HTTPStatus.BAD_REQUEST, "Bad request"))
+                    break
+
+                try:
+                    headers = await _read_headers(reader)
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, *_error(HTTPStatus.BAD_REQUEST, "Bad request"))
+                    break
+                if length > MAX_BODY:
+                    status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                    await self._respond(writer, *_error(status, "Request body too large"))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                response = await self._response(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == (
+                    "HTTP/1.1"
+                )
+                await self._respond(writer, *response, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        headers: dict[str, str],
+        body: bytes,
+        keep_alive: bool = False,
+    ) -> None:
+        headers = {
+            "Content-Type": "application/json",
+            **headers,
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    """Read header lines up to the blank line ending them.
+
+    Raises:
+        ValueError: If a header line has no ``:``.
+
+    """
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, colon, value = line.decode("latin-1").partition(":")
+        if not colon or not name.strip():
+            raise ValueError(f"Malformed header line: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _attachment(filename: str) -> str:
+    """Build a ``Content-Disposition`` header value that is safe for any file name.
+
+    Non-ASCII names are sent as an RFC 5987 ``filename*``, with an ASCII
+    ``filename`` fallback for older clients.
+    """
+    fallback = "".join(
+        c if c.isascii() and c.isprintable() and c not in '"\\' else "_" for c in filename
+    )
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def _error(
+    status: HTTPStatus, message: str, details: str | None = None
+) -> tuple[HTTPStatus, dict[str, str], bytes]:
+    payload = {"error": message}
+    if details:
+        payload["details"] = details
+    headers = {"Retry-After": "1"} if status is HTTPStatus.SERVICE_UNAVAILABLE else {}
+    return status, headers, json.dumps(payload).encode()
@@ -0,0 +1,56 @@
+"""Per-phase and per-file timing of project generation."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class Timings:
+    """Wall-clock time spent in each generation phase and on each file.
+
+    Phases are accumulated, so a phase entered several times (e.g. ``write`` once per
+    file) reports its total. Phases are reported in the order first entered.
+    """
+
+    def __init__(self) -> None:
+        """Start an empty record; the total runs from now."""
+        self.phases: dict[str, float] = {}
+        self.files: dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add ``seconds`` to ``phase``."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_file(self, path: str, seconds: float) -> None:
+        """Add ``seconds`` to the time spent producing ``path``."""
+        self.files[path] = self.files.get(path, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    @property
+    def total(self) -> float:
+        """Return the seconds elapsed since the timings were created."""
+        return time.perf_counter() - self._start
+
+    def slowest_files(self, count: int = 10) -> list[tuple[str, float]]:
+        """Return the ``count`` files that took longest, slowest first."""
+        return sorted(self.files.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation, in seconds."""
+        return {
+            "total": self.total,
+            "phases": dict(self.phases),
+            "files": dict(sorted(self.files.items())),
+        }
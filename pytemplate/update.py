@@ -0,0 +1,216 @@
+"""Incremental re-rendering of previously generated projects."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from cookiecutter.exceptions import CookiecutterException
+from jinja2.exceptions import TemplateError
+
+from pytemplate.engine import (
+    RECORD_FILE,
+    RenderedFile,
+    RenderEngine,
+    RenderError,
+    file_digest,
+)
+from pytemplate.materialize import LinkMode, materialize_file, write_file
+
+
+@dataclass
+class UpdateResult:
+    """Files touched (or left alone) by an update.
+
+    Attributes:
+        added: Files the template now produces that did not exist
+        updated: Files rewritten because the template output changed
+        removed: Files the template no longer produces, deleted because unmodified
+        conflicts: Files changed both by the template and locally, with a reason
+        unchanged: Number of files whose content already matched
+
+    """
+
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    conflicts: list[tuple[str, str]] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def written(self) -> int:
+        """Return the number of files created, rewritten or deleted."""
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+
+def read_record(project_dir: Path) -> dict[str, Any]:
+    """Read the generation record stored in a project.
+
+    Raises:
+        ValueError: If the project has no readable record.
+
+    """
+    path = project_dir / RECORD_FILE
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError as e:
+        raise ValueError(f"{project_dir} has no {RECORD_FILE} generation record") from e
+    except ValueError as e:
+        raise ValueError(f"{path} is not valid JSON: {e}") from e
+
+
+def _disk_digest(path: Path) -> str | None:
+    return file_digest(path.read_bytes()) if path.is_file() else None
+
+
+class _FileStatus(StrEnum):
+    """How an update treats one rendered file."""
+
+    UNCHANGED = "unchanged"
+    ADDED = "added"
+    UPDATED = "updated"
+    CONFLICT = "conflict"
+
+
+def _classify(
+    new: str, old: str | None, current: str | None
+) -> tuple[_FileStatus, str | None, str]:
+    """Three-way compare a rendered file with its recorded base and the copy on disk.
+
+    Args:
+        new: Hash of the freshly rendered output
+        old: Hash recorded at the last generation, if the file was generated then
+        current: Hash of the file on disk, if it exists
+
+    Returns:
+        The status, the hash to record for the file (``None`` to leave it out of the
+        record) and, for conflicts, the reason.
+
+    """
+    if current == new:
+        return _FileStatus.UNCHANGED, new, ""
+    if current is None and old is not None:
+        # Deleted locally: respect it unless the template changed the file too.
+        if old == new:
+            return _FileStatus.UNCHANGED, old, ""
+        return _FileStatus.CONFLICT, old, "deleted locally, changed in template"
+    if current is not None and current != old:
+        if old == new:
+            # Only the local copy changed; keep the user's edits.
+            return _FileStatus.UNCHANGED, old, ""
+        if old is None:
+            return _FileStatus.CONFLICT, None, "added locally and in template"
+        return _FileStatus.CONFLICT, old, "modified locally and in template"
+    return (_FileStatus.ADDED if current is None else _FileStatus.UPDATED), new, ""
+
+
+def _apply_rendered(
+    rendered: list[RenderedFile],
+    project_dir: Path,
+    base: dict[str, str],
+    hashes: dict[str, str],
+    result: UpdateResult,
+    dry_run: bool,
+    mode: LinkMode,
+) -> None:
+    """Write the rendered files that changed only in the template."""
+    for item in rendered:
+        relpath = Path(*item.path.parts[1:]).as_posix()
+        target = project_dir / relpath
+        status, recorded, reason = _classify(
+            file_digest(item.read()), base.get(relpath), _disk_digest(target)
+        )
+        if recorded is not None:
+            hashes[relpath] = recorded
+        if status is _FileStatus.UNCHANGED:
+            result.unchanged += 1
+        elif status is _FileStatus.CONFLICT:
+            result.conflicts.append((relpath, reason))
+        else:
+            (result.added if status is _FileStatus.ADDED else result.updated).append(relpath)
+            if not dry_run:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if item.content is None:
+                    materialize_file(item.source, target, mode)
+                else:
+                    write_file(target, item.content, item.source)
+
+
+def _remove_dropped(
+    project_dir: Path,
+    base: dict[str, str],
+    hashes: dict[str, str],
+    result: UpdateResult,
+    dry_run: bool,
+) -> None:
+    """Delete unmodified files that the template no longer produces."""
+    conflicted = {path for path, _ in result.conflicts}
+    for relpath, old in base.items():
+        if relpath in hashes or relpath in conflicted:
+            continue
+        target = project_dir / relpath
+        current = _disk_digest(target)
+        if current is None:
+            continue
+        if current != old:
+            result.conflicts.append((relpath, "modified locally, removed from template"))
+            hashes[relpath] = old
+            continue
+        result.removed.append(relpath)
+        if not dry_run:
+            target.unlink()
+
+
+def update_project(
+    engine: RenderEngine,
+    template_path: Path,
+    project_dir: Path,
+    record: dict[str, Any],
+    dry_run: bool = False,
+    mode: LinkMode = LinkMode.AUTO,
+) -> UpdateResult:
+    """Re-render a template against a project's recorded answers.
+
+    Each rendered file is compared by content hash with the file on disk and with
+    the hash recorded at the last generation (the common base). Files are written
+    only when the template output changed and the local copy is untouched; files
+    changed on both sides are reported as conflicts and left as they are.
+
+    Args:
+        engine: Engine used to render the template
+        template_path: Path to the project template
+        project_dir: Root of the generated project
+        record: The project's generation record, see :func:`read_record`
+        dry_run: Whether to only report what would change
+        mode: How files copied verbatim from the template are materialized
+
+    Returns:
+        What was (or would be) changed.
+
+    Raises:
+        RenderError: If the template cannot be rendered.
+
+    """
+    context = engine.build_context(template_path, record.get("context", {}), no_input=True)
+    base: dict[str, str] = record.get("files", {})
+    hashes: dict[str, str] = {}
+    result = UpdateResult()
+
+    try:
+        rendered = list(engine.iter_files(template_path, context, record=False))
+    except (CookiecutterException, TemplateError, OSError) as e:
+        raise RenderError(template_path, f"Unable to render {project_dir}", str(e)) from e
+
+    _apply_rendered(rendered, project_dir, base, hashes, result, dry_run, mode)
+    _remove_dropped(project_dir, base, hashes, result, dry_run)
+
+    if not dry_run:
+        answers = {k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")}
+        record = {**record, "context": answers, "files": dict(sorted(hashes.items()))}
+        (project_dir / RECORD_FILE).write_text(
+            json.dumps(record, indent=2) + "\n", encoding="utf-8"
+        )
+    return result
@@ -0,0 +1,125 @@
+"""Microbenchmark: BaseHTTPMiddleware vs. pure ASGI middleware.
+
+Drives a minimal app through the request-logging and security-header layers by
+calling it directly over ASGI (no sockets), so only middleware overhead differs
+between the two stacks. Run from the project root:
+
+    python benchmarks/middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from {{cookiecutter.package_name}}.core.middleware import (
+    RequestLoggingMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        logging.getLogger(__name__).info(
+            "Request started",
+            extra={"request_id": request_id, "url": str(request.url)},
+        )
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = (
+            "max-age=31536000; includeSubDomains"
+        )
+        response.headers["Content-Security-Policy"] = "default-src 'self'"
+        return response
+
+
+async def _endpoint(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+def _app(logging_cls: type, headers_cls: type) -> Starlette:
+    app = Starlette(routes=[Route("/", _endpoint)])
+    app.add_middleware(logging_cls)
+    app.add_middleware(headers_cls)
+    return app
+
+
+async def _run(app: Starlette, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, rounds: int) -> None:
+    stacks = {
+        "BaseHTTPMiddleware": _app(
+            LegacyRequestLoggingMiddleware, LegacySecurityHeadersMiddleware
+        ),
+        "pure ASGI": _app(RequestLoggingMiddleware, SecurityHeadersMiddleware),
+    }
+    best = {name: 0.0 for name in stacks}
+    for _ in range(rounds):
+        for name, app in stacks.items():
+            best[name] = max(best[name], await _run(app, requests))
+
+    for name, rate in best.items():
+        print(f"{name:>20}: {rate:10.0f} req/s")
+    speedup = best["pure ASGI"] / best["BaseHTTPMiddleware"]
+    print(f"{'speedup':>20}: {speedup:10.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(args.requests, args.rounds))
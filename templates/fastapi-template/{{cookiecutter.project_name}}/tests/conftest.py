@@ -1,4 +1,7 @@
 import asyncio
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient, ASGITransport
@@ -6,8 +9,14 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
+# Point the app at a throwaway database before its settings are first loaded.
+os.environ["DATABASE_URL"] = (
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+
+from {{cookiecutter.package_name}}.core.cache import get_example_cache
 from {{cookiecutter.package_name}}.core.config import get_settings
-from {{cookiecutter.package_name}}.db import async_session, init_db
+from {{cookiecutter.package_name}}.db import async_session, engine, init_db
 from {{cookiecutter.package_name}}.main import app
 
 settings = get_settings()
@@ -72,7 +81,13 @@ async def client():
             raise
     
     app.dependency_overrides = {}
-    
+
+    # Start every test from empty tables and an empty cache.
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    await get_example_cache().clear()
+
     async with AsyncClient(
         base_url="http://test", 
         transport=ASGITransport(app=app)
@@ -0,0 +1,68 @@
+import pytest
+from httpx import AsyncClient
+
+from {{cookiecutter.package_name}}.core.cache import EntityCache, MemoryCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_memory_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry is evicted first."""
+    cache = MemoryCache(max_entries=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    await cache.get("a")
+    await cache.set("c", 3, ttl=60)
+
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+
+
+async def test_memory_cache_expires_entries():
+    """Test that entries are not returned after their TTL."""
+    cache = MemoryCache()
+    await cache.set("a", 1, ttl=0)
+
+    assert await cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_entity_cache_counts_hits_and_skips_raced_loads():
+    """Test hit/miss accounting and that a load racing a write is not stored."""
+    cache = EntityCache(MemoryCache(), namespace="thing")
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return {"id": 1, "loads": loads}
+
+    async def load_during_write():
+        await cache.invalidate(1)
+        return {"id": 1, "stale": True}
+
+    assert await cache.get_or_load(1, load_during_write) == {"id": 1, "stale": True}
+    assert await cache.get_or_load(1, load) == {"id": 1, "loads": 1}
+    assert await cache.get_or_load(1, load) == {"id": 1, "loads": 1}
+    assert cache.stats() == {
+        "enabled": True, "hits": 1, "misses": 2, "hit_ratio": 1 / 3
+    }
+
+
+async def test_get_example_is_cached_and_invalidated(client: AsyncClient):
+    """Test that repeated reads hit the cache and deletes invalidate it."""
+    created = (
+        await client.post(
+            "/api/v1/examples/", json={"name": "Cached", "description": "Cached item"}
+        )
+    ).json()
+    url = f"/api/v1/examples/{created['id']}"
+
+    assert (await client.get(url)).status_code == 200
+    assert (await client.get(url)).status_code == 200
+    stats = (await client.get("/api/v1/cache/stats")).json()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    await client.delete(url)
+    assert (await client.get(url)).status_code == 404
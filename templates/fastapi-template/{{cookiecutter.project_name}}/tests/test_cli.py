@@ -1,8 +1,12 @@
 """Tests for the CLI module."""
 
+import os
+
+import pytest
 from typer.testing import CliRunner
 
 from {{cookiecutter.package_name}}.cli import app
+from {{cookiecutter.package_name}}.core.config import get_settings
 
 runner = CliRunner()
 
@@ -31,3 +35,64 @@ def test_info():
     assert "Project Information" in result.output
     assert "{{cookiecutter.project_name}}" in result.output
     assert "{{cookiecutter.package_name}}" in result.output
+
+@pytest.fixture
+def fresh_settings():
+    """Reload settings after a test that changed the environment."""
+    yield
+    get_settings.cache_clear()
+
+
+def test_serve_production(monkeypatch, fresh_settings):
+    """Test that the production profile runs workers without reload or docs."""
+    import uvicorn
+
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda app, **options: calls.append(options))
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+
+    result = runner.invoke(
+        app, ["serve", "--production", "--workers", "4", "--limit-max-requests", "100"]
+    )
+
+    assert result.exit_code == 0, result.output
+    options = calls[0]
+    assert options["workers"] == 4
+    assert options["reload"] is False
+    assert options["limit_max_requests"] == 100
+    assert options["backlog"] == get_settings().BACKLOG
+    assert get_settings().is_production
+    assert os.environ["ENVIRONMENT"] == "production"
+
+
+def test_serve_runs_installed_uvicorn(monkeypatch, fresh_settings):
+    """Test that every option serve passes is accepted by the installed uvicorn."""
+    import uvicorn
+
+    configs = []
+
+    def run(server, sockets=None):
+        configs.append(server.config)
+        server.started = True
+
+    # Only the serving loop is stubbed; uvicorn.run builds its real Config.
+    monkeypatch.setattr(uvicorn.Server, "run", run)
+    monkeypatch.setenv("LIMIT_MAX_REQUESTS_JITTER", "10")
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+
+    result = runner.invoke(
+        app, ["serve", "--workers", "1", "--limit-max-requests", "100"]
+    )
+
+    assert result.exit_code == 0, result.output
+    config = configs[0]
+    assert config.workers == 1
+    assert config.limit_max_requests == 100
+    assert getattr(config, "limit_max_requests_jitter", 10) == 10
+
+
+def test_serve_rejects_reload_in_production():
+    """Test that --reload is refused with the production profile."""
+    result = runner.invoke(app, ["serve", "--production", "--reload"])
+    assert result.exit_code != 0
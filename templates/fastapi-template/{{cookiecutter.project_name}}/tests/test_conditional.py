@@ -0,0 +1,128 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from {{cookiecutter.package_name}}.core.conditional import make_etag, none_match
+from {{cookiecutter.package_name}}.db import async_session
+from {{cookiecutter.package_name}}.models import ExampleModel
+
+pytestmark = pytest.mark.asyncio
+
+EXAMPLE = {"name": "Conditional", "description": "ETag test"}
+
+
+async def _create(client: AsyncClient) -> dict:
+    response = await client.post("/api/v1/examples/", json=EXAMPLE)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_none_match_uses_weak_comparison():
+    """Test If-None-Match parsing, wildcards and weak tags."""
+    etag = make_etag(1, 2.0)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert none_match(etag, etag)
+    assert none_match(f'"other", W/{etag}', etag)
+    assert none_match("*", etag)
+    assert not none_match('"other"', etag)
+    assert not none_match(None, etag)
+
+
+async def test_get_example_revalidates(client: AsyncClient):
+    """Test that a current ETag gets 304 and a stale one the new body."""
+    example = await _create(client)
+    url = f"/api/v1/examples/{example['id']}"
+
+    first = await client.get(url)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = await client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    updated = await client.patch(url, json={"name": "Renamed"})
+    assert updated.status_code == 200, updated.text
+    assert updated.headers["etag"] != etag
+
+    fresh = await client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["name"] == "Renamed"
+    assert fresh.headers["etag"] == updated.headers["etag"]
+
+
+async def test_list_etag_changes_on_write(client: AsyncClient):
+    """Test that list ETags depend on the query and on every write."""
+    await _create(client)
+    first = await client.get("/api/v1/examples/", params={"limit": 5})
+    etag = first.headers["etag"]
+
+    cached = await client.get(
+        "/api/v1/examples/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    other = await client.get("/api/v1/examples/", params={"limit": 6})
+    assert other.headers["etag"] != etag
+
+    await client.post("/api/v1/examples/bulk", json=[EXAMPLE])
+    stale = await client.get(
+        "/api/v1/examples/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert stale.status_code == 200
+    assert len(stale.json()) == 2
+
+    page = await client.get("/api/v1/examples/page")
+    assert page.headers["etag"]
+    cached_page = await client.get(
+        "/api/v1/examples/page", headers={"If-None-Match": page.headers["etag"]}
+    )
+    assert cached_page.status_code == 304
+
+
+async def test_if_match_guards_writes(client: AsyncClient):
+    """Test that writes with a stale If-Match fail with 412."""
+    example = await _create(client)
+    url = f"/api/v1/examples/{example['id']}"
+    etag = (await client.get(url)).headers["etag"]
+
+    updated = await client.patch(
+        url, json={"description": "Changed"}, headers={"If-Match": etag}
+    )
+    assert updated.status_code == 200, updated.text
+
+    stale = await client.patch(url, json={"name": "Lost"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert stale.json()["details"]["etag"] == updated.headers["etag"]
+
+    refused = await client.delete(url, headers={"If-Match": etag})
+    assert refused.status_code == 412
+    deleted = await client.delete(url, headers={"If-Match": updated.headers["etag"]})
+    assert deleted.status_code == 200
+    assert (await client.get(url)).status_code == 404
+
+
+@pytest.mark.parametrize("method", ["DELETE", "PATCH"])
+@pytest.mark.parametrize("precondition, status", [(False, 404), (True, 412)])
+async def test_write_to_vanished_row(
+    client: AsyncClient, monkeypatch, method: str, precondition: bool, status: int
+):
+    """Test that a row deleted mid-request is 404, or 412 if If-Match was sent."""
+    example = await _create(client)
+    url = f"/api/v1/examples/{example['id']}"
+    etag = (await client.get(url)).headers["etag"]
+    headers = {"If-Match": etag} if precondition else {}
+    load = AsyncSession.get
+
+    async def load_then_delete(self, *args, **kwargs):
+        row = await load(self, *args, **kwargs)
+        async with async_session() as other:
+            await other.execute(delete(ExampleModel))
+            await other.commit()
+        return row
+
+    monkeypatch.setattr(AsyncSession, "get", load_then_delete)
+    body = {"name": "Gone"} if method == "PATCH" else None
+    response = await client.request(method, url, json=body, headers=headers)
+    assert response.status_code == status, response.text
@@ -0,0 +1,146 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from {{cookiecutter.package_name}}.core.config import get_settings
+from {{cookiecutter.package_name}}.core.cache import get_example_cache
+from {{cookiecutter.package_name}}.db import (
+    ReplicaSet,
+    RoutingSession,
+    create_engine,
+    replicas,
+)
+from {{cookiecutter.package_name}}.models import ExampleModel
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_engine_uses_pool_settings(tmp_path):
+    """Test that pool options come from the settings."""
+    settings = get_settings().model_copy(
+        update={
+            "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            "DB_POOL_SIZE": 3,
+            "DB_MAX_OVERFLOW": 2,
+            "DB_ECHO": False,
+        }
+    )
+    engine = create_engine(settings)
+    try:
+        assert engine.pool.size() == 3
+        assert engine.pool._max_overflow == 2
+        assert engine.echo is False
+    finally:
+        await engine.dispose()
+
+
+async def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    """Test that SQLite connections are tuned when opened."""
+    settings = get_settings().model_copy(
+        update={
+            "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}",
+            "SQLITE_BUSY_TIMEOUT_MS": 1234,
+        }
+    )
+    engine = create_engine(settings)
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        assert journal_mode == "wal"
+        assert busy_timeout == 1234
+        assert synchronous == 1  # NORMAL
+    finally:
+        await engine.dispose()
+
+
+async def test_read_session_routes_to_replica_until_write(tmp_path):
+    """Test replica reads and read-your-writes stickiness, on two SQLite files."""
+    settings = get_settings()
+    primary = create_engine(settings, f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(settings, f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    try:
+        for engine in (primary, replica):
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.create_all)
+        async with replica.begin() as conn:
+            await conn.execute(
+                ExampleModel.__table__.insert(),
+                [{"name": "On replica", "description": "Replicated row"}],
+            )
+
+        read_session = async_sessionmaker(
+            primary,
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            replicas=ReplicaSet([replica]),
+            expire_on_commit=False,
+        )
+        names = select(ExampleModel.name).order_by(ExampleModel.id)
+        async with read_session() as session:
+            assert (await session.scalars(names)).all() == ["On replica"]
+
+            session.add(ExampleModel(name="On primary", description="New row"))
+            await session.commit()
+            assert (await session.scalars(names)).all() == ["On primary"]
+    finally:
+        await primary.dispose()
+        await replica.dispose()
+
+
+async def test_replica_selection(tmp_path):
+    """Test round-robin rotation and least-busy choice of replicas."""
+    settings = get_settings()
+    engines = [
+        create_engine(settings, f"sqlite+aiosqlite:///{tmp_path / f'replica{i}.db'}")
+        for i in range(2)
+    ]
+    try:
+        round_robin = ReplicaSet(engines)
+        assert [round_robin.choose() for _ in range(3)] == [
+            engines[0], engines[1], engines[0]
+        ]
+
+        least_busy = ReplicaSet(engines, "least_busy")
+        async with engines[0].connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert [least_busy.choose() for _ in range(2)] == [engines[1]] * 2
+
+        with pytest.raises(ValueError):
+            ReplicaSet(engines, "random")
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+
+async def test_cache_fills_from_primary_after_write(client: AsyncClient, tmp_path):
+    """Test that a lagging replica cannot re-cache a row right after a write."""
+    settings = get_settings()
+    created = await client.post(
+        "/api/v1/examples/", json={"name": "Original", "description": "Row"}
+    )
+    url = f"/api/v1/examples/{created.json()['id']}"
+
+    replica = create_engine(settings, f"sqlite+aiosqlite:///{tmp_path / 'lag.db'}")
+    async with replica.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(
+            ExampleModel.__table__.insert(),
+            [{"name": "Original", "description": "Row"}],
+        )
+    replicas.engines.append(replica)
+    try:
+        updated = await client.patch(url, json={"name": "Renamed"})
+        fresh = await client.get(url)
+        assert fresh.json()["name"] == "Renamed"
+        assert fresh.headers["etag"] == updated.headers["etag"]
+
+        # Outside the window misses read the (still lagging) replica again.
+        await get_example_cache().clear()
+        assert (await client.get(url)).json()["name"] == "Original"
+    finally:
+        replicas.engines.remove(replica)
+        await replica.dispose()
@@ -72,6 +72,38 @@ async def test_list_examples(client: AsyncClient):
     data = response.json()
     assert len(data) > 0
 
+async def test_page_examples_with_cursor(client: AsyncClient):
+    """Test keyset pagination walks every item exactly once, newest first."""
+    created = []
+    for i in range(5):
+        response = await client.post(
+            "/api/v1/examples/",
+            json={"name": f"Paged {i}", "description": f"Description {i}"},
+        )
+        created.append(response.json()["id"])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/examples/page", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(created, reverse=True)
+
+async def test_page_examples_rejects_bad_cursor(client: AsyncClient):
+    """Test that a malformed cursor is a validation error."""
+    response = await client.get(
+        "/api/v1/examples/page", params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 422
+    assert response.json()["code"] == "VALIDATION_ERROR"
+
 async def test_delete_example(client: AsyncClient):
     """Test deleting an example."""
     # First create an example
@@ -102,3 +134,38 @@ def test_example_model():
     assert example.description == "Test Description"
     assert example.id is None
 
+async def test_bulk_create_update_delete(client: AsyncClient):
+    """Test the bulk endpoints report per-item results."""
+    response = await client.post(
+        "/api/v1/examples/bulk",
+        json=[{"name": f"Bulk {i}", "description": f"Bulk item {i}"} for i in range(3)],
+    )
+    assert response.status_code == 200
+    created = response.json()
+    assert created["succeeded"] == 3
+    ids = [item["id"] for item in created["results"]]
+    assert [item["status"] for item in created["results"]] == ["created"] * 3
+
+    response = await client.patch(
+        "/api/v1/examples/bulk",
+        json=[{"id": ids[0], "name": "Renamed"}, {"id": 999999, "name": "Missing"}],
+    )
+    assert response.status_code == 200
+    updated = response.json()
+    assert [item["status"] for item in updated["results"]] == ["updated", "not_found"]
+    example = (await client.get(f"/api/v1/examples/{ids[0]}")).json()
+    assert example["name"] == "Renamed"
+    assert example["description"] == "Bulk item 0"
+    assert example["updated_at"] is not None
+
+    response = await client.request(
+        "DELETE", "/api/v1/examples/bulk", json={"ids": [ids[1], ids[2], 999999]}
+    )
+    assert response.status_code == 200
+    deleted = response.json()
+    assert [item["status"] for item in deleted["results"]] == [
+        "deleted", "deleted", "not_found"
+    ]
+    assert deleted["failed"] == 1
+    assert (await client.get(f"/api/v1/examples/{ids[1]}")).status_code == 404
+    assert (await client.get(f"/api/v1/examples/{ids[0]}")).status_code == 200
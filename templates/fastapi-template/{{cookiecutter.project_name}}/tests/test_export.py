@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create(client: AsyncClient, count: int) -> None:
+    await client.post(
+        "/api/v1/examples/bulk",
+        json=[
+            {
+                "name": f"Export {i}",
+                "description": f"Exported item {i}",
+                "is_active": i % 2 == 0,
+                "tags": ["a", "b"] if i == 0 else None,
+            }
+            for i in range(count)
+        ],
+    )
+
+
+async def test_export_ndjson_streams_all_rows(client: AsyncClient):
+    """Test that NDJSON export returns every row, beyond the list endpoint cap."""
+    await _create(client, 150)
+
+    response = await client.get("/api/v1/examples/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 150
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert rows[0]["tags"] == ["a", "b"]
+
+
+async def test_export_csv_applies_filters(client: AsyncClient):
+    """Test CSV export with the list endpoint's filters."""
+    await _create(client, 5)
+
+    response = await client.get(
+        "/api/v1/examples/export", params={"format": "csv", "is_active": "true"}
+    )
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Export 0", "Export 2", "Export 4"]
+    assert json.loads(rows[0]["tags"]) == ["a", "b"]
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from {{cookiecutter.package_name}}.db import engine
+from {{cookiecutter.package_name}}.filters import (
+    ExampleFilters,
+    ExampleSort,
+    ExampleSortField,
+)
+from {{cookiecutter.package_name}}.models import ExampleModel
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create(client: AsyncClient, *names: str, is_active: bool = True) -> None:
+    await client.post(
+        "/api/v1/examples/bulk",
+        json=[
+            {"name": name, "description": "Filtered", "is_active": is_active}
+            for name in names
+        ],
+    )
+
+
+def _filters(**params) -> ExampleFilters:
+    defaults = dict.fromkeys(
+        ("name", "name_prefix", "is_active", "created_after", "created_before")
+    )
+    return ExampleFilters(**{**defaults, **params})
+
+
+async def _query_plan(query) -> str:
+    """Return SQLite's query plan for ``query``."""
+    compiled = query.compile(engine.sync_engine)
+    # The plan does not depend on the parameter values, so bind NULLs.
+    params = (None,) * len(compiled.positiontup)
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return "\n".join(row[-1] for row in result)
+
+
+async def test_filter_by_name_and_prefix(client: AsyncClient):
+    """Test exact-name and prefix filters."""
+    await _create(client, "alpha", "alphabet", "beta", "Alpha")
+
+    exact = await client.get("/api/v1/examples/", params={"name": "alpha"})
+    prefix = await client.get("/api/v1/examples/", params={"name_prefix": "alph"})
+
+    assert [item["name"] for item in exact.json()] == ["alpha"]
+    assert [item["name"] for item in prefix.json()] == ["alpha", "alphabet"]
+
+
+async def test_filter_by_created_range(client: AsyncClient):
+    """Test created_at ranges, including offsets other than UTC."""
+    await _create(client, "old")
+    now = datetime.now(timezone.utc)
+    past = (now - timedelta(hours=1)).astimezone(timezone(timedelta(hours=2)))
+
+    within = await client.get(
+        "/api/v1/examples/",
+        params={"created_after": past.isoformat(), "created_before": now.isoformat()},
+    )
+    after = await client.get(
+        "/api/v1/examples/", params={"created_after": now.isoformat()}
+    )
+    invalid = await client.get(
+        "/api/v1/examples/",
+        params={"created_after": now.isoformat(), "created_before": past.isoformat()},
+    )
+
+    assert [item["name"] for item in within.json()] == ["old"]
+    assert after.json() == []
+    assert invalid.status_code == 422
+
+
+async def test_sort_orders(client: AsyncClient):
+    """Test whitelisted sort orders and rejection of others."""
+    await _create(client, "b", "c", "a")
+
+    by_name = await client.get("/api/v1/examples/", params={"sort": "name"})
+    newest = await client.get("/api/v1/examples/", params={"sort": "-created_at"})
+    invalid = await client.get("/api/v1/examples/", params={"sort": "description"})
+
+    assert [item["name"] for item in by_name.json()] == ["a", "b", "c"]
+    assert [item["name"] for item in newest.json()] == ["a", "c", "b"]
+    assert invalid.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "filters, sort, index",
+    [
+        (_filters(name="alpha"), None, "ix_examplemodel_name"),
+        (_filters(name_prefix="al"), None, "ix_examplemodel_name"),
+        (_filters(), ExampleSortField.NAME, "ix_examplemodel_name"),
+        (
+            _filters(is_active=True),
+            ExampleSortField.CREATED_AT_DESC,
+            "ix_examplemodel_is_active_created_at_id",
+        ),
+        (
+            _filters(created_after=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+            ExampleSortField.CREATED_AT_DESC,
+            "ix_examplemodel_created_at_id",
+        ),
+    ],
+)
+async def test_filters_use_indexes(client: AsyncClient, filters, sort, index):
+    """Test that filtered and sorted queries are planned on an index."""
+    query = filters.apply(select(ExampleModel))
+    if sort is not None:
+        query = ExampleSort(sort).apply(query)
+
+    plan = await _query_plan(query.limit(10))
+
+    assert f"USING INDEX {index}" in plan
+    assert "USE TEMP B-TREE" not in plan
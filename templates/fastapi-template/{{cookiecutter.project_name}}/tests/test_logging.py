@@ -0,0 +1,77 @@
+import io
+import json
+import logging
+import sys
+import uuid
+
+import pytest
+
+from {{cookiecutter.package_name}}.core.config import get_settings
+from {{cookiecutter.package_name}}.core.logging_config import (
+    JSONFormatter,
+    SamplingFilter,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    """Restore the application's logging setup after the test."""
+    shutdown_logging()
+    yield
+    shutdown_logging()
+    setup_logging(get_settings())
+
+
+def _record(level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app", level, __file__, 1, "Hello %s", ("world",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_emits_extra_fields():
+    """Test that extra fields and exceptions are part of the JSON line."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record(request_id="abc", status_code=200)
+        record.exc_info = sys.exc_info()
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["message"] == "Hello world"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc"
+    assert entry["status_code"] == 200
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_sampling_keeps_requests_together():
+    """Test that sampling keeps or drops all lines of a request together."""
+    sampler = SamplingFilter({"INFO": 0.25})
+    request_ids = [str(uuid.uuid4()) for _ in range(2000)]
+
+    kept = [rid for rid in request_ids if sampler.filter(_record(request_id=rid))]
+
+    assert 300 < len(kept) < 700
+    for rid in kept[:50]:
+        assert sampler.filter(_record(request_id=rid))
+    assert sampler.filter(_record(logging.ERROR, request_id=request_ids[0]))
+
+
+def test_shutdown_flushes_queued_records(restore_logging):
+    """Test that records queued before shutdown are written by the listener."""
+    stream = io.StringIO()
+    sink = logging.StreamHandler(stream)
+    sink.setFormatter(JSONFormatter())
+    setup_logging(get_settings(), handlers=[sink])
+
+    logger = logging.getLogger("{{cookiecutter.package_name}}.test")
+    for i in range(100):
+        logger.info("Line %d", i, extra={"index": i})
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["index"] for line in lines] == list(range(100))
+    assert lines[-1]["message"] == "Line 99"
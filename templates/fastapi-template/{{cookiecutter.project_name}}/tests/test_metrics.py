@@ -0,0 +1,99 @@
+import pytest
+from httpx import AsyncClient
+
+from {{cookiecutter.package_name}}.core.metrics import (
+    MetricsRegistry,
+    merge_snapshots,
+    read_snapshots,
+    registry,
+    render,
+    write_snapshot,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def _sample(text: str, name: str, *labels: str) -> float:
+    """Return the value of sample ``name`` with the given ``key="value"`` labels."""
+    prefix = name + ("{" + ",".join(labels) + "}" if labels else "")
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"No sample {prefix!r}")
+
+
+async def test_metrics_endpoint_reports_requests(client: AsyncClient):
+    """Test that requests are counted per route template and status code."""
+    registry.clear()
+    example = {"name": "Metric", "description": "Measured"}
+    created = (await client.post("/api/v1/examples/", json=example)).json()
+    await client.get(f"/api/v1/examples/{created['id']}")
+    await client.get(f"/api/v1/examples/{created['id']}")
+    await client.get("/api/v1/examples/999999")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    get, route = 'method="GET"', 'route="/api/v1/examples/{example_id}"'
+    assert _sample(text, "http_requests_total", get, route, 'status="200"') == 2
+    assert _sample(text, "http_requests_total", get, route, 'status="404"') == 1
+    assert _sample(text, "http_request_duration_seconds_count", get, route) == 3
+    assert (
+        _sample(text, "http_request_duration_seconds_bucket", get, route, 'le="+Inf"')
+        == 3
+    )
+    assert _sample(text, "cache_hit_ratio", 'cache="example"') == pytest.approx(1 / 3)
+    # The scrape itself is still in flight while the metrics are rendered.
+    assert _sample(text, "http_requests_in_progress", get) == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that histogram buckets render cumulatively with sum and count."""
+    metrics = MetricsRegistry()
+    latency = metrics.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+
+    text = render(metrics.snapshot())
+
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_sum 4.25" in text
+    assert "latency_seconds_count 4" in text
+
+
+def test_merge_snapshots_sums_workers():
+    """Test that snapshots of several workers are summed label set by label set."""
+    worker = MetricsRegistry()
+    requests = worker.counter("requests_total", "Requests.", ("status",))
+    latency = worker.histogram("latency_seconds", "Latency.", buckets=(1.0,))
+    requests.inc(("200",), 2)
+    latency.observe(0.5)
+    first = worker.snapshot()
+    worker.clear()
+    requests.inc(("200",))
+    requests.inc(("500",))
+    latency.observe(2.0)
+    second = worker.snapshot()
+
+    merged = render(merge_snapshots([first, second]))
+
+    assert 'requests_total{status="200"} 3.0' in merged
+    assert 'requests_total{status="500"} 1.0' in merged
+    assert 'latency_seconds_bucket{le="1.0"} 1' in merged
+    assert 'latency_seconds_count 2' in merged
+
+
+def test_final_snapshot_drops_gauges(tmp_path):
+    """Test that an exiting worker keeps its counters but not its gauges."""
+    registry.clear()
+    write_snapshot(str(tmp_path), final=True)
+
+    merged = read_snapshots(str(tmp_path))
+
+    assert "http_requests_total" in merged
+    assert "http_requests_in_progress" not in merged
+    assert "cache_hit_ratio" in merged
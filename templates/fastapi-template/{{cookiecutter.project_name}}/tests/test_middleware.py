@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from {{cookiecutter.package_name}}.core.middleware import (
+    SECURITY_HEADERS,
+    RequestLoggingMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_responses_carry_request_id_and_security_headers(client: AsyncClient):
+    """Test that every response gets the request ID, timing and security headers."""
+    response = await client.get("/")
+
+    assert len(response.headers["x-request-id"]) == 36
+    assert float(response.headers["x-process-time"]) >= 0
+    for name, value in SECURITY_HEADERS:
+        assert response.headers[name.decode()] == value.decode()
+
+
+async def test_streaming_responses_pass_through():
+    """Test that streamed bodies arrive chunk by chunk with headers added."""
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    seen = {}
+
+    @app.get("/stream")
+    async def stream(request: Request):
+        seen["request_id"] = request.state.request_id
+
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+
+        return StreamingResponse(chunks(), headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(base_url="http://test", transport=transport) as ac:
+        response = await ac.get("/stream")
+
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert response.headers["x-request-id"] == seen["request_id"]
+    assert response.headers.get_list("x-frame-options") == ["DENY"]
@@ -0,0 +1,36 @@
+import pytest
+from httpx import AsyncClient
+
+from {{cookiecutter.package_name}}.core.config import get_settings
+
+pytestmark = pytest.mark.asyncio
+
+EXAMPLE = {"name": "Fast", "description": "Fast path", "tags": ["x"]}
+
+
+async def test_get_example_returns_cached_json(client: AsyncClient):
+    """Test that single reads serve the same body from the database and the cache."""
+    created = (await client.post("/api/v1/examples/", json=EXAMPLE)).json()
+
+    first = await client.get(f"/api/v1/examples/{created['id']}")
+    second = await client.get(f"/api/v1/examples/{created['id']}")
+
+    assert first.headers["content-type"] == "application/json"
+    assert first.json() == second.json() == created
+
+
+@pytest.mark.parametrize("preserialized", [False, True])
+async def test_list_responses_match(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch, preserialized: bool
+):
+    """Test that pre-serialized list responses match the response-model output."""
+    await client.post("/api/v1/examples/", json=EXAMPLE)
+    expected_items = (await client.get("/api/v1/examples/")).json()
+
+    monkeypatch.setattr(get_settings(), "PRESERIALIZED_LIST_RESPONSES", preserialized)
+    listed = await client.get("/api/v1/examples/")
+    page = await client.get("/api/v1/examples/page")
+
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.json() == expected_items
+    assert page.json() == {"items": expected_items, "next_cursor": None}
@@ -0,0 +1,64 @@
+import pytest
+from httpx import AsyncClient
+
+from {{cookiecutter.package_name}} import search
+from {{cookiecutter.package_name}}.db import async_session
+
+pytestmark = pytest.mark.asyncio
+
+EXAMPLES = [
+    {"name": "Garden tools", "description": "Rakes and shovels"},
+    {"name": "Kitchen", "description": "Knives, pans and garden herbs"},
+    {"name": "Garage", "description": "Tools for cars", "is_active": False},
+]
+
+
+async def _search(client: AsyncClient, q: str, **params) -> list:
+    response = await client.get("/api/v1/examples/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [item["name"] for item in response.json()]
+
+
+async def test_search_ranks_name_matches_first(client: AsyncClient):
+    """Test that matches are BM25-ranked with name matches above descriptions."""
+    async with async_session() as session:
+        assert search.uses_fts(session)
+    await client.post("/api/v1/examples/bulk", json=EXAMPLES)
+
+    assert await _search(client, "garden") == ["Garden tools", "Kitchen"]
+    assert await _search(client, "tools") == ["Garden tools", "Garage"]
+    assert await _search(client, "garden rakes") == ["Garden tools"]
+    assert await _search(client, "tools", is_active="true") == ["Garden tools"]
+    assert await _search(client, "tools", limit=1, skip=1) == ["Garage"]
+
+
+async def test_search_index_follows_writes(client: AsyncClient):
+    """Test that updates and deletes, including bulk ones, reach the index."""
+    created = await client.post("/api/v1/examples/bulk", json=EXAMPLES)
+    ids = [item["id"] for item in created.json()["results"]]
+
+    await client.patch("/api/v1/examples/bulk", json=[{"id": ids[0], "name": "Shed"}])
+    await client.request("DELETE", "/api/v1/examples/bulk", json={"ids": [ids[2]]})
+
+    assert await _search(client, "tools") == []
+    assert await _search(client, "shed") == ["Shed"]
+
+
+async def test_search_treats_operators_literally(client: AsyncClient):
+    """Test that FTS5 syntax in the search text cannot break the query."""
+    await client.post("/api/v1/examples/bulk", json=EXAMPLES)
+
+    assert await _search(client, 'garden" OR "x') == []
+    assert await _search(client, "NEAR(garden") == []
+    response = await client.get("/api/v1/examples/search", params={"q": "   "})
+    assert response.status_code == 422
+
+
+async def test_search_like_fallback(client: AsyncClient, monkeypatch):
+    """Test the substring fallback used when FTS5 is unavailable."""
+    monkeypatch.setattr(search, "_FTS_DATABASES", set())
+    await client.post("/api/v1/examples/bulk", json=EXAMPLES)
+
+    assert await _search(client, "GAR") == ["Garden tools", "Kitchen", "Garage"]
+    assert await _search(client, "tool car") == ["Garage"]
+    assert await _search(client, "100%") == []
@@ -1,5 +1,9 @@
 """Command-line interface for {{cookiecutter.project_name}}."""
 
+import importlib.util
+import inspect
+import os
+from pathlib import Path
 from typing import Optional
 
 import typer
@@ -53,6 +57,122 @@ def info():
     
     console.print(table)
 
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _metrics_dir(workers: int) -> Optional[str]:
+    """Prepare the directory worker processes aggregate their metrics in.
+
+    Stale snapshots from a previous run are removed; with several workers and
+    no ``METRICS_MULTIPROC_DIR`` configured, a temporary directory is used.
+    """
+    from {{cookiecutter.package_name}}.core.config import get_settings
+
+    settings = get_settings()
+    if not settings.METRICS_ENABLED:
+        return None
+    directory = settings.METRICS_MULTIPROC_DIR
+    if directory is None:
+        if workers == 1:
+            return None
+        import tempfile
+
+        directory = tempfile.mkdtemp(prefix="{{cookiecutter.package_name}}-metrics-")
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    for snapshot in path.glob("metrics-*.json"):
+        snapshot.unlink(missing_ok=True)
+    return directory
+
+
+@app.command()
+def serve(
+    host: Optional[str] = typer.Option(None, help="Bind address [default: HOST]"),
+    port: Optional[int] = typer.Option(None, help="Bind port [default: PORT]"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Worker processes [default: WORKERS or CPU count]"
+    ),
+    production: bool = typer.Option(
+        False, "--production", help="Production profile: no reload, no API docs"
+    ),
+    reload: bool = typer.Option(
+        False, "--reload", help="Restart on code changes (single worker, development)"
+    ),
+    limit_max_requests: Optional[int] = typer.Option(
+        None, help="Recycle each worker after this many requests"
+    ),
+):
+    """
+    Run the API server with uvicorn.
+
+    Workers default to the CPU count. uvloop and httptools are used when
+    installed. Keep-alive, backlog, graceful shutdown and worker recycling
+    come from ``Settings`` unless overridden.
+
+    Args:
+        host: Address to bind.
+        port: Port to bind.
+        workers: Number of worker processes.
+        production: Whether to run with the production profile.
+        reload: Whether to restart on code changes.
+        limit_max_requests: Requests after which a worker is replaced.
+    """
+    if production:
+        if reload:
+            raise typer.BadParameter("--reload cannot be used with --production")
+        # Worker processes load their own settings, so pass the profile on.
+        os.environ["ENVIRONMENT"] = "production"
+
+    import uvicorn
+
+    from {{cookiecutter.package_name}}.core.config import get_settings
+
+    get_settings.cache_clear()
+    settings = get_settings()
+    workers = 1 if reload else workers or settings.WORKERS or os.cpu_count() or 1
+    metrics_dir = _metrics_dir(workers)
+    if metrics_dir:
+        os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+
+    options = {
+        "host": host or settings.HOST,
+        "port": port or settings.PORT,
+        "workers": workers,
+        "reload": reload,
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "backlog": settings.BACKLOG,
+        "timeout_keep_alive": settings.KEEP_ALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+        "limit_max_requests": limit_max_requests or settings.LIMIT_MAX_REQUESTS,
+        # Requests are logged by the app's middleware; leave uvicorn's loggers
+        # to propagate into the app's queued logging instead of configuring them.
+        "access_log": False,
+        "log_config": None,
+    }
+    if settings.LIMIT_MAX_REQUESTS_JITTER:
+        # Spread recycling out so workers do not all restart at once. Older
+        # uvicorn releases have no such option.
+        if "limit_max_requests_jitter" in inspect.signature(uvicorn.run).parameters:
+            options["limit_max_requests_jitter"] = settings.LIMIT_MAX_REQUESTS_JITTER
+        else:
+            console.print(
+                "[yellow]LIMIT_MAX_REQUESTS_JITTER ignored: "
+                "not supported by the installed uvicorn[/yellow]"
+            )
+
+    table = Table(title="Server")
+    table.add_column("Setting", style="cyan")
+    table.add_column("Value", style="magenta")
+    table.add_row("Profile", settings.ENVIRONMENT)
+    for name in ("host", "port", "workers", "loop", "http", "limit_max_requests"):
+        table.add_row(name, str(options[name]))
+    console.print(table)
+
+    uvicorn.run("{{cookiecutter.package_name}}.main:app", **options)
+
+
 def main():
     """Entry point for the CLI application."""
     app()
@@ -0,0 +1,172 @@
+"""Read-through caching of single entities."""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from .config import get_settings
+
+
+class CacheBackend(ABC):
+    """Storage for cached values.
+
+    Values are JSON-compatible objects. Implement this interface to move the
+    cache out of process, e.g. onto Redis with ``GET``/``SET EX``/``DEL``.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or None if absent or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove ``keys`` if present."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class EntityCache:
+    """Read-through cache for one entity type, keyed by ID.
+
+    Args:
+        backend: Where entries are stored
+        namespace: Prefix separating this entity's keys from others
+        ttl: Seconds an entry stays valid
+        enabled: Whether to cache at all; when False every read loads
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        ttl: float = 60,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation, so a load that raced with a write is
+        # not stored (it may have read the row before the write committed).
+        self._epoch = 0
+        self._invalidated_at = float("-inf")
+
+    def _key(self, entity_id: Any) -> str:
+        return f"{self.namespace}:{entity_id}"
+
+    async def get_or_load(
+        self, entity_id: Any, loader: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """Return the cached entity, loading and caching it on a miss.
+
+        Args:
+            entity_id: ID of the entity
+            loader: Loads the entity as a JSON-compatible object, or None if it
+                does not exist; missing entities are not cached
+
+        Returns:
+            The entity, or None if it does not exist.
+        """
+        if not self.enabled:
+            return await loader()
+        key = self._key(entity_id)
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        epoch = self._epoch
+        value = await loader()
+        if value is not None and epoch == self._epoch:
+            await self.backend.set(key, value, self.ttl)
+        return value
+
+    async def invalidate(self, *entity_ids: Any) -> None:
+        """Drop cached copies of the given entities after they changed."""
+        self._epoch += 1
+        self._invalidated_at = time.monotonic()
+        if entity_ids:
+            await self.backend.delete(*(self._key(i) for i in entity_ids))
+
+    async def clear(self) -> None:
+        """Drop every cached entity and reset the counters."""
+        self._epoch += 1
+        self._invalidated_at = float("-inf")
+        self.hits = self.misses = 0
+        await self.backend.clear()
+
+    def invalidated_within(self, seconds: float) -> bool:
+        """Whether this process invalidated any entity in the last ``seconds``.
+
+        Loads during that window should read from the primary database: a
+        lagging replica could still return the old row and re-cache it.
+        """
+        return time.monotonic() - self._invalidated_at < seconds
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and the hit ratio."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache
+def get_example_cache() -> EntityCache:
+    """Get the cache for example entities."""
+    settings = get_settings()
+    return EntityCache(
+        MemoryCache(settings.CACHE_MAX_ENTRIES),
+        namespace="example",
+        ttl=settings.CACHE_TTL_SECONDS,
+        enabled=settings.CACHE_ENABLED,
+    )
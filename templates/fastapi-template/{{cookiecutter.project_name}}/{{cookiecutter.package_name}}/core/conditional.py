@@ -0,0 +1,61 @@
+"""ETags and conditional request handling (RFC 9110, section 13)."""
+
+import hashlib
+from typing import List, Optional
+
+from fastapi import Response
+
+from .exceptions import PreconditionFailedError
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the values that identify a representation.
+
+    Args:
+        parts: Values that change whenever the representation changes, e.g. an
+            ID and a modification time
+
+    Returns:
+        A quoted entity tag.
+    """
+    key = "\x1f".join(str(part) for part in parts)
+    return '"' + hashlib.blake2b(key.encode(), digest_size=8).hexdigest() + '"'
+
+
+def _parse(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether ``If-None-Match`` matches ``etag``, i.e. the client's copy is current.
+
+    Uses the weak comparison the header calls for, so ``W/"x"`` matches ``"x"``.
+    """
+    if not if_none_match:
+        return False
+    tags = _parse(if_none_match)
+    return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+
+def check_if_match(if_match: Optional[str], etag: str) -> None:
+    """Enforce an ``If-Match`` precondition against the current ``etag``.
+
+    Uses strong comparison, so weak tags never match.
+
+    Raises:
+        PreconditionFailedError: If the header is present and does not match.
+    """
+    if not if_match:
+        return
+    tags = _parse(if_match)
+    if "*" not in tags and etag not in tags:
+        raise PreconditionFailedError(etag)
+
+
+def not_modified(etag: str) -> Response:
+    """Return a body-less ``304 Not Modified`` response for ``etag``."""
+    return Response(status_code=304, headers={"ETag": etag})
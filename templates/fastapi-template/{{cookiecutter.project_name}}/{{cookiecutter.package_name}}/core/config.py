@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,12 +13,65 @@ class Settings(BaseSettings):
     # Server Settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WORKERS: Optional[int] = None  # Defaults to the CPU count
+    BACKLOG: int = 2048
+    KEEP_ALIVE_TIMEOUT: int = 5
+    GRACEFUL_SHUTDOWN_TIMEOUT: Optional[int] = 30
+    LIMIT_MAX_REQUESTS: Optional[int] = None  # Recycle workers after N requests
+    LIMIT_MAX_REQUESTS_JITTER: int = 0
 
     # Database Settings
     DATABASE_URL: str = "sqlite+aiosqlite:///./{{cookiecutter.project_name}}.db"
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
+    # Read replicas for read-only routes; empty sends every query to DATABASE_URL
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_SELECTION: Literal["round_robin", "least_busy"] = "round_robin"
+    # Replication lag to allow for: this long after a write, cache fills read
+    # from the primary instead of a replica that may still hold the old row
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+
+    # SQLite tuning, applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268_435_456  # 256 MiB
+
+    # Serialize list responses straight to JSON bytes, skipping response models
+    PRESERIALIZED_LIST_RESPONSES: bool = False
+
+    # Rows fetched per round trip by streaming exports
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Cache-Control for successful GET responses, by route name. "no-cache"
+    # lets clients keep copies but makes them revalidate with the ETag.
+    HTTP_CACHE_CONTROL: dict[str, str] = {
+        "get_example": "private, no-cache",
+        "list_examples": "private, no-cache",
+        "page_examples": "private, no-cache",
+    }
+
+    # Entity cache
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 60
+    CACHE_MAX_ENTRIES: int = 10_000
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+    # Shared directory for aggregating metrics across worker processes
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL: float = 5.0  # Seconds between worker snapshots
+    METRICS_LATENCY_BUCKETS: list[float] = [
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+    ]
+    METRICS_POOL_WAIT_BUCKETS: list[float] = [
+        0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0
+    ]
 
     # Security Settings
     SECRET_KEY: str
@@ -28,12 +81,17 @@ class Settings(BaseSettings):
     
     # API Settings
     API_V1_PREFIX: str = "/api/v1"
-    DOCS_URL: str = "/docs"
-    OPENAPI_URL: str = "/openapi.json"
+    DOCS_URL: Optional[str] = "/docs"  # Disabled in production
+    OPENAPI_URL: Optional[str] = "/openapi.json"  # Disabled in production
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True  # One JSON object per line, including extra fields
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_FILE: Optional[str] = None
+    LOG_QUEUE_SIZE: int = 10_000  # Records beyond this are dropped, not waited on
+    # Fraction of request log records kept per level, e.g. {"INFO": 0.1}
+    LOG_REQUEST_SAMPLE_RATES: dict[str, float] = {}
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -42,6 +100,12 @@ class Settings(BaseSettings):
     )
 
 
+    @property
+    def is_production(self) -> bool:
+        """Whether the production profile is active."""
+        return self.ENVIRONMENT == "production"
+
+
 @lru_cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
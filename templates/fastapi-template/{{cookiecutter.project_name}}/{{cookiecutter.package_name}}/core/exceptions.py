@@ -71,3 +71,14 @@ class AuthorizationError(AppException):
             code="AUTHORIZATION_ERROR",
             status_code=status.HTTP_403_FORBIDDEN,
         )
+
+
+class PreconditionFailedError(AppException):
+    """An If-Match precondition did not match the current representation."""
+    def __init__(self, current_etag: str):
+        super().__init__(
+            message="The resource was modified since it was fetched",
+            code="PRECONDITION_FAILED",
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            details={"etag": current_etag},
+        )
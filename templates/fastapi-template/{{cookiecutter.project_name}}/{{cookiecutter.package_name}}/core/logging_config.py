@@ -0,0 +1,196 @@
+"""Non-blocking logging: records are queued and written by a background thread.
+
+Loggers only put records on an in-memory queue, so a slow stderr or file sink
+never stalls the event loop. A ``QueueListener`` thread formats the records
+and writes them to the configured sinks. When the queue is full, records are
+dropped and counted instead of blocking the caller.
+"""
+
+import copy
+import logging
+import queue
+import random
+import sys
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Mapping, Optional
+
+import orjson
+
+from .config import Settings, get_settings
+
+# Logger of the request logging middleware, whose records are sampled.
+REQUEST_LOGGER = f"{__package__}.middleware"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+# uvicorn also adds "color_message", an ANSI-colored copy of the message.
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "taskName", "color_message"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+# Sinks attached directly to the root logger by shutdown_logging().
+_detached_sinks: List[logging.Handler] = []
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        created = datetime.fromtimestamp(record.created, timezone.utc)
+        entry: Dict[str, Any] = {
+            "timestamp": created.isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of the records at each level.
+
+    Records carrying a ``request_id`` are sampled by a hash of it, so all the
+    lines of one request are kept or dropped together.
+
+    Args:
+        rates: Fraction of records to keep per level name, e.g. ``{"INFO": 0.1}``;
+            levels not listed are always kept
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        self.rates = {
+            logging.getLevelName(level.upper()): rate for level, rate in rates.items()
+        }
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno, 1.0)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            return zlib.crc32(str(request_id).encode()) < rate * 2**32
+        return random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that never blocks and leaves formatting to the listener.
+
+    The message is merged with its arguments before queueing, since they may be
+    mutated afterwards, but the formatter itself (and any traceback rendering)
+    runs on the listener thread.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _sink_handlers(settings: Settings) -> List[logging.Handler]:
+    if settings.LOG_JSON:
+        formatter: logging.Formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(settings.LOG_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+    if settings.LOG_FILE:
+        handlers.append(logging.FileHandler(settings.LOG_FILE, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(
+    settings: Optional[Settings] = None,
+    handlers: Optional[List[logging.Handler]] = None,
+) -> QueueListener:
+    """Route the root logger through a queue to a background listener.
+
+    Replaces any handlers on the root logger. Calling it again while logging
+    is already set up returns the running listener.
+
+    Args:
+        settings: Settings to use; defaults to ``get_settings()``
+        handlers: Sinks written by the listener; defaults to stderr and
+            ``LOG_FILE``, formatted per ``LOG_JSON``
+
+    Returns:
+        The started listener.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    settings = settings or get_settings()
+    if handlers is None:
+        handlers = _sink_handlers(settings)
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(settings.LOG_QUEUE_SIZE)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in _detached_sinks:
+        if handler not in handlers:
+            handler.close()
+    _detached_sinks.clear()
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    request_logger = logging.getLogger(REQUEST_LOGGER)
+    for log_filter in request_logger.filters[:]:
+        if isinstance(log_filter, SamplingFilter):
+            request_logger.removeFilter(log_filter)
+    if settings.LOG_REQUEST_SAMPLE_RATES:
+        request_logger.addFilter(SamplingFilter(settings.LOG_REQUEST_SAMPLE_RATES))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Write out every queued record and stop the listener thread.
+
+    The sinks are then attached to the root logger directly, so records
+    logged after shutdown are still written, synchronously.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        handler.flush()
+        root.addHandler(handler)
+        _detached_sinks.append(handler)
+    if _queue_handler is not None and _queue_handler.dropped:
+        root.warning(
+            "Dropped log records because the log queue was full",
+            extra={"dropped": _queue_handler.dropped},
+        )
+    _listener = _queue_handler = None
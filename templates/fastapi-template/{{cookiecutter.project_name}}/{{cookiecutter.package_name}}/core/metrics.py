@@ -0,0 +1,454 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Updates are plain dictionary operations without locks: they run on the event
+loop thread (request middleware, and pool checkouts made from async sessions),
+so no two updates can interleave.
+
+With several worker processes, set ``METRICS_MULTIPROC_DIR`` to a directory
+shared by the workers and emptied before they start. Each worker periodically
+writes a snapshot there, and ``/metrics`` sums the snapshots of all workers.
+Gauges of workers that have exited are dropped; their counters and histograms
+are kept so totals never go backwards.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import get_example_cache
+from .config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+class Metric:
+    """A named family of samples, one per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+
+    def clear(self) -> None:
+        """Drop every recorded sample."""
+        self._values.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the metric's current state as JSON-compatible data."""
+        return {
+            "type": self.kind,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": [[list(labels), value] for labels, value in self._values.items()],
+        }
+
+
+class Counter(Metric):
+    """A monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        """Increase the total for ``labels`` by ``amount``."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, value: float, labels: Labels = ()) -> None:
+        """Mirror a running total kept by another component (used by collectors)."""
+        self._values[labels] = float(value)
+
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        """Increase the value for ``labels`` by ``amount``."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        """Decrease the value for ``labels`` by ``amount``."""
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Set the value for ``labels``."""
+        self._values[labels] = float(value)
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, with their sum.
+
+    Each sample stores one count per bucket (the last for ``+Inf``) followed
+    by the sum; counts are made cumulative only when rendered, so an
+    observation touches a single bucket.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation of ``value``."""
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+class Ratio(Metric):
+    """A gauge derived from two counters as ``hits / (hits + misses)``.
+
+    It is computed from the (possibly aggregated) counters at render time,
+    so the ratio stays correct across worker processes.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, hits: Counter, misses: Counter
+    ) -> None:
+        super().__init__(name, documentation, hits.labelnames)
+        self.hits = hits
+        self.misses = misses
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["ratio"] = [self.hits.name, self.misses.name]
+        return snapshot
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together.
+
+    Collectors are callables run before every snapshot, to copy values kept
+    elsewhere (pool sizes, cache counters) into metrics.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def ratio(
+        self, name: str, documentation: str, hits: Counter, misses: Counter
+    ) -> Ratio:
+        """Register a ratio derived from two counters."""
+        return self._register(Ratio(name, documentation, hits, misses))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every snapshot."""
+        self._collectors.append(collector)
+
+    def clear(self) -> None:
+        """Drop every recorded sample, keeping the registered metrics."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def snapshot(self, include_gauges: bool = True) -> Snapshot:
+        """Run the collectors and return the state of every metric.
+
+        Args:
+            include_gauges: Whether to include gauges; a worker's final
+                snapshot leaves them out, since they describe a live process
+
+        Returns:
+            JSON-compatible metric states keyed by metric name.
+        """
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Metrics collector failed")
+        return {
+            name: metric.snapshot()
+            for name, metric in self._metrics.items()
+            if include_gauges or metric.kind != "gauge" or isinstance(metric, Ratio)
+        }
+
+
+def merge_snapshots(snapshots: Iterable[Snapshot]) -> Snapshot:
+    """Sum the samples of several snapshots, label set by label set."""
+    merged: Snapshot = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "values": []})
+            totals = {tuple(labels): value for labels, value in target["values"]}
+            for labels, value in metric["values"]:
+                key = tuple(labels)
+                current = totals.get(key)
+                if current is None:
+                    totals[key] = value
+                elif isinstance(value, list):
+                    totals[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    totals[key] = current + value
+            target["values"] = [[list(k), value] for k, value in totals.items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _values_by_labels(metric: Optional[Dict[str, Any]]) -> Dict[Labels, Any]:
+    return {tuple(labels): value for labels, value in (metric or {}).get("values", [])}
+
+
+def render(snapshot: Snapshot) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for name, metric in snapshot.items():
+        names = metric["labelnames"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+
+        if "ratio" in metric:
+            hits_name, misses_name = metric["ratio"]
+            hits = _values_by_labels(snapshot.get(hits_name))
+            misses = _values_by_labels(snapshot.get(misses_name))
+            for labels in sorted(set(hits) | set(misses)):
+                total = hits.get(labels, 0) + misses.get(labels, 0)
+                ratio = hits.get(labels, 0) / total if total else 0.0
+                lines.append(f"{name}{_labels(names, labels)} {_number(ratio)}")
+            continue
+
+        for labels, value in sorted(metric["values"]):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            bounds = [*metric["buckets"], float("inf")]
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _snapshot_path(directory: str) -> Path:
+    return Path(directory) / f"metrics-{os.getpid()}.json"
+
+
+def write_snapshot(directory: str, final: bool = False) -> None:
+    """Write this process's snapshot into the multiprocess directory.
+
+    Args:
+        directory: Directory shared by all worker processes
+        final: Whether the process is exiting; gauges are then left out
+    """
+    path = _snapshot_path(directory)
+    partial = path.with_suffix(".part")
+    partial.write_text(json.dumps(registry.snapshot(include_gauges=not final)))
+    os.replace(partial, path)
+
+
+def read_snapshots(directory: str) -> Snapshot:
+    """Merge the snapshots of every worker in the multiprocess directory."""
+    snapshots = []
+    for path in sorted(Path(directory).glob("metrics-*.json")):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable metrics snapshot %s", path)
+    return merge_snapshots(snapshots)
+
+
+def generate_latest() -> str:
+    """Render the current metrics, aggregated across workers when configured."""
+    directory = get_settings().METRICS_MULTIPROC_DIR
+    if not directory:
+        return render(registry.snapshot())
+    # Refresh this worker's own snapshot so the scrape sees it up to date.
+    write_snapshot(directory)
+    return render(read_snapshots(directory))
+
+
+async def flush_periodically(directory: str, interval: float) -> None:
+    """Write this worker's snapshot every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            write_snapshot(directory)
+        except OSError:
+            logger.exception("Failed to write metrics snapshot")
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ("method", "route"),
+    buckets=settings.METRICS_LATENCY_BUCKETS,
+)
+REQUESTS = registry.counter(
+    "http_requests_total",
+    "Requests completed, by route and status code.",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "Requests currently being processed.", ("method",)
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections",
+    "Database pool connections: configured size, checked out, idle and overflow.",
+    ("pool", "state"),
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool.",
+    buckets=settings.METRICS_POOL_WAIT_BUCKETS,
+)
+CACHE_HITS = registry.counter("cache_hits_total", "Entity cache hits.", ("cache",))
+CACHE_MISSES = registry.counter(
+    "cache_misses_total", "Entity cache misses.", ("cache",)
+)
+CACHE_HIT_RATIO = registry.ratio(
+    "cache_hit_ratio", "Entity cache hits per lookup.", CACHE_HITS, CACHE_MISSES
+)
+
+
+def _collect_cache_metrics() -> None:
+    cache = get_example_cache()
+    CACHE_HITS.set_total(cache.hits, (cache.namespace,))
+    CACHE_MISSES.set_total(cache.misses, (cache.namespace,))
+
+
+registry.add_collector(_collect_cache_metrics)
+
+
+# Route label per route object, keyed by id() since routes are unhashable.
+_ROUTE_LABELS: Dict[int, str] = {}
+
+
+def _route_label(scope: Scope) -> str:
+    """Return the route template a request matched, e.g. ``/api/v1/examples/{id}``.
+
+    Routes of included routers may report their path relative to the router's
+    prefix, so the prefix is recovered from the first request and cached.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    label = _ROUTE_LABELS.get(id(route))
+    if label is None:
+        label = template
+        path, regex = scope["path"], getattr(route, "path_regex", None)
+        if regex is not None:
+            for index, char in enumerate(path):
+                if char == "/" and regex.match(path[index:]):
+                    label = path[:index] + template
+                    break
+        _ROUTE_LABELS[id(route)] = label
+    return label
+
+
+class MetricsMiddleware:
+    """Record request latency, status codes and in-flight requests.
+
+    Requests are labelled with the route template rather than the raw path, to
+    keep the number of series bounded; requests that match no route share the
+    ``unmatched`` label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.inc((method,))
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec((method,))
+            route = _route_label(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - start, (method, route))
+            REQUESTS.inc((method, route, str(status_code)))
@@ -1,79 +1,164 @@
 import time
-from typing import Callable
 import uuid
 import logging
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from .config import get_settings
+from .metrics import MetricsMiddleware
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+# Added to every HTTP response, precomputed as raw ASGI header pairs.
+SECURITY_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"content-security-policy", b"default-src 'self'"),
+]
+_SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS)
+
+
+def _url(scope: Scope) -> str:
+    query = scope.get("query_string", b"")
+    path = scope.get("root_path", "") + scope["path"]
+    return f"{path}?{query.decode('latin-1')}" if query else path
+
+
+class RequestLoggingMiddleware:
+    """Assign each request an ID, log it and report its processing time.
+
+    Pure ASGI: the response is passed through untouched apart from the
+    ``X-Request-ID`` and ``X-Process-Time`` headers, so streaming responses
+    stream. The request ID is available as ``request.state.request_id``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        start_time = time.time()
-        
-        # Log request
-        logger.info(
-            f"Request started",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "url": str(request.url),
-                "client_host": request.client.host if request.client else None,
-            },
-        )
-        
-        try:
-            response = await call_next(request)
-            
-            # Log response
-            process_time = time.time() - start_time
+        scope.setdefault("state", {})["request_id"] = request_id
+        start = time.perf_counter_ns()
+        status_code = 500
+        log_info = logger.isEnabledFor(logging.INFO)
+
+        if log_info:
+            client = scope.get("client")
             logger.info(
-                "Request completed",
+                "Request started",
                 extra={
                     "request_id": request_id,
-                    "status_code": response.status_code,
-                    "process_time": process_time,
+                    "method": scope["method"],
+                    "url": _url(scope),
+                    "client_host": client[0] if client else None,
                 },
             )
-            
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(process_time)
-            
-            return response
-            
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = (time.perf_counter_ns() - start) / 1e9
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", request_id.encode()),
+                    (b"x-process-time", str(process_time).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
         except Exception as e:
-            process_time = time.time() - start_time
             logger.error(
                 "Request failed",
                 extra={
                     "request_id": request_id,
                     "error": str(e),
-                    "process_time": process_time,
+                    "process_time": (time.perf_counter_ns() - start) / 1e9,
                 },
             )
             raise
 
+        if log_info:
+            logger.info(
+                "Request completed",
+                extra={
+                    "request_id": request_id,
+                    "status_code": status_code,
+                    "process_time": (time.perf_counter_ns() - start) / 1e9,
+                },
+            )
+
+
+class SecurityHeadersMiddleware:
+    """Add :data:`SECURITY_HEADERS` to every HTTP response.
+
+    Headers of the same name set by the app are replaced.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", ())
+                message["headers"] = [
+                    *(h for h in headers if h[0].lower() not in _SECURITY_HEADER_NAMES),
+                    *SECURITY_HEADERS,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
-        
-        return response
+
+class CacheControlMiddleware:
+    """Add a ``Cache-Control`` header to successful GET responses, per route.
+
+    The policy comes from ``HTTP_CACHE_CONTROL``, keyed by route name. A
+    header already set by the endpoint is left alone.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.policies = {
+            name: value.encode("latin-1")
+            for name, value in settings.HTTP_CACHE_CONTROL.items()
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                route = scope.get("route")
+                policy = self.policies.get(getattr(route, "name", None))
+                headers = message.get("headers", ())
+                if (
+                    policy is not None
+                    and (200 <= status < 300 or status == 304)
+                    and not any(name.lower() == b"cache-control" for name, _ in headers)
+                ):
+                    message["headers"] = [*headers, (b"cache-control", policy)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
 
 
 def setup_middleware(app: FastAPI) -> None:
@@ -98,3 +183,11 @@ def setup_middleware(app: FastAPI) -> None:
     
     # Security Headers
     app.add_middleware(SecurityHeadersMiddleware)
+
+    # Cache-Control for cacheable reads
+    if settings.HTTP_CACHE_CONTROL:
+        app.add_middleware(CacheControlMiddleware)
+
+    # Metrics, outermost so latency covers the whole middleware stack
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
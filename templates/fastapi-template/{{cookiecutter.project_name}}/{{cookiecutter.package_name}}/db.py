@@ -1,12 +1,259 @@
-from sqlmodel import SQLModel, create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+"""Database engines, session factories and lifecycle helpers.
 
-DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+Writes go to the primary database (``DATABASE_URL``). Read-only routes use
+``read_session``, whose sessions read from one of the ``DATABASE_REPLICA_URLS``
+until they write, and from then on use the primary, so a request always sees
+its own writes. Without replicas both factories use the primary.
+"""
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+import itertools
+import time
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select, TextClause, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    QueuePool,
+    StaticPool,
+)
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel import SQLModel
+
+from .core.config import Settings, get_settings
+from .core.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECTIONS, registry
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # SQLAlchemy has no event before a checkout starts waiting, so time the
+        # pool's own checkout step instead.
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def _sqlite_pragmas(settings: Settings) -> list[str]:
+    """Build the PRAGMA statements applied to every new SQLite connection."""
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        "PRAGMA foreign_keys=ON",
+    ]
+
+
+def create_engine(
+    settings: Settings | None = None, url: Optional[str] = None
+) -> AsyncEngine:
+    """Create the async engine described by the settings.
+
+    Pool size, overflow, timeout, pre-ping and recycle come from ``Settings``.
+    SQLite connections are tuned with ``PRAGMA`` statements as they are opened;
+    in-memory SQLite databases share a single connection, since each new
+    connection would otherwise see an empty database.
+
+    Args:
+        settings: Settings to use; defaults to ``get_settings()``
+        url: Database to connect to; defaults to ``DATABASE_URL``. Replica
+            engines pass their own URL and share the other settings.
+
+    Returns:
+        The configured engine.
+    """
+    settings = settings or get_settings()
+    url = make_url(url or settings.DATABASE_URL)
+    options: dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    is_sqlite = url.get_backend_name() == "sqlite"
+
+    if is_sqlite and _is_memory_sqlite(url):
+        options["poolclass"] = StaticPool
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    engine = create_async_engine(url, **options)
+
+    if is_sqlite:
+        pragmas = _sqlite_pragmas(settings)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _tune_sqlite(dbapi_connection: Any, connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return engine
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    pool = engine.pool
+    return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+class ReplicaSet:
+    """Read replica engines and the policy for picking one.
+
+    Args:
+        engines: One engine per replica
+        selection: ``"round_robin"`` to rotate through the replicas, or
+            ``"least_busy"`` to pick the one with the fewest checked-out
+            connections (ties rotate)
+
+    Raises:
+        ValueError: If ``selection`` is not a known policy
+    """
+
+    def __init__(
+        self, engines: Sequence[AsyncEngine], selection: str = "round_robin"
+    ):
+        if selection not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unknown replica selection: {selection!r}")
+        self.engines = list(engines)
+        self.selection = selection
+        self._counter = itertools.count()
+
+    def choose(self) -> AsyncEngine:
+        """Pick the replica for a new session."""
+        start = next(self._counter) % len(self.engines)
+        if self.selection == "round_robin":
+            return self.engines[start]
+        rotated = self.engines[start:] + self.engines[:start]
+        return min(rotated, key=_checked_out)
+
+
+def _is_write(clause: Any) -> bool:
+    """Whether ``clause`` must run on the primary.
+
+    DML, ``SELECT ... FOR UPDATE`` and raw SQL, which may write, all do.
+    """
+    if isinstance(clause, (UpdateBase, TextClause)):
+        return True
+    return isinstance(clause, Select) and clause._for_update_arg is not None
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica until it first writes.
+
+    The replica is picked once per session, so all reads in a request see the
+    same snapshot. A flush or a write statement pins the session to the
+    primary for the rest of its life, so later reads see the write (and
+    replication lag cannot hide it).
+
+    Args:
+        replicas: Replicas to read from; without any, the session only uses
+            its primary ``bind``
+    """
+
+    def __init__(
+        self, *args: Any, replicas: Optional[ReplicaSet] = None, **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.replica: Optional[AsyncEngine] = None
+        self.pinned = replicas is None or not replicas.engines
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        if not self.pinned and (self._flushing or _is_write(clause)):
+            self.pinned = True
+        if self.pinned:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self.replica is None:
+            self.replica = self.replicas.choose()
+        return self.replica.sync_engine
+
+
+def read_from_primary(session: AsyncSession) -> None:
+    """Send the rest of ``session``'s queries to the primary."""
+    if isinstance(session.sync_session, RoutingSession):
+        session.sync_session.pinned = True
+
+
+def create_replica_set(settings: Settings | None = None) -> ReplicaSet:
+    """Create an engine per ``DATABASE_REPLICA_URLS`` entry."""
+    settings = settings or get_settings()
+    return ReplicaSet(
+        [create_engine(settings, url) for url in settings.DATABASE_REPLICA_URLS],
+        settings.DB_REPLICA_SELECTION,
+    )
+
+
+engine = create_engine()
+replicas = create_replica_set()
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_session = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replicas=replicas,
+    expire_on_commit=False,
+)
+
+
+def _collect_pool_metrics() -> None:
+    pools = [("primary", engine)]
+    pools += [(f"replica{i}", e) for i, e in enumerate(replicas.engines)]
+    for name, pool_engine in pools:
+        pool = pool_engine.pool
+        if not isinstance(pool, AsyncAdaptedQueuePool):
+            continue
+        DB_POOL_CONNECTIONS.set(pool.size(), (name, "size"))
+        DB_POOL_CONNECTIONS.set(pool.checkedout(), (name, "checked_out"))
+        DB_POOL_CONNECTIONS.set(pool.checkedin(), (name, "idle"))
+        DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), (name, "overflow"))
+
+
+registry.add_collector(_collect_pool_metrics)
+
+
+async def init_db() -> None:
+    """Create all tables that do not exist yet, and the search index.
+
+    Only the primary is changed; replicas get the schema through replication.
+    """
+    from .search import create_search_index, detect_search_index
 
-async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        # Tables created by create_all get their index from a DDL event; this
+        # covers databases created before search existed.
+        await conn.run_sync(create_search_index)
+    for replica in replicas.engines:
+        async with replica.connect() as conn:
+            await conn.run_sync(detect_search_index)
+
+
+async def close_db() -> None:
+    """Close every pooled connection."""
+    await engine.dispose()
+    for replica in replicas.engines:
+        await replica.dispose()
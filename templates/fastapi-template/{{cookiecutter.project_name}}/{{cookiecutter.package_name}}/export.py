@@ -0,0 +1,79 @@
+"""Streaming export of examples as NDJSON or CSV."""
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Select
+
+from .db import read_session
+from .models import ExampleModel
+
+EXPORT_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "is_active",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+
+
+class ExportFormat(str, Enum):
+    """Formats rows can be exported in."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        """Return the response content type of the format."""
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+def _ndjson(rows: Sequence[ExampleModel]) -> bytes:
+    return "".join(
+        json.dumps(row.model_dump(mode="json"), separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _csv(rows: Sequence[ExampleModel]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        data = row.model_dump(mode="json")
+        data["tags"] = json.dumps(data["tags"]) if data["tags"] is not None else ""
+        writer.writerow(data[column] for column in EXPORT_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+async def stream_examples(
+    query: Select, fmt: ExportFormat, chunk_size: int
+) -> AsyncIterator[bytes]:
+    """Stream the rows of ``query`` as encoded chunks.
+
+    Rows are read through a server-side cursor ``chunk_size`` at a time, and each
+    chunk is encoded and sent before the next is fetched, so memory use does not
+    grow with the number of rows. The generator opens its own session, since it
+    runs after the endpoint (and its request-scoped session) has returned.
+
+    Args:
+        query: Select of ``ExampleModel`` rows, already filtered and ordered
+        fmt: Output format
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        Encoded chunks; for CSV the first chunk is the header row.
+    """
+    encode = _ndjson if fmt is ExportFormat.NDJSON else _csv
+    if fmt is ExportFormat.CSV:
+        yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+
+    async with read_session() as session:
+        result = await session.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.scalars().partitions():
+            yield encode(rows)
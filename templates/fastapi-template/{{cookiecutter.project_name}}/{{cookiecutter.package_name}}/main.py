@@ -1,37 +1,58 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 import logging
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Response
 from .core.config import get_settings
+from .core.logging_config import setup_logging, shutdown_logging
+from .core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    flush_periodically,
+    generate_latest,
+    write_snapshot,
+)
 from .core.middleware import setup_middleware
 from .core.exceptions import AppException, ErrorResponse
-from .db import init_db
+from .core.responses import ORJSONResponse
+from .db import close_db, init_db
 from .routers import example
 
 settings = get_settings()
 
 # Configure logging
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format=settings.LOG_FORMAT,
-)
+setup_logging(settings)
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    setup_logging(settings)
     logger.info("Starting up application...")
     await init_db()
+    metrics_dir = settings.METRICS_MULTIPROC_DIR if settings.METRICS_ENABLED else None
+    flusher = None
+    if metrics_dir:
+        flusher = asyncio.create_task(
+            flush_periodically(metrics_dir, settings.METRICS_FLUSH_INTERVAL)
+        )
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    if flusher is not None:
+        flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await flusher
+        write_snapshot(metrics_dir, final=True)
+    await close_db()
+    shutdown_logging()
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    docs_url=settings.DOCS_URL,
-    openapi_url=settings.OPENAPI_URL,
+    docs_url=None if settings.is_production else settings.DOCS_URL,
+    redoc_url=None if settings.is_production else "/redoc",
+    openapi_url=None if settings.is_production else settings.OPENAPI_URL,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Setup middleware
@@ -40,7 +61,7 @@ setup_middleware(app)
 # Exception handlers
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict(),
     )
@@ -54,6 +75,13 @@ async def health_check():
         "environment": settings.ENVIRONMENT,
     }
 
+if settings.METRICS_ENABLED:
+
+    @app.get(settings.METRICS_PATH, include_in_schema=False)
+    async def metrics() -> Response:
+        """Metrics in the Prometheus text format."""
+        return Response(generate_latest(), media_type=METRICS_CONTENT_TYPE)
+
 # Include routers
 app.include_router(
     example.router,
@@ -1,12 +1,24 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
-from sqlmodel import SQLModel, Field, JSON, Column
+from sqlmodel import SQLModel, Field, JSON, Column, Index
 from pydantic import ConfigDict
 
 
 class ExampleModel(SQLModel, table=True):
     """Example model with modern SQLModel practices for version 2.0."""
-    
+
+    __table_args__ = (
+        # Keyset pagination and created_at ranges: orders and seeks on
+        # (created_at, id).
+        Index("ix_examplemodel_created_at_id", "created_at", "id"),
+        # Name equality and prefix filters, and sorting by name.
+        Index("ix_examplemodel_name", "name"),
+        # "Active, newest first": is_active filters, alone or with pagination.
+        Index(
+            "ix_examplemodel_is_active_created_at_id", "is_active", "created_at", "id"
+        ),
+    )
+
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
         validate_assignment=True,
@@ -34,10 +46,16 @@ class ExampleModel(SQLModel, table=True):
     tags: Optional[List[str]] = Field(default=None, sa_column=Column(JSON), description="Tags for categorization")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: Optional[datetime] = Field(default=None)
 
 
+class CollectionVersion(SQLModel, table=True):
+    """Counter bumped by every write to a collection, used for list ETags."""
+    name: str = Field(primary_key=True, max_length=50)
+    version: int = Field(default=0)
+
+
 class ExampleCreate(SQLModel):
     """Schema for creating an example."""
     name: str = Field(min_length=1, max_length=100)
@@ -63,3 +81,54 @@ class ExampleResponse(SQLModel):
     tags: Optional[List[str]]
     created_at: datetime
     updated_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: ExampleModel) -> "ExampleResponse":
+        """Build a response from a database row without re-validating it.
+
+        The row was validated when it was written, so its values are copied as
+        they are.
+        """
+        return cls.model_construct(
+            **{name: getattr(row, name) for name in _RESPONSE_FIELDS}
+        )
+
+
+_RESPONSE_FIELDS = tuple(ExampleResponse.model_fields)
+
+
+class ExamplePage(SQLModel):
+    """A page of examples from keyset pagination."""
+    items: List[ExampleResponse]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page",
+    )
+
+
+# Largest number of items accepted by one bulk request.
+BULK_MAX_ITEMS = 1000
+
+
+class ExampleBulkUpdate(ExampleUpdate):
+    """Schema for one item of a bulk update."""
+    id: int
+
+
+class ExampleBulkDelete(SQLModel):
+    """Schema for a bulk delete."""
+    ids: List[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(SQLModel):
+    """Outcome of one item of a bulk request."""
+    index: int = Field(description="Position of the item in the request")
+    id: Optional[int] = None
+    status: str = Field(description="created, updated, deleted or not_found")
+
+
+class BulkResult(SQLModel):
+    """Per-item outcomes of a bulk request."""
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
@@ -0,0 +1,42 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from .core.exceptions import ValidationError
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encode the sort key of the last item on a page as an opaque token.
+
+    Args:
+        created_at: Creation time of the last item returned
+        item_id: ID of the last item returned
+
+    Returns:
+        A URL-safe cursor string.
+    """
+    payload = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Token from a previous page's ``next_cursor``
+
+    Returns:
+        The ``(created_at, id)`` sort key to continue after.
+
+    Raises:
+        ValidationError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValidationError("Invalid cursor", details={"cursor": cursor}) from e
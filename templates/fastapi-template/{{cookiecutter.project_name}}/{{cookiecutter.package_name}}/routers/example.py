@@ -1,67 +1,316 @@
-from typing import List
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from datetime import datetime, timezone
+from typing import List, Optional, Union
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..core.exceptions import NotFoundError, ValidationError
-from ..db import async_session
-from ..models import ExampleModel
+from ..core.cache import EntityCache, get_example_cache
+from ..core.config import get_settings
+from ..core.conditional import check_if_match, make_etag, none_match, not_modified
+from ..core.exceptions import NotFoundError, PreconditionFailedError, ValidationError
+from ..core.responses import ORJSONResponse, RawJSONResponse
+from ..db import async_session, read_from_primary, read_session
+from ..models import (
+    BULK_MAX_ITEMS,
+    BulkItemResult,
+    BulkResult,
+    ExampleBulkDelete,
+    ExampleBulkUpdate,
+    ExampleCreate,
+    ExampleModel,
+    ExamplePage,
+    ExampleResponse,
+    ExampleUpdate,
+)
+from ..export import ExportFormat, stream_examples
+from ..filters import ExampleFilters, ExampleSort
+from ..pagination import decode_cursor, encode_cursor
+from ..search import search_query, uses_fts
+from ..versions import EXAMPLES, bump_version, get_version
 
 router = APIRouter()
 
+_EXAMPLE_LIST = TypeAdapter(List[ExampleResponse])
+
+# IDs per "IN (...)" clause, well below every backend's bound-parameter limit.
+IN_CHUNK_SIZE = 500
+
 async def get_db():
     """Dependency for database session."""
     async with async_session() as session:
         yield session
 
-@router.get("/examples/", response_model=List[ExampleModel])
+async def get_read_db():
+    """Dependency for a session of a read-only route.
+
+    Reads go to a replica when any are configured; the session switches to the
+    primary if it writes.
+    """
+    async with read_session() as session:
+        yield session
+
+def _example_etag(example_id: int, changed_at: Union[datetime, str]) -> str:
+    """ETag of one example, from its ID and last modification time.
+
+    ``changed_at`` may be a datetime or its JSON form, so rows and cached
+    entries yield the same tag.
+    """
+    if isinstance(changed_at, str):
+        changed_at = datetime.fromisoformat(changed_at)
+    return make_etag(example_id, changed_at.timestamp())
+
+def _row_etag(example: ExampleModel) -> str:
+    return _example_etag(example.id, example.updated_at or example.created_at)
+
+def _unchanged(example: ExampleModel):
+    """Condition matching the row only while it is as ``example`` was loaded."""
+    if example.updated_at is None:
+        return ExampleModel.updated_at.is_(None)
+    return ExampleModel.updated_at == example.updated_at
+
+async def _collection_etag(request: Request, db: AsyncSession) -> str:
+    """ETag of a list response, from the collection version and the query.
+
+    Call it before querying the items: a write between the two reads then
+    yields an older tag for newer items, never a current tag for stale items.
+    """
+    version = await get_version(db, EXAMPLES)
+    return make_etag(EXAMPLES, version, sorted(request.query_params.multi_items()))
+
+@router.get("/examples/", response_model=List[ExampleResponse])
 async def list_examples(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of items to return"),
-    db: AsyncSession = Depends(get_db)
+    filters: ExampleFilters = Depends(),
+    sort: ExampleSort = Depends(),
+    request: Request = None,
+    response: Response = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all examples with pagination.
+
+    The response carries an ETag derived from the collection version and the
+    query; a matching ``If-None-Match`` gets ``304 Not Modified`` without the
+    items being queried. With ``PRESERIALIZED_LIST_RESPONSES`` enabled the
+    rows are serialized straight to JSON bytes, bypassing response-model
+    processing.
     
     Args:
         skip: Number of items to skip for pagination
         limit: Maximum number of items to return
+        filters: Conditions the items must match
+        sort: Order of the items
+        request: Incoming request, for its query and ``If-None-Match``
+        response: Outgoing response, for the ETag header
         db: Database session
     
     Returns:
         List of example items
     """
-    query = select(ExampleModel).offset(skip).limit(limit)
+    etag = await _collection_etag(request, db)
+    if none_match(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    query = sort.apply(filters.apply(select(ExampleModel)))
+    query = query.offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    items = [ExampleResponse.from_row(row) for row in result.scalars()]
+    if get_settings().PRESERIALIZED_LIST_RESPONSES:
+        return RawJSONResponse(_EXAMPLE_LIST.dump_json(items), headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return items
+
+@router.get("/examples/page", response_model=ExamplePage)
+async def page_examples(
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items to return"),
+    filters: ExampleFilters = Depends(),
+    request: Request = None,
+    response: Response = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List examples newest first, using keyset (cursor) pagination.
 
-@router.get("/examples/{example_id}", response_model=ExampleModel)
-async def get_example(example_id: int, db: AsyncSession = Depends(get_db)):
+    Each page seeks past the previous page's last ``(created_at, id)`` instead of
+    skipping rows, so deep pages cost the same as the first and items inserted
+    meanwhile do not shift later pages. ETags work as for the list endpoint.
+
+    Args:
+        cursor: Opaque ``next_cursor`` of the previous page; omit for the first page
+        limit: Maximum number of items to return
+        filters: Conditions the items must match
+        request: Incoming request, for its query and ``If-None-Match``
+        response: Outgoing response, for the ETag header
+        db: Database session
+
+    Returns:
+        The page of items and the cursor for the next page
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    etag = await _collection_etag(request, db)
+    if none_match(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    query = filters.apply(select(ExampleModel)).order_by(
+        ExampleModel.created_at.desc(), ExampleModel.id.desc()
+    )
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(ExampleModel.created_at, ExampleModel.id) < (created_at, last_id)
+        )
+    # Fetch one extra row to learn whether another page follows.
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    page = ExamplePage.model_construct(
+        items=[ExampleResponse.from_row(row) for row in rows], next_cursor=next_cursor
+    )
+    if get_settings().PRESERIALIZED_LIST_RESPONSES:
+        return RawJSONResponse(page.model_dump_json(), headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return page
+
+@router.get("/examples/export", response_class=StreamingResponse)
+async def export_examples(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson or csv"),
+    filters: ExampleFilters = Depends(),
+):
+    """
+    Stream every matching example as NDJSON or CSV.
+
+    Rows are read through a server-side cursor in chunks of
+    ``EXPORT_CHUNK_SIZE``, so memory stays flat however many rows match.
+
+    Args:
+        format: Output format
+        filters: Conditions the rows must match, as for the list endpoint
+
+    Returns:
+        A streaming response of the rows, ordered by ID
+    """
+    query = filters.apply(select(ExampleModel)).order_by(ExampleModel.id)
+    chunk_size = get_settings().EXPORT_CHUNK_SIZE
+    return StreamingResponse(
+        stream_examples(query, format, chunk_size),
+        media_type=format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="examples.{format.value}"'
+        },
+    )
+
+@router.get("/examples/search", response_model=List[ExampleResponse])
+async def search_examples(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items to return"),
+    filters: ExampleFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Search example names and descriptions.
+
+    Every term of ``q`` must match. On SQLite with FTS5, terms match whole
+    words through the full-text index and results are ranked by BM25, name
+    matches first; elsewhere terms match as substrings, ordered by ID.
+
+    Args:
+        q: Search text
+        skip: Number of items to skip for pagination
+        limit: Maximum number of items to return
+        filters: Conditions the items must also match
+        db: Database session
+
+    Returns:
+        Matching example items, best matches first
+
+    Raises:
+        ValidationError: If ``q`` contains no search terms
+    """
+    if not q.split():
+        raise ValidationError("Search text is empty", details={"q": q})
+    query = filters.apply(search_query(q, fts=uses_fts(db)))
+    result = await db.execute(query.offset(skip).limit(limit))
+    return [ExampleResponse.from_row(row) for row in result.scalars()]
+
+@router.get("/examples/{example_id}", response_model=ExampleResponse)
+async def get_example(
+    example_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
     """
     Get a specific example by ID.
-    
+
+    Reads go through the example cache; the database is only queried on a miss.
+    Shortly after a write, misses read from the primary, so a lagging replica
+    cannot put the old row back in the cache. The response carries an ETag
+    derived from the ID and modification time; a matching ``If-None-Match``
+    gets ``304 Not Modified`` with no body.
+
     Args:
         example_id: ID of the example to retrieve
+        if_none_match: ETags of copies the client already has
         db: Database session
-    
+        cache: Example entity cache
+
     Returns:
         Example item
-    
+
     Raises:
         NotFoundError: If example with given ID doesn't exist
     """
-    result = await db.get(ExampleModel, example_id)
+    async def load():
+        if cache.invalidated_within(get_settings().DB_REPLICA_MAX_LAG_SECONDS):
+            read_from_primary(db)
+        example = await db.get(ExampleModel, example_id)
+        if example is None:
+            return None
+        return ExampleResponse.from_row(example).model_dump(mode="json")
+
+    result = await cache.get_or_load(example_id, load)
     if not result:
         raise NotFoundError("Example", example_id)
-    return result
+    etag = _example_etag(example_id, result["updated_at"] or result["created_at"])
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    # Cached values are already JSON-ready; skip response-model validation.
+    return ORJSONResponse(result, headers={"ETag": etag})
 
-@router.post("/examples/", response_model=ExampleModel)
-async def create_example(example: ExampleModel, db: AsyncSession = Depends(get_db)):
+@router.get("/cache/stats")
+async def cache_stats(cache: EntityCache = Depends(get_example_cache)):
+    """
+    Report hit/miss counters of the example cache.
+
+    Args:
+        cache: Example entity cache
+
+    Returns:
+        Hits, misses and hit ratio since startup
+    """
+    return cache.stats()
+
+@router.post("/examples/", response_model=ExampleResponse)
+async def create_example(
+    example: ExampleModel,
+    db: AsyncSession = Depends(get_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
     """
     Create a new example.
     
     Args:
         example: Example data to create
         db: Database session
+        cache: Example entity cache, invalidated for the new ID
     
     Returns:
         Created example item
@@ -71,32 +320,274 @@ async def create_example(example: ExampleModel, db: AsyncSession = Depends(get_d
     """
     try:
         db.add(example)
+        await bump_version(db, EXAMPLES)
         await db.commit()
         await db.refresh(example)
-        return example
     except Exception as e:
         raise ValidationError(str(e))
+    await cache.invalidate(example.id)
+    return ExampleResponse.from_row(example)
+
+def _chunks(ids: List[int]) -> List[List[int]]:
+    return [ids[i:i + IN_CHUNK_SIZE] for i in range(0, len(ids), IN_CHUNK_SIZE)]
+
+def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    failed = sum(result.status == "not_found" for result in results)
+    return BulkResult(succeeded=len(results) - failed, failed=failed, results=results)
+
+@router.post("/examples/bulk", response_model=BulkResult)
+async def bulk_create_examples(
+    examples: List[ExampleCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
+    """
+    Create many examples in one transaction.
+
+    Rows are inserted with a single batched ``INSERT ... RETURNING``.
+
+    Args:
+        examples: Examples to create
+        db: Database session
+        cache: Example entity cache, invalidated for the new IDs
+
+    Returns:
+        The new ID of every item, in request order
+
+    Raises:
+        ValidationError: If any item cannot be inserted; nothing is created
+    """
+    now = datetime.now(timezone.utc)
+    rows = [{**example.model_dump(), "created_at": now} for example in examples]
+    try:
+        result = await db.execute(
+            insert(ExampleModel).returning(
+                ExampleModel.id, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        ids = list(result.scalars().all())
+        await bump_version(db, EXAMPLES)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise ValidationError(str(e))
+    await cache.invalidate(*ids)
+    return _bulk_result([
+        BulkItemResult(index=i, id=item_id, status="created")
+        for i, item_id in enumerate(ids)
+    ])
+
+@router.patch("/examples/bulk", response_model=BulkResult)
+async def bulk_update_examples(
+    examples: List[ExampleBulkUpdate] = Body(
+        ..., min_length=1, max_length=BULK_MAX_ITEMS
+    ),
+    db: AsyncSession = Depends(get_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
+    """
+    Update many examples in one transaction.
+
+    Only the fields present in each item are changed. Existing IDs are looked up
+    with one ``SELECT ... WHERE id IN (...)``, then all updates run as an
+    executemany ``UPDATE`` by primary key.
+
+    Args:
+        examples: Changes to apply, each with the ID of the example to change
+        db: Database session
+        cache: Example entity cache, invalidated for the updated IDs
+
+    Returns:
+        ``updated`` or ``not_found`` for every item, in request order
+
+    Raises:
+        ValidationError: If the updates cannot be applied; nothing is changed
+    """
+    ids = list({example.id for example in examples})
+    existing = set()
+    for chunk in _chunks(ids):
+        result = await db.execute(
+            select(ExampleModel.id).where(ExampleModel.id.in_(chunk))
+        )
+        existing.update(result.scalars().all())
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {**example.model_dump(exclude_unset=True), "updated_at": now}
+        for example in examples
+        if example.id in existing
+    ]
+    try:
+        if rows:
+            await db.execute(update(ExampleModel), rows)
+            await bump_version(db, EXAMPLES)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise ValidationError(str(e))
+    await cache.invalidate(*existing)
+    return _bulk_result([
+        BulkItemResult(
+            index=i,
+            id=example.id,
+            status="updated" if example.id in existing else "not_found",
+        )
+        for i, example in enumerate(examples)
+    ])
+
+@router.delete("/examples/bulk", response_model=BulkResult)
+async def bulk_delete_examples(
+    request: ExampleBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
+    """
+    Delete many examples in one transaction.
+
+    Each chunk of IDs is removed with one ``DELETE ... WHERE id IN (...) RETURNING id``.
+
+    Args:
+        request: IDs of the examples to delete
+        db: Database session
+        cache: Example entity cache, invalidated for the deleted IDs
+
+    Returns:
+        ``deleted`` or ``not_found`` for every ID, in request order
+    """
+    deleted = set()
+    try:
+        for chunk in _chunks(list(set(request.ids))):
+            result = await db.execute(
+                delete(ExampleModel)
+                .where(ExampleModel.id.in_(chunk))
+                .returning(ExampleModel.id)
+            )
+            deleted.update(result.scalars().all())
+        if deleted:
+            await bump_version(db, EXAMPLES)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise ValidationError(str(e))
+    await cache.invalidate(*deleted)
+    return _bulk_result([
+        BulkItemResult(
+            index=i,
+            id=item_id,
+            status="deleted" if item_id in deleted else "not_found",
+        )
+        for i, item_id in enumerate(request.ids)
+    ])
 
 @router.delete("/examples/{example_id}")
-async def delete_example(example_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_example(
+    example_id: int,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
     """
     Delete an example by ID.
     
     Args:
         example_id: ID of the example to delete
+        if_match: Only delete if the example still has one of these ETags
         db: Database session
+        cache: Example entity cache, invalidated for the deleted ID
     
     Returns:
         Success message
     
     Raises:
         NotFoundError: If example with given ID doesn't exist
+        PreconditionFailedError: If ``If-Match`` does not match the example
     """
     example = await db.get(ExampleModel, example_id)
     if not example:
         raise NotFoundError("Example", example_id)
     
-    await db.delete(example)
+    query = delete(ExampleModel).where(ExampleModel.id == example_id)
+    # Taken up front: a rollback expires the row, so it cannot be read after.
+    etag = _row_etag(example)
+    if if_match:
+        check_if_match(if_match, etag)
+        # Also guard against a write landing between the check and the delete.
+        query = query.where(_unchanged(example))
+    result = await db.execute(query)
+    if result.rowcount == 0:
+        # Without If-Match the row can only have been deleted meanwhile.
+        await db.rollback()
+        if if_match:
+            raise PreconditionFailedError(etag)
+        raise NotFoundError("Example", example_id)
+    await bump_version(db, EXAMPLES)
     await db.commit()
+    await cache.invalidate(example_id)
     
     return {"message": f"Example {example_id} deleted successfully"}
+
+@router.patch("/examples/{example_id}", response_model=ExampleResponse)
+async def update_example(
+    example_id: int,
+    changes: ExampleUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    cache: EntityCache = Depends(get_example_cache),
+):
+    """
+    Update an example by ID.
+
+    Only the fields present in the request are changed. Send the ETag from a
+    previous read as ``If-Match`` to avoid overwriting someone else's change.
+
+    Args:
+        example_id: ID of the example to update
+        changes: Fields to change
+        response: Outgoing response, for the new ETag
+        if_match: Only update if the example still has one of these ETags
+        db: Database session
+        cache: Example entity cache, invalidated for the updated ID
+
+    Returns:
+        The updated example
+
+    Raises:
+        NotFoundError: If example with given ID doesn't exist
+        PreconditionFailedError: If ``If-Match`` does not match the example
+        ValidationError: If the changes cannot be applied
+    """
+    example = await db.get(ExampleModel, example_id)
+    if not example:
+        raise NotFoundError("Example", example_id)
+
+    query = update(ExampleModel).where(ExampleModel.id == example_id)
+    # Taken up front: a rollback expires the row, so it cannot be read after.
+    etag = _row_etag(example)
+    if if_match:
+        check_if_match(if_match, etag)
+        # Also guard against a write landing between the check and the update.
+        query = query.where(_unchanged(example))
+    values = {
+        **changes.model_dump(exclude_unset=True),
+        "updated_at": datetime.now(timezone.utc),
+    }
+    try:
+        result = await db.execute(query.values(**values))
+        if result.rowcount == 0:
+            await db.rollback()
+            if if_match:
+                raise PreconditionFailedError(etag)
+            raise NotFoundError("Example", example_id)
+        await bump_version(db, EXAMPLES)
+        await db.commit()
+    except (NotFoundError, PreconditionFailedError):
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise ValidationError(str(e))
+    await db.refresh(example)
+    await cache.invalidate(example_id)
+    response.headers["ETag"] = _row_etag(example)
+    return ExampleResponse.from_row(example)
@@ -0,0 +1,189 @@
+"""Full-text search over example names and descriptions.
+
+On SQLite builds with FTS5, an external-content FTS5 table indexes
+``ExampleModel.name`` and ``description``. Triggers on the example table keep
+it in sync, including rows written by the bulk endpoints' plain ``INSERT``,
+``UPDATE`` and ``DELETE`` statements. Matches are ranked by BM25, with name
+matches weighted above description matches.
+
+Other backends, and SQLite builds without FTS5, fall back to a
+case-insensitive substring scan.
+"""
+
+from typing import Any, List, Set
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    column,
+    event,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import ExampleModel
+
+FTS_TABLE = f"{ExampleModel.__tablename__}_fts"
+
+# BM25 weight of the name and description columns.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_SOURCE = ExampleModel.__tablename__
+
+_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='{_SOURCE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {_SOURCE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {_SOURCE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON {_SOURCE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+# Databases (by URL) whose example table has an FTS5 index.
+_FTS_DATABASES: Set[str] = set()
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+
+def _database_key(connection: Any) -> str:
+    return connection.engine.url.render_as_string(hide_password=True)
+
+
+def _fts5_available(connection: Connection) -> bool:
+    options = connection.exec_driver_sql("PRAGMA compile_options").scalars().all()
+    return "ENABLE_FTS5" in options
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the FTS5 table and its sync triggers if the database supports them.
+
+    Idempotent. When the FTS table is new, rows already in the example table
+    are indexed too. Runs after the example table is created, and from
+    ``init_db`` for databases created before search existed.
+
+    Args:
+        connection: Synchronous connection to the database
+    """
+    if connection.dialect.name != "sqlite" or not _fts5_available(connection):
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    for statement in _FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if exists is None:
+        connection.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+    _FTS_DATABASES.add(_database_key(connection))
+
+
+def detect_search_index(connection: Connection) -> None:
+    """Record whether an externally maintained database has the FTS5 table.
+
+    Replicas get their schema through replication rather than from
+    ``create_search_index``; this lets searches routed to them use the index.
+
+    Args:
+        connection: Synchronous connection to the database
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    if exists is not None:
+        _FTS_DATABASES.add(_database_key(connection))
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop the FTS5 table; its triggers go with the example table."""
+    if connection.dialect.name != "sqlite":
+        return
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    _FTS_DATABASES.discard(_database_key(connection))
+
+
+@event.listens_for(ExampleModel.__table__, "after_create")
+def _after_create(target: Any, connection: Connection, **kw: Any) -> None:
+    create_search_index(connection)
+
+
+@event.listens_for(ExampleModel.__table__, "before_drop")
+def _before_drop(target: Any, connection: Connection, **kw: Any) -> None:
+    drop_search_index(connection)
+
+
+def _substring_match(term: str) -> ColumnElement[bool]:
+    return or_(
+        ExampleModel.name.icontains(term, autoescape=True),
+        ExampleModel.description.icontains(term, autoescape=True),
+    )
+
+
+def _fts_query(terms: List[str]) -> str:
+    """Quote every term, so FTS5 operators in user input are matched literally."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def uses_fts(session: AsyncSession) -> bool:
+    """Whether searches through ``session`` can use the FTS5 index."""
+    return _database_key(session.get_bind()) in _FTS_DATABASES
+
+
+def search_query(q: str, fts: bool) -> Select:
+    """Build the query for examples matching every term of ``q``.
+
+    Args:
+        q: Search text; whitespace-separated terms must all match
+        fts: Whether to use the FTS5 index; otherwise every term is matched as
+            a case-insensitive substring of the name or description
+
+    Returns:
+        A query for the matching examples, best matches first.
+    """
+    terms = q.split()
+    if not fts:
+        return (
+            select(ExampleModel)
+            .where(*(_substring_match(term) for term in terms))
+            .order_by(ExampleModel.id)
+        )
+    match = text(f"{FTS_TABLE} MATCH :fts_query").bindparams(
+        fts_query=_fts_query(terms)
+    )
+    rank = literal_column(f"bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})")
+    return (
+        select(ExampleModel)
+        .join(_fts, _fts.c.rowid == ExampleModel.id)
+        .where(match)
+        .order_by(rank, ExampleModel.id)
+    )
@@ -0,0 +1,42 @@
+"""Per-collection version counters.
+
+Every write to a collection bumps its counter in the same transaction, so the
+counter changes whenever any list over the collection could. Reading it is a
+primary-key lookup, which makes it a cheap basis for list ETags that stays
+correct across worker processes.
+"""
+
+from typing import Any
+
+from sqlalchemy import event, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import CollectionVersion
+
+EXAMPLES = "examples"
+
+
+@event.listens_for(CollectionVersion.__table__, "after_create")
+def _seed(target: Any, connection: Connection, **kw: Any) -> None:
+    # Seeded rows let the first concurrent writers all take the UPDATE path.
+    connection.execute(target.insert(), [{"name": EXAMPLES, "version": 0}])
+
+
+async def get_version(db: AsyncSession, name: str) -> int:
+    """Return the current version of collection ``name``."""
+    result = await db.execute(
+        select(CollectionVersion.version).where(CollectionVersion.name == name)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_version(db: AsyncSession, name: str) -> None:
+    """Increment the version of collection ``name`` in the current transaction."""
+    result = await db.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.name == name)
+        .values(version=CollectionVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(CollectionVersion(name=name, version=1))
@@ -12,6 +12,7 @@ def temp_project_dir() -> str:
 
     Returns:
         str: Path to the temporary directory
+
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         original_cwd = os.getcwd()
@@ -26,5 +27,28 @@ def project_templates_path() -> Path:
 
     Returns:
         Path: Path to the templates directory
+
     """
     return Path(__file__).parent.parent / "templates"
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point pytemplate's caches at a fresh directory for every test.
+
+    Returns:
+        Path: Path to the cache directory
+
+    """
+    from pytemplate.engine import get_engine
+    from pytemplate.registry import get_registry
+
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("PYTEMPLATE_CACHE_DIR", str(cache_dir))
+    get_engine.cache_clear()
+    get_registry.cache_clear()
+    yield cache_dir
+    get_engine.cache_clear()
+    get_registry.cache_clear()
@@ -0,0 +1,71 @@
+"""Tests for streaming projects into archives."""
+from __future__ import annotations
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pytemplate.archive import ArchiveFormat, generate_archive, write_archive
+from pytemplate.config import TEMPLATES_DIR
+from pytemplate.engine import RenderEngine
+
+TEMPLATE = TEMPLATES_DIR / "fastapi-template"
+
+
+class _Pipe(io.RawIOBase):
+    """Write-only, non-seekable stream, like stdout redirected to a pipe."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.data += b
+        return len(b)
+
+
+def _generated(tmp_path: Path, engine: RenderEngine, context: dict) -> dict[str, bytes]:
+    project_dir = engine.generate(TEMPLATE, context, output_dir=tmp_path / "dir")
+    return {
+        p.relative_to(project_dir.parent).as_posix(): p.read_bytes()
+        for p in project_dir.rglob("*")
+        if p.is_file()
+    }
+
+
+@pytest.mark.parametrize("fmt", [ArchiveFormat.TAR_GZ, ArchiveFormat.ZIP])
+def test_archive_matches_generated_directory(tmp_path: Path, fmt: ArchiveFormat) -> None:
+    engine = RenderEngine()
+    context = engine.build_context(TEMPLATE, {"project_name": "packed"}, no_input=True)
+    pipe = _Pipe()
+
+    count = write_archive(engine.iter_files(TEMPLATE, context), pipe, fmt)
+
+    if fmt is ArchiveFormat.ZIP:
+        with zipfile.ZipFile(io.BytesIO(pipe.data)) as archive:
+            members = {name: archive.read(name) for name in archive.namelist()}
+    else:
+        with tarfile.open(fileobj=io.BytesIO(pipe.data)) as archive:
+            members = {m.name: archive.extractfile(m).read() for m in archive.getmembers()}
+    assert count == len(members)
+    assert members == _generated(tmp_path, engine, context)
+
+
+def test_generate_archive_infers_format_and_leaves_no_directory(tmp_path: Path) -> None:
+    engine = RenderEngine()
+    context = engine.build_context(TEMPLATE, {"project_name": "packed"}, no_input=True)
+    target = tmp_path / "packed.tar.xz"
+
+    generate_archive(engine, TEMPLATE, context, str(target))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["packed.tar.xz"]
+    with tarfile.open(target) as archive:
+        assert "packed/pyproject.toml" in archive.getnames()
+    assert ArchiveFormat.from_path("x.tgz") is ArchiveFormat.TAR_GZ
+    with pytest.raises(ValueError):
+        ArchiveFormat.from_path("x.rar")
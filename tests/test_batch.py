@@ -0,0 +1,78 @@
+"""Tests for batch project generation."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pytemplate import batch
+from pytemplate.batch import BatchEntry, BatchResult, generate_entry, load_manifest, run_batch
+
+
+def test_load_toml_manifest(tmp_path: Path) -> None:
+    """Test that TOML manifests yield entries with context overrides."""
+    manifest = tmp_path / "manifest.toml"
+    manifest.write_text(
+        '[[projects]]\nname = "svc-a"\ntemplate = "fastapi"\n'
+        '[projects.context]\ndescription = "Service A"\n\n'
+        '[[projects]]\nname = "lib-b"\n'
+    )
+
+    entries = load_manifest(manifest)
+
+    assert entries == [
+        BatchEntry("svc-a", "fastapi", {"description": "Service A"}),
+        BatchEntry("lib-b", "pyproject", {}),
+    ]
+
+
+def test_load_csv_manifest(tmp_path: Path) -> None:
+    """Test that extra CSV columns become context overrides."""
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("name,template,description\nsvc-a,fastapi,Service A\nlib-b,,\n")
+
+    entries = load_manifest(manifest)
+
+    assert entries[0].context == {"description": "Service A"}
+    assert entries[1] == BatchEntry("lib-b", "pyproject", {})
+
+
+def test_run_batch_reports_each_project(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that a parallel batch reports success and failure per project."""
+    entries = [
+        BatchEntry("svc-a", "fastapi"),
+        BatchEntry("lib-b", "pyproject", {"description": "Library B"}),
+        BatchEntry("broken", "missing"),
+    ]
+
+    results = run_batch(entries, {}, project_templates_path, tmp_path, workers=2)
+
+    assert [r.project_name for r in results] == ["svc-a", "lib-b", "broken"]
+    assert [r.ok for r in results] == [True, True, False]
+    assert "Template 'missing' not found" in results[2].error
+    assert "Library B" in (tmp_path / "lib-b" / "README.md").read_text()
+
+
+
+def _fail_broken(entry: BatchEntry, *args, **kwargs) -> BatchResult:
+    if entry.project_name == "broken":
+        raise OSError("disk on fire")
+    return generate_entry(entry, *args, **kwargs)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_isolates_unexpected_errors(
+    project_templates_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    workers: int,
+) -> None:
+    """Test that an exception escaping an entry fails only that entry."""
+    monkeypatch.setattr(batch, "generate_entry", _fail_broken)
+    entries = [BatchEntry("broken"), BatchEntry("lib-a")]
+
+    results = run_batch(entries, {}, project_templates_path, tmp_path, workers=workers)
+
+    assert [r.project_name for r in results] == ["broken", "lib-a"]
+    assert [r.ok for r in results] == [False, True]
+    assert results[0].error == "OSError: disk on fire"
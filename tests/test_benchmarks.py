@@ -0,0 +1,39 @@
+"""Smoke tests for the generation benchmark suite."""
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent.parent / "benchmarks" / "generation.py"
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("generation_benchmark", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    bench = _load()
+    baseline = {"templates": {"pyproject": {"cold_s": 1.0, "warm_s": 1.0, "peak_rss_mb": 30}}}
+    current = {"templates": {"pyproject": {"cold_s": 1.1, "warm_s": 1.5, "peak_rss_mb": 30}}}
+
+    regressions = bench.compare(current, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("pyproject.warm_s")
+
+
+def test_benchmark_run_against_its_own_baseline(tmp_path: Path) -> None:
+    bench = _load()
+    output = tmp_path / "results.json"
+    args = ["--template", "pyproject", "--projects", "2", "--workers", "2", "--repeat", "1"]
+
+    assert bench.main([*args, "--output", str(output)]) == 0
+
+    result = json.loads(output.read_text())["templates"]["pyproject"]
+    assert result["files_written"] == 2 * result["files"]
+    assert result["cold_s"] > 0 and result["peak_rss_mb"] > 0
+    assert bench.main([*args, "--baseline", str(output), "--threshold", "1000"]) == 0
@@ -0,0 +1,94 @@
+"""Tests for the rendered project cache."""
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from pytemplate.cache import RenderCache
+from pytemplate.engine import RenderEngine
+from pytemplate.registry import TemplateRegistry
+
+
+def _context(engine: RenderEngine, template_path: Path, name: str) -> dict:
+    return engine.build_context(template_path, {"project_name": name}, no_input=True)
+
+
+def test_second_generation_is_a_hit(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that an identical template and context is served from the cache.
+
+    Args:
+        project_templates_path (Path): Path to project templates
+        tmp_path (Path): Scratch directory
+
+    """
+    engine = RenderEngine()
+    cache = RenderCache(tmp_path / "cache")
+    template_path = project_templates_path / "pyproject-template"
+    context = _context(engine, template_path, "demo")
+
+    first, first_hit = cache.generate(engine, template_path, context, tmp_path / "a")
+    second, second_hit = cache.generate(engine, template_path, context, tmp_path / "b")
+
+    assert (first_hit, second_hit) == (False, True)
+    rendered = sorted(p.relative_to(first) for p in first.rglob("*"))
+    assert rendered == sorted(p.relative_to(second) for p in second.rglob("*"))
+    assert (first / "pyproject.toml").read_text() == (second / "pyproject.toml").read_text()
+
+
+def test_context_change_is_a_miss(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that a different context renders a new entry."""
+    engine = RenderEngine()
+    cache = RenderCache(tmp_path / "cache")
+    template_path = project_templates_path / "pyproject-template"
+
+    cache.generate(engine, template_path, _context(engine, template_path, "one"), tmp_path)
+    _, hit = cache.generate(engine, template_path, _context(engine, template_path, "two"), tmp_path)
+
+    assert not hit
+
+
+def test_nested_edit_within_index_ttl_is_a_miss(
+    project_templates_path: Path, tmp_path: Path
+) -> None:
+    """Test that a refreshed registry digest keys renders by the template as it is now."""
+    templates_dir = tmp_path / "templates"
+    shutil.copytree(project_templates_path, templates_dir)
+    index = tmp_path / "index.json"
+    engine = RenderEngine()
+    cache = RenderCache(tmp_path / "cache")
+    registry = TemplateRegistry(templates_dir, index, ttl=3600)
+    registry.load()
+    template_path = registry.get("pyproject").path
+    context = _context(engine, template_path, "demo")
+    digest = registry.refresh("pyproject").digest
+    cache.generate(engine, template_path, context, tmp_path / "a", template_digest=digest)
+
+    readme = template_path / "{{cookiecutter.project_name}}" / "README.md"
+    readme.write_text(readme.read_text() + "\nEdited.\n")
+    warm = TemplateRegistry(templates_dir, index, ttl=3600)
+    warm.load()
+    digest = warm.refresh("pyproject").digest
+    project_dir, hit = cache.generate(
+        engine, template_path, context, tmp_path / "b", template_digest=digest
+    )
+
+    assert not hit
+    assert (project_dir / "README.md").read_text().endswith("Edited.\n")
+
+
+def test_evict_by_age_and_size(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that stale entries go first and the cache is trimmed to its budget."""
+    engine = RenderEngine()
+    cache = RenderCache(tmp_path / "cache")
+    template_path = project_templates_path / "pyproject-template"
+    for name in ("one", "two", "three"):
+        cache.generate(engine, template_path, _context(engine, template_path, name), tmp_path)
+    entries = sorted(cache.root.glob("*/*/entry.json"))
+    os.utime(entries[0], (0, 0))
+
+    assert cache.evict() == 1
+
+    cache.max_bytes = 0
+    assert cache.evict() == 2
+    assert not list(cache.root.glob("*/*/entry.json"))
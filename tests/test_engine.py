@@ -0,0 +1,108 @@
+"""Tests for the in-process rendering engine."""
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+from cookiecutter.main import cookiecutter
+
+from pytemplate.archive import ArchiveFormat, write_archive
+from pytemplate.engine import RenderEngine, RenderError, UnsafePathError
+
+
+def test_generate_pyproject(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that a project is rendered in-process with the given context.
+
+    Args:
+        project_templates_path (Path): Path to project templates
+        tmp_path (Path): Output directory
+
+    """
+    engine = RenderEngine()
+    template_path = project_templates_path / "pyproject-template"
+    context = engine.build_context(template_path, {"project_name": "demo-app"}, no_input=True)
+
+    project_dir = engine.generate(template_path, context, output_dir=tmp_path)
+
+    assert project_dir == tmp_path / "demo-app"
+    assert (project_dir / "demo_app" / "main.py").is_file()
+    assert "{{" not in (project_dir / "pyproject.toml").read_text()
+
+
+def test_environment_is_reused(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that consecutive generations share one Jinja environment."""
+    engine = RenderEngine()
+    template_path = project_templates_path / "pyproject-template"
+    first = engine.build_context(template_path, {"project_name": "one"}, no_input=True)
+    second = engine.build_context(template_path, {"project_name": "two"}, no_input=True)
+
+    engine.generate(template_path, first, output_dir=tmp_path)
+    engine.generate(template_path, second, output_dir=tmp_path)
+
+    assert engine.environment(first) is engine.environment(second)
+
+
+def test_existing_project_dir(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that an existing project directory is reported unless overwriting."""
+    engine = RenderEngine()
+    template_path = project_templates_path / "pyproject-template"
+    context = engine.build_context(template_path, {"project_name": "demo"}, no_input=True)
+    engine.generate(template_path, context, output_dir=tmp_path)
+
+    with pytest.raises(RenderError, match="Unable to render"):
+        engine.generate(template_path, context, output_dir=tmp_path)
+
+    engine.generate(template_path, context, output_dir=tmp_path, overwrite_if_exists=True)
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"project_name": "demo", "package_name": "../../escaped"},
+        {"project_name": "demo", "package_name": "/tmp/escaped"},
+        {"project_name": ".."},
+    ],
+)
+def test_rendered_paths_stay_inside_project(
+    project_templates_path: Path, tmp_path: Path, context: dict[str, str]
+) -> None:
+    """Test that context values cannot place files outside the project."""
+    engine = RenderEngine()
+    template_path = project_templates_path / "pyproject-template"
+    full_context = engine.build_context(template_path, context, no_input=True)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    with pytest.raises(UnsafePathError):
+        engine.generate(template_path, full_context, output_dir=output_dir)
+    assert list(tmp_path.rglob("*")) == [output_dir]
+
+    with pytest.raises(UnsafePathError):
+        files = engine.iter_files(template_path, full_context)
+        write_archive(files, io.BytesIO(), ArchiveFormat.ZIP)
+
+
+def test_copy_without_render_matches_cookiecutter(tmp_path: Path) -> None:
+    """Test that ``_copy_without_render`` patterns select the same files as cookiecutter."""
+    template_path = tmp_path / "copy-template"
+    project_template = template_path / "{{cookiecutter.project_slug}}"
+    files = ["assets/logo.txt", "src/static/site.txt", "docs/raw.txt", "README.md"]
+    for relpath in files:
+        (project_template / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (project_template / relpath).write_text("{{ cookiecutter.project_slug }}\n")
+    (template_path / "cookiecutter.json").write_text(
+        '{"project_slug": "demo", "_copy_without_render": '
+        '["{{cookiecutter.project_slug}}/assets/*", "*/static/*", "docs"]}'
+    )
+
+    engine = RenderEngine()
+    context = engine.build_context(template_path, {}, no_input=True)
+    ours = engine.generate(template_path, context, output_dir=tmp_path / "ours")
+    theirs = Path(cookiecutter(str(template_path), no_input=True, output_dir=str(tmp_path)))
+
+    for relpath in files:
+        assert (ours / relpath).read_text() == (theirs / relpath).read_text(), relpath
+    assert (ours / "src/static/site.txt").read_text().startswith("{{")
+    assert (ours / "docs/raw.txt").read_text().startswith("{{")
+    assert (ours / "README.md").read_text() == "demo\n"
@@ -0,0 +1,59 @@
+"""Tests for materializing verbatim template files."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pytemplate.materialize import LinkMode, materialize_file, write_file
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Create an executable binary source file.
+
+    Returns:
+        Path: Path to the source file
+
+    """
+    path = tmp_path / "asset.bin"
+    path.write_bytes(os.urandom(256 * 1024))
+    path.chmod(0o755)
+    return path
+
+
+@pytest.mark.parametrize("mode", list(LinkMode))
+def test_materialize_modes(source: Path, tmp_path: Path, mode: LinkMode) -> None:
+    """Test that every mode reproduces the content and permissions of the source.
+
+    Args:
+        source (Path): File to materialize
+        tmp_path (Path): Scratch directory
+        mode (LinkMode): Materialization strategy
+
+    """
+    target = tmp_path / "out.bin"
+    target.write_text("stale")
+
+    method = materialize_file(source, target, mode)
+
+    assert target.read_bytes() == source.read_bytes()
+    assert target.stat().st_mode & 0o777 == 0o755
+    if mode is LinkMode.HARDLINK:
+        assert method == "hardlink"
+        assert target.stat().st_ino == source.stat().st_ino
+    else:
+        assert target.stat().st_ino != source.stat().st_ino
+
+
+def test_write_file_breaks_hardlinks(source: Path, tmp_path: Path) -> None:
+    """Test that rendering over a hardlinked file leaves the link target intact."""
+    original = source.read_bytes()
+    target = tmp_path / "out.bin"
+    materialize_file(source, target, LinkMode.HARDLINK)
+
+    write_file(target, b"rendered", source)
+
+    assert target.read_bytes() == b"rendered"
+    assert source.read_bytes() == original
@@ -0,0 +1,128 @@
+"""Tests for the template registry."""
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from jinja2 import FileSystemBytecodeCache
+
+from pytemplate import registry as registry_module
+from pytemplate.engine import RenderEngine
+from pytemplate.registry import TemplateRegistry
+
+
+def _copy_templates(project_templates_path: Path, tmp_path: Path) -> Path:
+    templates_dir = tmp_path / "templates"
+    shutil.copytree(project_templates_path, templates_dir)
+    return templates_dir
+
+
+def test_index_is_persisted(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that templates are indexed once and reused by later loads.
+
+    Args:
+        project_templates_path (Path): Path to project templates
+        tmp_path (Path): Scratch directory
+
+    """
+    templates_dir = _copy_templates(project_templates_path, tmp_path)
+    index = tmp_path / "index.json"
+
+    first = TemplateRegistry(templates_dir, index)
+    assert first.load() == {"fastapi", "pyproject"}
+    assert index.is_file()
+
+    second = TemplateRegistry(templates_dir, index)
+    assert second.load() == set()
+    info = second.get("fastapi")
+    assert info.path == templates_dir / "fastapi-template"
+    assert info.defaults["project_name"] == "my-fastapi-project"
+    assert "cookiecutter.json" in info.files
+    assert info.digest == first.get("fastapi").digest
+
+
+def test_changed_file_is_reindexed(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that once the TTL expires, a modified file invalidates only its template."""
+    templates_dir = _copy_templates(project_templates_path, tmp_path)
+    index = tmp_path / "index.json"
+    registry = TemplateRegistry(templates_dir, index)
+    registry.load()
+    digest = registry.get("pyproject").digest
+
+    readme = templates_dir / "pyproject-template" / "{{cookiecutter.project_name}}" / "README.md"
+    readme.write_text(readme.read_text() + "\nMore docs.\n")
+
+    reloaded = TemplateRegistry(templates_dir, index, ttl=0)
+    assert reloaded.load() == {"pyproject"}
+    assert reloaded.get("pyproject").digest != digest
+
+
+def test_warm_load_does_not_walk_templates(
+    project_templates_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a load within the TTL trusts the index without walking templates."""
+    templates_dir = _copy_templates(project_templates_path, tmp_path)
+    index = tmp_path / "index.json"
+    TemplateRegistry(templates_dir, index).load()
+
+    def fail(template_path: Path) -> None:
+        raise AssertionError(f"{template_path} was walked")
+
+    monkeypatch.setattr(registry_module, "_scan", fail)
+    warm = TemplateRegistry(templates_dir, index)
+    assert warm.load() == set()
+    assert "cookiecutter.json" in warm.get("fastapi").files
+
+
+def test_changed_config_is_reindexed_within_ttl(
+    project_templates_path: Path, tmp_path: Path
+) -> None:
+    """Test that editing cookiecutter.json invalidates the template immediately."""
+    templates_dir = _copy_templates(project_templates_path, tmp_path)
+    index = tmp_path / "index.json"
+    TemplateRegistry(templates_dir, index).load()
+
+    config = templates_dir / "pyproject-template" / "cookiecutter.json"
+    defaults = json.loads(config.read_text())
+    config.write_text(json.dumps({**defaults, "description": "Changed defaults"}))
+
+    reloaded = TemplateRegistry(templates_dir, index)
+    assert reloaded.load() == {"pyproject"}
+    assert reloaded.get("pyproject").description == "Changed defaults"
+
+
+def test_attach_precompiles_bytecode(project_templates_path: Path, tmp_path: Path) -> None:
+    """Test that attaching an engine compiles templates into its bytecode cache."""
+    bytecode_dir = tmp_path / "bytecode"
+    bytecode_dir.mkdir()
+    engine = RenderEngine(FileSystemBytecodeCache(str(bytecode_dir)))
+    registry = TemplateRegistry(project_templates_path, tmp_path / "index.json")
+    registry.load()
+
+    registry.attach(engine)
+
+    assert any(bytecode_dir.iterdir())
+    assert all(info.compiled for info in registry)
+    template_path = registry.get("pyproject").path
+    context = engine.build_context(template_path, {"project_name": "demo"}, no_input=True)
+    assert engine.generate(template_path, context, tmp_path).is_dir()
+
+
+def test_attach_skips_templates_that_cannot_compile(
+    project_templates_path: Path, tmp_path: Path
+) -> None:
+    """Test that a template with a missing extension does not break attaching others."""
+    templates_dir = _copy_templates(project_templates_path, tmp_path)
+    config = templates_dir / "fastapi-template" / "cookiecutter.json"
+    config.write_text(
+        json.dumps({**json.loads(config.read_text()), "_extensions": ["no_such_module.Ext"]})
+    )
+    registry = TemplateRegistry(templates_dir, tmp_path / "index.json")
+    registry.load()
+
+    registry.attach(RenderEngine())
+
+    assert registry.get("pyproject").compiled
+    assert not registry.get("fastapi").compiled
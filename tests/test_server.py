@@ -0,0 +1,149 @@
+"""Tests for the scaffolding service."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import socket
+import tarfile
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from pytemplate.config import TEMPLATES_DIR
+from pytemplate.server import ScaffoldServer
+
+
+@contextlib.contextmanager
+def _running(scaffold: ScaffoldServer) -> Iterator[str]:
+    loop = asyncio.new_event_loop()
+    ready = asyncio.Event()
+    task = loop.create_task(scaffold.serve("127.0.0.1", 0, ready))
+
+    def run() -> None:
+        with contextlib.suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(ready.wait(), loop).result(timeout=30)
+    yield f"http://127.0.0.1:{scaffold.port}"
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(timeout=10)
+    scaffold.close()
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[str]:
+    with _running(ScaffoldServer(TEMPLATES_DIR, tmp_path, {"author": "tester"})) as url:
+        yield url
+
+
+def _post(url: str, payload: dict) -> tuple[int, dict[str, str], bytes]:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_generate_archive_and_path(server: str, tmp_path: Path) -> None:
+    status, headers, body = _post(f"{server}/generate", {"project_name": "served"})
+    assert status == 200
+    assert headers["Content-Type"] == "application/gzip"
+    with tarfile.open(fileobj=io.BytesIO(body)) as archive:
+        assert "served/pyproject.toml" in archive.getnames()
+    assert not (tmp_path / "served").exists()
+
+    status, _, body = _post(f"{server}/generate", {"project_name": "ondisk", "output": "path"})
+    assert status == 200
+    assert Path(json.loads(body)["project_dir"]) == tmp_path / "ondisk"
+    assert (tmp_path / "ondisk" / "pyproject.toml").is_file()
+
+    with urllib.request.urlopen(f"{server}/stats") as response:
+        stats = json.load(response)
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+    assert stats["latency_ms"]["p50"] > 0
+
+
+def test_generate_rejects_bad_requests(server: str) -> None:
+    assert _post(f"{server}/generate", {"template": "missing"})[0] == 404
+    assert _post(f"{server}/generate", {"output": "path", "output_dir": "../x"})[0] == 400
+    assert _post(f"{server}/generate", {"format": "rar"})[0] == 400
+
+
+def test_generate_rejects_project_outside_output_dir(server: str, tmp_path: Path) -> None:
+    for name in ("../escaped", "nested/name", "back\\slash"):
+        payload = {"project_name": name, "output": "path"}
+        assert _post(f"{server}/generate", payload)[0] == 400
+    assert not (tmp_path.parent / "escaped").exists()
+
+
+def test_generate_rejects_context_paths_outside_output_dir(server: str, tmp_path: Path) -> None:
+    payload = {
+        "template": "fastapi",
+        "project_name": "p",
+        "output": "path",
+        "context": {"package_name": "../../escaped"},
+    }
+    status, _, body = _post(f"{server}/generate", payload)
+    assert status == 400, body
+    assert list(tmp_path.iterdir()) == []
+    assert not (tmp_path.parent / "escaped").exists()
+
+
+def test_archive_names_are_escaped_in_headers(tmp_path: Path) -> None:
+    scaffold = ScaffoldServer(TEMPLATES_DIR, tmp_path, {})
+    scaffold.start_pool()
+    try:
+        # dispatch works without serve(), e.g. when driven directly from tests.
+        body = json.dumps({"project_name": 'naïve "q"'}).encode()
+        status, headers, _ = asyncio.run(scaffold.dispatch("POST", "/generate", body))
+        assert status == 200
+        assert headers["Content-Disposition"] == (
+            'attachment; filename="na_ve _q_.tar.gz"; '
+            "filename*=UTF-8''na%C3%AFve%20%22q%22.tar.gz"
+        )
+        headers["Content-Disposition"].encode("latin-1")
+    finally:
+        scaffold.close()
+
+
+def test_generate_rejects_control_characters(server: str) -> None:
+    assert _post(f"{server}/generate", {"project_name": "a\r\nX-Evil: 1"})[0] == 400
+
+
+def test_generate_without_queue_uses_idle_workers(tmp_path: Path) -> None:
+    scaffold = ScaffoldServer(TEMPLATES_DIR, tmp_path, {}, workers=1, max_queue=0)
+    with _running(scaffold) as url:
+        assert _post(f"{url}/generate", {"project_name": "direct"})[0] == 200
+
+
+def test_generate_reports_template_errors(tmp_path: Path) -> None:
+    template = tmp_path / "templates" / "broken-template"
+    (template / "{{cookiecutter.project_name}}").mkdir(parents=True)
+    (template / "cookiecutter.json").write_text('{"project_name": "demo"}')
+    (template / "{{cookiecutter.project_name}}" / "README.md").write_text(
+        "{{ cookiecutter.undefined }}"
+    )
+    scaffold = ScaffoldServer(tmp_path / "templates", tmp_path / "out", {})
+    with _running(scaffold) as url:
+        status, _, body = _post(f"{url}/generate", {"template": "broken"})
+    assert status == 422
+    assert "undefined" in json.loads(body)["details"]
+
+
+def test_malformed_request_gets_400(server: str) -> None:
+    address = urlsplit(server)
+    with socket.create_connection((address.hostname, address.port), timeout=10) as conn:
+        conn.sendall(b"POST /generate HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+        assert conn.recv(1024).startswith(b"HTTP/1.1 400 ")
@@ -0,0 +1,53 @@
+"""Import-time regression tests for the pytemplate CLI entry point."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Total import time allowed for ``--help``, in milliseconds. Override on slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("PYTEMPLATE_IMPORT_BUDGET_MS", "500"))
+
+# Modules only needed to render projects, which ``--help`` must not load.
+DEFERRED_MODULES = ("cookiecutter", "jinja2", "pytemplate.engine", "pytemplate.batch")
+
+
+def _import_times(*args: str) -> dict[str, int]:
+    """Run the CLI under ``-X importtime`` and return each module's self time in µs.
+
+    Args:
+        *args: Arguments passed to the CLI
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pytemplate.main", *args],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent.parent,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(self_us)
+    return times
+
+
+def test_help_skips_rendering_modules() -> None:
+    """Test that ``--help`` does not import the rendering stack."""
+    times = _import_times("--help")
+
+    loaded = [m for m in times if m.startswith(DEFERRED_MODULES)]
+    assert not loaded, f"--help imported rendering modules: {loaded}"
+
+
+def test_help_import_budget() -> None:
+    """Test that ``--help`` stays within its import-time budget."""
+    total_ms = min(sum(_import_times("--help").values()) for _ in range(3)) / 1000
+
+    assert total_ms <= IMPORT_BUDGET_MS, (
+        f"--help spent {total_ms:.1f} ms importing modules (budget {IMPORT_BUDGET_MS} ms)"
+    )
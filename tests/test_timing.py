@@ -0,0 +1,53 @@
+"""Tests for generation timings."""
+from __future__ import annotations
+
+import json
+import pstats
+
+from typer.testing import CliRunner
+
+from pytemplate.config import TEMPLATES_DIR
+from pytemplate.engine import RenderEngine
+from pytemplate.main import app
+from pytemplate.timing import Timings
+
+
+def test_generate_records_phases_and_files(tmp_path):
+    engine = RenderEngine()
+    template = TEMPLATES_DIR / "pyproject-template"
+    context = engine.build_context(template, {"project_name": "timed"}, no_input=True)
+    timings = Timings()
+
+    engine.generate(template, context, output_dir=tmp_path, timings=timings)
+
+    assert {"render", "write"} <= timings.phases.keys()
+    assert "pyproject.toml" in timings.files
+    assert timings.slowest_files(1)[0][1] == max(timings.files.values())
+
+
+def test_cli_writes_timings_json_and_profile(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    report = tmp_path / "timings.json"
+    profile = tmp_path / "out.prof"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "create-project",
+            "timed",
+            "--no-input",
+            "--no-cache",
+            "--timings",
+            "--timings-json",
+            str(report),
+            "--profile",
+            str(profile),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Timings" in result.output
+    data = json.loads(report.read_text())
+    assert {"validation", "context", "render", "write"} <= data["phases"].keys()
+    assert data["total"] >= sum(data["phases"].values())
+    assert pstats.Stats(str(profile)).total_calls > 0
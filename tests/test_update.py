@@ -0,0 +1,77 @@
+"""Tests for incremental project updates."""
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pytemplate.engine import RECORD_FILE, RenderEngine
+from pytemplate.update import read_record, update_project
+
+
+@pytest.fixture
+def generated(project_templates_path: Path, tmp_path: Path) -> tuple[Path, Path]:
+    """Generate a project from a private copy of the pyproject template.
+
+    Returns:
+        tuple[Path, Path]: The template path and the generated project directory
+
+    """
+    template_path = tmp_path / "pyproject-template"
+    shutil.copytree(project_templates_path / "pyproject-template", template_path)
+    engine = RenderEngine()
+    context = engine.build_context(template_path, {"project_name": "demo"}, no_input=True)
+    project_dir = engine.generate(template_path, context, output_dir=tmp_path / "out")
+    return template_path, project_dir
+
+
+def _template_file(template_path: Path, name: str) -> Path:
+    return template_path / "{{cookiecutter.project_name}}" / name
+
+
+def test_record_is_written(generated: tuple[Path, Path]) -> None:
+    """Test that generation records the answers and output hashes."""
+    _, project_dir = generated
+
+    record = read_record(project_dir)
+
+    assert record["template"] == "pyproject"
+    assert record["context"]["project_name"] == "demo"
+    assert "README.md" in record["files"]
+    assert RECORD_FILE not in record["files"]
+
+
+def test_unchanged_template_writes_nothing(generated: tuple[Path, Path]) -> None:
+    """Test that updating against an unchanged template touches no files."""
+    template_path, project_dir = generated
+
+    result = update_project(RenderEngine(), template_path, project_dir, read_record(project_dir))
+
+    assert result.written == 0
+    assert not result.conflicts
+
+
+def test_only_changed_files_are_written(generated: tuple[Path, Path]) -> None:
+    """Test that template changes reach untouched files and conflict with edited ones."""
+    template_path, project_dir = generated
+    for name in ("README.md", "Makefile"):
+        path = _template_file(template_path, name)
+        path.write_text(path.read_text() + "\n# template change\n")
+    _template_file(template_path, "NOTES.md").write_text("{{cookiecutter.project_name}} notes\n")
+    (project_dir / "Makefile").write_text("user edits\n")
+    (project_dir / "Dockerfile").write_text("user edits\n")
+    engine = RenderEngine()
+
+    result = update_project(engine, template_path, project_dir, read_record(project_dir))
+
+    assert result.updated == ["README.md"]
+    assert result.added == ["NOTES.md"]
+    assert result.conflicts == [("Makefile", "modified locally and in template")]
+    assert (project_dir / "README.md").read_text().endswith("# template change\n")
+    assert (project_dir / "Makefile").read_text() == "user edits\n"
+    assert (project_dir / "Dockerfile").read_text() == "user edits\n"
+
+    again = update_project(engine, template_path, project_dir, read_record(project_dir))
+    assert again.written == 0
+    assert again.conflicts == result.conflicts